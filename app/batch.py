@@ -0,0 +1,461 @@
+"""
+Giải hàng loạt câu đố Sudoku không cần giao diện.
+
+Đọc từng dòng câu đố (81/256/625 ký tự) từ tệp hoặc stdin, hoặc từng câu đố của một tệp
+nhị phân (corpus.py), và ghi mỗi kết quả thành một dòng JSON. Đầu vào được xử lý theo luồng
+nên bộ nhớ không phụ thuộc kích thước tệp.
+
+Với --workers > 1 các câu đố được chia thành từng khối và giải song song trên một
+ProcessPoolExecutor; kết quả vẫn được ghi theo đúng thứ tự đầu vào.
+
+Với --store, lời giải được lưu vào kho SQLite (solution_store.SolutionStore) dùng chung giữa
+các lần chạy và các tiến trình: câu đố (hoặc câu đố tương đương) đã giải bằng cùng thuật
+toán được lấy từ kho thay vì giải lại.
+
+Cách dùng (trong thư mục app/, giống main.py):
+    python batch.py puzzles.txt -a DLX -o results.jsonl
+    cat puzzles.txt | python batch.py - -a A* --option heuristic=candidates
+    python batch.py puzzles.txt -a Propagation --workers 8 --chunk-size 256
+    python batch.py puzzles.txt -a BFS --time-limit 5 --max-frontier 1000000
+    python batch.py puzzles.txt -a DLX --store solutions.sqlite3 --workers 8
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from canonical import canonical_form
+from corpus import CorpusReader, is_corpus_file
+from puzzle_format import format_puzzle, parse_puzzle, puzzle_field
+from solution_store import SolutionStore
+from solve import SOLVERS, get_solver
+
+# Số câu đố mỗi lần tra/ghi kho lời giải khi giải tuần tự
+STORE_CHUNK_SIZE = 64
+
+
+def iter_puzzle_lines(stream):
+    """
+    Duyệt các dòng câu đố của một luồng văn bản, bỏ qua dòng trống và dòng chú thích '#'.
+
+    Args:
+        stream: Luồng văn bản (tệp hoặc stdin)
+
+    Yields:
+        tuple: (số thứ tự câu đố, chuỗi câu đố)
+    """
+    index = 0
+    for line in stream:
+        text = puzzle_field(line)
+        if not text or text.startswith('#'):
+            continue
+        yield index, text
+        index += 1
+
+
+def iter_corpus_puzzles(reader):
+    """
+    Duyệt các câu đố của một tệp nhị phân theo cùng dạng với iter_puzzle_lines.
+
+    Args:
+        reader: corpus.CorpusReader
+
+    Yields:
+        tuple: (số thứ tự câu đố, chuỗi câu đố)
+    """
+    for index, board in enumerate(reader):
+        yield index, format_puzzle(board)
+
+
+def json_safe(value):
+    """
+    Chuyển thông số về dạng JSON hợp lệ: vô cùng/NaN thành None, tuple thành list.
+
+    Args:
+        value: Giá trị cần chuyển
+
+    Returns:
+        Giá trị có thể ghi bằng json.dumps
+    """
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, dict):
+        return {key: json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [json_safe(item) for item in value]
+    return value
+
+
+def solve_puzzle(index, text, algorithm, options=None, limits=None):
+    """
+    Giải một câu đố dạng chuỗi và dựng bản ghi kết quả.
+
+    Args:
+        index: Số thứ tự câu đố trong đầu vào
+        text: Chuỗi câu đố
+        algorithm: Tên thuật toán của get_solver
+        options: Tham số riêng của thuật toán
+        limits: Tham số set_limits của solver (thời gian, số trạng thái, kích thước biên)
+
+    Returns:
+        dict: Bản ghi kết quả (có khóa 'error' nếu câu đố không đọc được)
+    """
+    record = {'index': index, 'puzzle': text, 'algorithm': algorithm}
+    try:
+        board, grid_size = parse_puzzle(text)
+    except ValueError as error:
+        record['error'] = str(error)
+        return record
+
+    solver = get_solver(algorithm, board, grid_size, **(options or {}))
+    solver.set_limits(**(limits or {}))
+    solved = solver.solve()
+    record['solved'] = solved
+    record['solution'] = format_puzzle(solver.solution) if solved else None
+    record['metrics'] = json_safe(solver.get_performance_metrics())
+    return record
+
+
+def solve_chunk(chunk, algorithm, options=None, limits=None, store=None):
+    """
+    Giải một khối câu đố. Khi có kho lời giải, cả khối được tra bằng một truy vấn theo khóa
+    chính tắc; chỉ câu đố chưa có trong kho được giải, và các lời giải mới được ghi trong một
+    giao dịch.
+
+    Args:
+        chunk: Danh sách (số thứ tự, chuỗi câu đố)
+        algorithm: Tên thuật toán của get_solver
+        options: Tham số riêng của thuật toán
+        limits: Tham số set_limits của solver
+        store: SolutionStore (tùy chọn); bản ghi khi đó có thêm khóa 'cached'
+
+    Returns:
+        list: Bản ghi kết quả theo thứ tự của khối
+    """
+    if store is None:
+        return [solve_puzzle(index, text, algorithm, options, limits) for index, text in chunk]
+
+    keys = []
+    for _, text in chunk:
+        try:
+            board, grid_size = parse_puzzle(text)
+        except ValueError:
+            keys.append(None)
+            continue
+        keys.append((grid_size, *canonical_form(board, grid_size)))
+    stored = store.get_many(algorithm, [key[:2] for key in keys if key is not None])
+
+    records = []
+    solved = []
+    for (index, text), key in zip(chunk, keys):
+        hit = stored.get(key[:2]) if key is not None else None
+        if hit is None:
+            record = solve_puzzle(index, text, algorithm, options, limits)
+            if record.get('solved'):
+                grid_size, canonical, transform = key
+                solution = transform.apply(parse_puzzle(record['solution'])[0])
+                solved.append((grid_size, canonical, solution, record['metrics']))
+        else:
+            solution, metrics = hit
+            record = {'index': index, 'puzzle': text, 'algorithm': algorithm, 'solved': True,
+                      'solution': format_puzzle(key[2].invert(solution)), 'metrics': metrics}
+        if key is not None:
+            record['cached'] = hit is not None
+        records.append(record)
+    store.put_many(algorithm, solved)
+    return records
+
+
+def solve_stream(lines, algorithm, options=None, limits=None, store=None):
+    """
+    Giải lần lượt các câu đố của một luồng, trả về kết quả theo luồng.
+
+    Args:
+        lines: Iterable các cặp (số thứ tự, chuỗi câu đố)
+        algorithm: Tên thuật toán của get_solver
+        options: Tham số riêng của thuật toán
+        limits: Tham số set_limits của solver
+        store: SolutionStore (tùy chọn); câu đố được tra/ghi theo khối STORE_CHUNK_SIZE
+
+    Yields:
+        dict: Bản ghi kết quả của từng câu đố
+    """
+    if store is not None:
+        for chunk in iter_chunks(lines, STORE_CHUNK_SIZE):
+            yield from solve_chunk(chunk, algorithm, options, limits, store)
+        return
+    for index, text in lines:
+        yield solve_puzzle(index, text, algorithm, options, limits)
+
+
+class BatchStats:
+    """
+    Thống kê của một lượt giải hàng loạt: số câu đố, thông lượng và thời gian bận của từng
+    tiến trình con.
+    """
+
+    def __init__(self):
+        self.puzzles = 0
+        self.chunks = 0
+        self.busy_time = {}
+        self.start_time = time.perf_counter()
+        self.end_time = None
+
+    def add_chunk(self, worker, busy_time, count):
+        """
+        Ghi nhận một khối đã giải xong.
+
+        Args:
+            worker: Định danh tiến trình đã giải khối (pid)
+            busy_time: Thời gian tiến trình bận giải khối (giây)
+            count: Số câu đố trong khối
+        """
+        self.puzzles += count
+        self.chunks += 1
+        self.busy_time[worker] = self.busy_time.get(worker, 0.0) + busy_time
+
+    def finish(self):
+        """Đánh dấu kết thúc lượt giải."""
+        self.end_time = time.perf_counter()
+
+    @property
+    def elapsed(self):
+        """Thời gian thực đã trôi qua (giây)."""
+        return (self.end_time or time.perf_counter()) - self.start_time
+
+    @property
+    def throughput(self):
+        """Số câu đố được giải mỗi giây."""
+        return self.puzzles / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def utilization(self):
+        """Tỷ lệ thời gian bận trên thời gian thực của từng tiến trình con."""
+        elapsed = self.elapsed
+        return {worker: busy / elapsed if elapsed > 0 else 0.0 for worker, busy in self.busy_time.items()}
+
+
+# Thuật toán và tham số của tiến trình con, được gán một lần bởi initializer
+_worker_config = None
+
+
+def _init_batch_worker(algorithm, options, limits=None, store_path=None):
+    """
+    Khởi tạo tiến trình con: lưu thuật toán và tham số để mọi khối dùng lại. Các cấu trúc
+    chỉ phụ thuộc kích thước lưới (ma trận DLX, đơn vị của PropagationSolver, ô liên quan
+    của A*) được lưu trong tiến trình nên chỉ dựng một lần cho mọi câu đố của nó.
+
+    Args:
+        algorithm: Tên thuật toán của get_solver
+        options: Tham số riêng của thuật toán
+        limits: Tham số set_limits của solver
+        store_path: Tệp kho lời giải; mỗi tiến trình mở kết nối riêng
+    """
+    global _worker_config
+    store = SolutionStore(store_path) if store_path else None
+    _worker_config = (algorithm, options, limits, store)
+
+
+def _solve_chunk(chunk):
+    """
+    Giải một khối câu đố trong tiến trình con.
+
+    Args:
+        chunk: Danh sách (số thứ tự, chuỗi câu đố)
+
+    Returns:
+        tuple: (pid, thời gian bận, danh sách bản ghi kết quả)
+    """
+    algorithm, options, limits, store = _worker_config
+    start_time = time.perf_counter()
+    records = solve_chunk(chunk, algorithm, options, limits, store)
+    return os.getpid(), time.perf_counter() - start_time, records
+
+
+def iter_chunks(lines, chunk_size):
+    """
+    Chia một luồng thành các khối liên tiếp.
+
+    Args:
+        lines: Iterable bất kỳ
+        chunk_size: Số phần tử mỗi khối
+
+    Yields:
+        list: Khối tiếp theo
+    """
+    iterator = iter(lines)
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def solve_parallel(lines, algorithm, options=None, workers=None, chunk_size=64, stats=None, limits=None,
+                   store=None):
+    """
+    Giải các câu đố của một luồng trên nhiều tiến trình, trả về kết quả theo thứ tự đầu vào.
+    Chỉ tối đa 2 * workers khối được gửi đi cùng lúc, nên bộ nhớ vẫn không phụ thuộc kích
+    thước đầu vào; khối cũ nhất luôn được chờ trước để giữ thứ tự.
+
+    Args:
+        lines: Iterable các cặp (số thứ tự, chuỗi câu đố)
+        algorithm: Tên thuật toán của get_solver
+        options: Tham số riêng của thuật toán
+        workers: Số tiến trình (mặc định os.cpu_count())
+        chunk_size: Số câu đố mỗi khối
+        stats: BatchStats nhận thống kê (tùy chọn)
+        limits: Tham số set_limits của solver
+        store: SolutionStore (tùy chọn); tiến trình con mở kho từ cùng tệp, kết nối của
+            luồng hiện tại bị đóng (mở lại khi dùng tiếp)
+
+    Yields:
+        dict: Bản ghi kết quả của từng câu đố
+    """
+    workers = workers or os.cpu_count() or 1
+    if store is not None:
+        # Kết nối SQLite không được mang qua fork: đóng kết nối của tiến trình cha trước khi tạo tiến trình con
+        store.close()
+    if stats is None:
+        stats = BatchStats()
+    in_flight = deque()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                             initargs=(algorithm, options or {}, limits,
+                                       store.path if store is not None else None)) as executor:
+        try:
+            for chunk in iter_chunks(lines, chunk_size):
+                if len(in_flight) >= 2 * workers:
+                    yield from _collect_chunk(in_flight.popleft(), stats)
+                in_flight.append(executor.submit(_solve_chunk, chunk))
+            while in_flight:
+                yield from _collect_chunk(in_flight.popleft(), stats)
+        finally:
+            for future in in_flight:
+                future.cancel()
+            stats.finish()
+
+
+def _collect_chunk(future, stats):
+    """Chờ một khối, ghi nhận thống kê và trả về các bản ghi của nó."""
+    worker, busy_time, records = future.result()
+    stats.add_chunk(worker, busy_time, len(records))
+    return records
+
+
+def parse_option(text):
+    """
+    Đọc tham số dạng key=value; giá trị được thử đọc là int rồi float, nếu không giữ chuỗi.
+
+    Args:
+        text: Chuỗi key=value
+
+    Returns:
+        tuple: (key, value)
+    """
+    key, separator, value = text.partition('=')
+    if not separator or not key:
+        raise argparse.ArgumentTypeError(f"Tham số phải có dạng key=value: {text}")
+    for convert in (int, float):
+        try:
+            return key, convert(value)
+        except ValueError:
+            pass
+    return key, value
+
+
+def build_parser():
+    """Tạo bộ đọc tham số dòng lệnh."""
+    parser = argparse.ArgumentParser(description="Giải hàng loạt câu đố Sudoku, ghi kết quả dạng JSONL.")
+    parser.add_argument('input', nargs='?', default='-',
+                        help="Tệp câu đố (văn bản hoặc nhị phân của corpus.py), '-' để đọc stdin (mặc định)")
+    parser.add_argument('-o', '--output', default='-', help="Tệp kết quả JSONL, '-' để ghi stdout (mặc định)")
+    parser.add_argument('-a', '--algorithm', default='DLX', choices=list(SOLVERS), help="Thuật toán của get_solver (mặc định DLX)")
+    parser.add_argument('--option', action='append', type=parse_option, default=[], metavar='KEY=VALUE',
+                        help="Tham số riêng của thuật toán, có thể lặp lại")
+    parser.add_argument('--limit', type=int, default=None, help="Chỉ giải N câu đố đầu tiên")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Số tiến trình giải song song (mặc định 1, 0 để dùng mọi lõi)")
+    parser.add_argument('--chunk-size', type=int, default=64, help="Số câu đố mỗi khối khi chạy song song")
+    parser.add_argument('--time-limit', type=float, default=None, help="Thời gian giải tối đa mỗi câu đố (giây)")
+    parser.add_argument('--max-states', type=int, default=None, help="Số trạng thái tối đa mỗi câu đố")
+    parser.add_argument('--max-frontier', type=int, default=None, help="Kích thước biên tối đa mỗi câu đố")
+    parser.add_argument('--store', default=None, help="Kho lời giải SQLite dùng chung giữa các lần chạy")
+    parser.add_argument('--store-max-entries', type=int, default=None,
+                        help="Sau khi chạy, chỉ giữ N lời giải mới nhất trong kho")
+    return parser
+
+
+def main(argv=None):
+    """
+    Điểm vào dòng lệnh.
+
+    Args:
+        argv: Danh sách tham số (mặc định sys.argv[1:])
+
+    Returns:
+        int: Mã thoát (0 nếu mọi câu đố đọc được đều được giải)
+    """
+    args = build_parser().parse_args(argv)
+    options = dict(args.option)
+    limits = {'time_limit': args.time_limit, 'max_states': args.max_states, 'max_frontier': args.max_frontier}
+
+    if args.input != '-' and is_corpus_file(args.input):
+        source = CorpusReader(args.input)
+        puzzles = iter_corpus_puzzles(source)
+    else:
+        source = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+        puzzles = iter_puzzle_lines(source)
+    target = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+
+    store = SolutionStore(args.store) if args.store else None
+
+    total = solved = errors = aborted = cached = 0
+    start_time = time.time()
+    stats = BatchStats()
+    try:
+        lines = itertools.islice(puzzles, args.limit)
+        if args.workers == 1:
+            records = solve_stream(lines, args.algorithm, options, limits, store)
+        else:
+            records = solve_parallel(lines, args.algorithm, options, args.workers or None, args.chunk_size, stats,
+                                     limits, store)
+        for record in records:
+            target.write(json.dumps(record, ensure_ascii=False) + '\n')
+            total += 1
+            if 'error' in record:
+                errors += 1
+            elif record['solved']:
+                solved += 1
+                cached += record.get('cached', False)
+            elif record['metrics']['status'] == 'aborted':
+                aborted += 1
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+        else:
+            target.flush()
+        if store is not None:
+            if args.store_max_entries is not None:
+                store.prune(args.store_max_entries)
+            store.close()
+
+    elapsed = time.time() - start_time
+    rate = total / elapsed if elapsed > 0 else 0.0
+    print(f"{total} câu đố, {solved} đã giải ({cached} từ kho), {aborted} vượt giới hạn, {errors} lỗi, "
+          f"{elapsed:.2f}s ({rate:.1f} câu đố/s)",
+          file=sys.stderr)
+    for worker, utilization in sorted(stats.utilization.items()):
+        print(f"  tiến trình {worker}: bận {utilization:.0%}", file=sys.stderr)
+    return 0 if solved == total else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,268 @@
+"""
+Đo hiệu năng mọi thuật toán của get_solver trên một bộ câu đố cố định.
+
+Bộ câu đố được tạo lại giống hệt nhau từ một seed (cho từng kích thước lưới và độ khó).
+Mỗi thuật toán giải từng câu đố với giới hạn thời gian; kết quả gồm trung vị/p95 thời
+gian, số trạng thái đã duyệt và bộ nhớ đỉnh (tracemalloc) được ghi ra tệp JSON. Khi có
+tệp kết quả gốc (--baseline), các nhóm chậm hơn ngưỡng cho phép hoặc giải được ít câu
+hơn được liệt kê và mã thoát là 1, để phát hiện hồi quy trước khi phát hành.
+
+Cách dùng (trong thư mục app/, giống main.py):
+    python benchmark.py -o results.json
+    python benchmark.py --sizes 9 --count 10 -a DLX -a Propagation --baseline results.json
+"""
+import argparse
+import json
+import math
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from batch import json_safe
+from model import SudokuModel
+from solve import SOLVERS, get_solver
+
+ALGORITHMS = tuple(SOLVERS)
+DIFFICULTIES = ("super_easy", "easy", "medium", "difficult", "expert")
+
+
+def build_corpus(seed=0, count=5, sizes=(9, 16), difficulties=DIFFICULTIES):
+    """
+    Tạo bộ câu đố cố định: cùng seed luôn cho cùng các câu đố.
+
+    Args:
+        seed: Seed của bộ sinh ngẫu nhiên
+        count: Số câu đố cho mỗi cặp (kích thước, độ khó)
+        sizes: Các kích thước lưới
+        difficulties: Các độ khó
+
+    Returns:
+        list: Danh sách (kích thước lưới, độ khó, câu đố)
+    """
+    state = random.getstate()
+    random.seed(seed)
+    try:
+        return [(size, difficulty, SudokuModel(difficulty, grid_size=size).board)
+                for size in sizes for difficulty in difficulties for _ in range(count)]
+    finally:
+        random.setstate(state)
+
+
+def run_once(algorithm, board, grid_size, timeout, measure_memory=False):
+    """
+    Giải một câu đố với giới hạn thời gian (set_limits của solver).
+
+    Args:
+        algorithm: Tên thuật toán của get_solver
+        board: Câu đố
+        grid_size: Kích thước lưới
+        timeout: Thời gian tối đa (giây)
+        measure_memory: Đo bộ nhớ đỉnh bằng tracemalloc (làm chậm lần chạy)
+
+    Returns:
+        dict: {'time', 'states', 'solved', 'timed_out', 'peak_memory'}
+    """
+    solver = get_solver(algorithm, board, grid_size)
+    solver.set_limits(time_limit=timeout)
+
+    if measure_memory:
+        tracemalloc.start()
+    start_time = time.perf_counter()
+    try:
+        solved = solver.solve()
+    finally:
+        elapsed = time.perf_counter() - start_time
+        peak_memory = tracemalloc.get_traced_memory()[1] if measure_memory else None
+        if measure_memory:
+            tracemalloc.stop()
+    timed_out = solver.status == 'aborted'
+
+    return {
+        'time': min(elapsed, timeout) if timed_out else elapsed,
+        'states': solver.states_explored,
+        'solved': solved,
+        'timed_out': timed_out,
+        'peak_memory': peak_memory,
+    }
+
+
+def percentile(values, fraction):
+    """
+    Phân vị theo thứ hạng gần nhất.
+
+    Args:
+        values: Dãy số khác rỗng
+        fraction: Phân vị trong [0, 1]
+
+    Returns:
+        Giá trị tại phân vị
+    """
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def summarize(runs):
+    """
+    Tổng hợp các lần chạy của một nhóm. Lần chạy quá giờ được tính bằng thời gian giới hạn,
+    nên trung vị/p95 không bị làm đẹp bởi việc bỏ qua câu đố khó.
+
+    Args:
+        runs: Danh sách kết quả của run_once
+
+    Returns:
+        dict: Thống kê của nhóm
+    """
+    times = [run['time'] for run in runs]
+    states = [run['states'] for run in runs]
+    memory = [run['peak_memory'] for run in runs if run['peak_memory'] is not None]
+    return {
+        'runs': len(runs),
+        'solved': sum(run['solved'] for run in runs),
+        'timeouts': sum(run['timed_out'] for run in runs),
+        'median_time': statistics.median(times),
+        'p95_time': percentile(times, 0.95),
+        'median_states': statistics.median(states),
+        'p95_states': percentile(states, 0.95),
+        'peak_memory': max(memory) if memory else None,
+    }
+
+
+def run_benchmark(corpus, algorithms=ALGORITHMS, timeout=10.0, measure_memory=True, log=None):
+    """
+    Chạy mọi thuật toán trên bộ câu đố.
+
+    Args:
+        corpus: Danh sách (kích thước lưới, độ khó, câu đố) của build_corpus
+        algorithms: Các thuật toán cần đo
+        timeout: Thời gian tối đa cho mỗi lần giải (giây)
+        measure_memory: Chạy thêm một lần có tracemalloc cho mỗi câu đố để đo bộ nhớ đỉnh
+        log: Hàm nhận chuỗi tiến độ (tùy chọn)
+
+    Returns:
+        dict: {thuật toán: {"kích thước:độ khó": thống kê}}
+    """
+    results = {}
+    for algorithm in algorithms:
+        groups = {}
+        for grid_size, difficulty, board in corpus:
+            run = run_once(algorithm, board, grid_size, timeout)
+            if measure_memory:
+                run['peak_memory'] = run_once(algorithm, board, grid_size, timeout, True)['peak_memory']
+            groups.setdefault(f"{grid_size}:{difficulty}", []).append(run)
+        results[algorithm] = {group: summarize(runs) for group, runs in groups.items()}
+        if log is not None:
+            log(f"{algorithm}: xong {len(corpus)} câu đố")
+    return results
+
+
+def compare(results, baseline, threshold=0.2, min_delta=0.001):
+    """
+    So sánh kết quả với kết quả gốc.
+
+    Args:
+        results: Kết quả hiện tại (phần 'results' của tệp kết quả)
+        baseline: Kết quả gốc cùng định dạng
+        threshold: Tỷ lệ chậm hơn cho phép của trung vị thời gian (0.2 = 20%)
+        min_delta: Chênh lệch tuyệt đối tối thiểu (giây) để tính là chậm hơn, tránh báo
+            nhầm do nhiễu đo ở các nhóm chỉ mất vài phần nghìn giây
+
+    Returns:
+        tuple: (danh sách dòng so sánh, danh sách hồi quy)
+    """
+    lines = []
+    regressions = []
+    for algorithm, groups in results.items():
+        for group, current in groups.items():
+            previous = baseline.get(algorithm, {}).get(group)
+            if previous is None:
+                lines.append(f"{algorithm:<20} {group:<16} mới")
+                continue
+            ratio = current['median_time'] / previous['median_time'] if previous['median_time'] else 1.0
+            line = (f"{algorithm:<20} {group:<16} {previous['median_time']:.4f}s -> {current['median_time']:.4f}s "
+                    f"({ratio:.2f}x), giải {previous['solved']} -> {current['solved']}")
+            lines.append(line)
+            slower = current['median_time'] - previous['median_time'] > min_delta
+            if (ratio > 1 + threshold and slower) or current['solved'] < previous['solved']:
+                regressions.append(line)
+    return lines, regressions
+
+
+def build_parser():
+    """Tạo bộ đọc tham số dòng lệnh."""
+    parser = argparse.ArgumentParser(description="Đo hiệu năng các thuật toán giải Sudoku trên bộ câu đố cố định.")
+    parser.add_argument('-o', '--output', default='-', help="Tệp kết quả JSON, '-' để ghi stdout (mặc định)")
+    parser.add_argument('-a', '--algorithm', action='append', dest='algorithms', choices=ALGORITHMS,
+                        help="Thuật toán cần đo, có thể lặp lại (mặc định mọi thuật toán)")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[9, 16], help="Kích thước lưới (mặc định 9 16)")
+    parser.add_argument('--difficulties', nargs='+', default=list(DIFFICULTIES), help="Các độ khó")
+    parser.add_argument('--count', type=int, default=5, help="Số câu đố mỗi nhóm (mặc định 5)")
+    parser.add_argument('--seed', type=int, default=0, help="Seed của bộ câu đố (mặc định 0)")
+    parser.add_argument('--timeout', type=float, default=10.0, help="Thời gian tối đa mỗi lần giải (giây)")
+    parser.add_argument('--no-memory', action='store_true', help="Không đo bộ nhớ đỉnh (nhanh hơn)")
+    parser.add_argument('--baseline', help="Tệp kết quả gốc để so sánh")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="Tỷ lệ chậm hơn cho phép so với kết quả gốc (mặc định 0.2)")
+    parser.add_argument('--min-delta', type=float, default=0.001,
+                        help="Chênh lệch thời gian tối thiểu (giây) để tính là hồi quy (mặc định 0.001)")
+    return parser
+
+
+def main(argv=None):
+    """
+    Điểm vào dòng lệnh.
+
+    Args:
+        argv: Danh sách tham số (mặc định sys.argv[1:])
+
+    Returns:
+        int: Mã thoát (1 nếu có hồi quy so với kết quả gốc)
+    """
+    args = build_parser().parse_args(argv)
+
+    def log(message):
+        print(message, file=sys.stderr)
+
+    corpus = build_corpus(args.seed, args.count, args.sizes, args.difficulties)
+    log(f"Bộ câu đố: {len(corpus)} câu (seed {args.seed})")
+    results = run_benchmark(corpus, args.algorithms or ALGORITHMS, args.timeout, not args.no_memory, log)
+
+    report = {
+        'meta': {
+            'seed': args.seed,
+            'count': args.count,
+            'sizes': args.sizes,
+            'difficulties': args.difficulties,
+            'timeout': args.timeout,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+        },
+        'results': results,
+    }
+    text = json.dumps(json_safe(report), ensure_ascii=False, indent=2)
+    if args.output == '-':
+        print(text)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as target:
+            target.write(text + '\n')
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, encoding='utf-8') as source:
+        baseline = json.load(source)
+    for key in ('seed', 'count', 'timeout'):
+        if baseline.get('meta', {}).get(key) != report['meta'][key]:
+            log(f"Cảnh báo: '{key}' khác kết quả gốc, so sánh có thể không có ý nghĩa")
+    lines, regressions = compare(results, baseline.get('results', {}), args.threshold, args.min_delta)
+    for line in lines:
+        log(line)
+    if regressions:
+        log(f"{len(regressions)} nhóm hồi quy so với {args.baseline}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
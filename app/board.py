@@ -0,0 +1,160 @@
+import math
+import numpy as np
+
+
+def as_board_array(boards):
+    """
+    Chuyển một bảng (N, N) hoặc một chồng bảng (M, N, N) thành mảng uint8.
+    uint8 đủ chứa mọi giá trị của lưới 9x9, 16x16 và 25x25.
+
+    Args:
+        boards: Bảng 2D, danh sách bảng hoặc ndarray
+
+    Returns:
+        np.ndarray: Mảng uint8 (không sao chép nếu đầu vào đã là uint8)
+    """
+    array = np.asarray(boards, dtype=np.uint8)
+    if array.ndim not in (2, 3) or array.shape[-1] != array.shape[-2]:
+        raise ValueError(f"Kích thước bảng không hợp lệ: {array.shape}")
+    box_size = math.isqrt(array.shape[-1])
+    if box_size * box_size != array.shape[-1]:
+        raise ValueError(f"Kích thước lưới không phải số chính phương: {array.shape[-1]}")
+    return array
+
+
+def board_units(boards):
+    """
+    Xếp mọi hàng, cột và hộp của một chồng bảng thành các đơn vị có cùng độ dài.
+
+    Args:
+        boards: Mảng (M, N, N)
+
+    Returns:
+        np.ndarray: Mảng (M, 3N, N): N hàng, N cột rồi N hộp của từng bảng
+    """
+    count, n = boards.shape[0], boards.shape[-1]
+    box_size = math.isqrt(n)
+    # (bảng, hàng hộp, hàng trong hộp, cột hộp, cột trong hộp) -> (bảng, hộp, ô trong hộp)
+    boxes = boards.reshape(count, box_size, box_size, box_size, box_size).transpose(0, 1, 3, 2, 4)
+    return np.concatenate((boards, boards.transpose(0, 2, 1), boxes.reshape(count, n, n)), axis=1)
+
+
+def _duplicate_mask(boards):
+    """
+    Đánh dấu các giá trị khác 0 lặp lại trong mỗi đơn vị: sau khi sắp xếp từng đơn vị,
+    một giá trị trùng là một cặp phần tử liền kề bằng nhau.
+
+    Args:
+        boards: Mảng (M, N, N)
+
+    Returns:
+        np.ndarray: Mảng bool (M, 3N, N - 1)
+    """
+    ordered = np.sort(board_units(boards), axis=-1)
+    return (ordered[..., 1:] == ordered[..., :-1]) & (ordered[..., 1:] != 0)
+
+
+def count_conflicts_batch(boards):
+    """
+    Đếm số xung đột của từng bảng trong một chồng bảng (mỗi giá trị xuất hiện k > 1 lần
+    trong một hàng, cột hoặc hộp tính k - 1 xung đột).
+
+    Args:
+        boards: Chồng bảng (M, N, N)
+
+    Returns:
+        np.ndarray: Số xung đột của từng bảng, dạng (M,)
+    """
+    boards = as_board_array(boards)
+    return _duplicate_mask(boards).sum(axis=(1, 2))
+
+
+def is_valid_batch(boards):
+    """
+    Kiểm tra từng bảng trong một chồng bảng không có giá trị trùng trong hàng, cột hoặc hộp
+    (ô trống được bỏ qua).
+
+    Args:
+        boards: Chồng bảng (M, N, N)
+
+    Returns:
+        np.ndarray: Mảng bool (M,)
+    """
+    boards = as_board_array(boards)
+    return ~_duplicate_mask(boards).any(axis=(1, 2))
+
+
+def is_solved_batch(boards):
+    """
+    Kiểm tra từng bảng trong một chồng bảng đã được điền đủ và hợp lệ.
+
+    Args:
+        boards: Chồng bảng (M, N, N)
+
+    Returns:
+        np.ndarray: Mảng bool (M,)
+    """
+    boards = as_board_array(boards)
+    return is_valid_batch(boards) & (boards != 0).all(axis=(1, 2))
+
+
+class NumpyBoard:
+    """
+    Bảng Sudoku lưu trong một ndarray uint8 (N, N), với các phép kiểm tra trùng lặp
+    được vector hóa trên toàn bộ hàng, cột và hộp.
+    """
+
+    def __init__(self, board):
+        """
+        Khởi tạo bảng từ danh sách 2D hoặc ndarray (luôn sao chép).
+
+        Args:
+            board: Bảng Sudoku 2D
+        """
+        self.cells = np.array(as_board_array(board), copy=True)
+        if self.cells.ndim != 2:
+            raise ValueError(f"Cần một bảng 2D, nhận được kích thước {self.cells.shape}")
+        self.grid_size = self.cells.shape[0]
+        self.box_size = math.isqrt(self.grid_size)
+
+    def __getitem__(self, position):
+        row, col = position
+        return int(self.cells[row, col])
+
+    def __setitem__(self, position, value):
+        row, col = position
+        self.cells[row, col] = value
+
+    def count_conflicts(self):
+        """
+        Đếm số xung đột trong bảng.
+
+        Returns:
+            int: Số xung đột
+        """
+        return int(count_conflicts_batch(self.cells[np.newaxis])[0])
+
+    def is_valid(self):
+        """Kiểm tra bảng không có giá trị trùng trong hàng, cột hoặc hộp."""
+        return bool(is_valid_batch(self.cells[np.newaxis])[0])
+
+    def is_complete(self):
+        """Kiểm tra bảng không còn ô trống."""
+        return bool(self.cells.all())
+
+    def is_solved(self):
+        """Kiểm tra bảng đã được điền đủ và hợp lệ."""
+        return self.is_complete() and self.is_valid()
+
+    def count_empty(self):
+        """Đếm số ô trống."""
+        return int(self.grid_size * self.grid_size - np.count_nonzero(self.cells))
+
+    def to_list(self):
+        """
+        Chuyển bảng về danh sách 2D kiểu int của Python.
+
+        Returns:
+            list: Bảng Sudoku 2D
+        """
+        return self.cells.tolist()
@@ -0,0 +1,275 @@
+"""
+Dạng chính tắc của câu đố theo các phép đối xứng của Sudoku và bộ nhớ đệm lời giải.
+
+Hai câu đố là tương đương khi biến đổi được sang nhau bằng cách đổi nhãn chữ số, hoán vị
+các dải hàng/cột, hoán vị hàng/cột trong một dải và chuyển vị. Các phép này giữ tính hợp
+lệ, nên lời giải của một câu đố cho ngay lời giải của mọi câu đố tương đương với nó.
+
+canonical_form sắp hàng và cột theo các bất biến của vị trí ô đã điền. Chúng không phụ
+thuộc nhãn chữ số hay thứ tự hàng/cột. Các nhóm hòa được thử hết, tối đa MAX_TIE_ORDERS
+thứ tự mỗi chiều. Chữ số được đánh nhãn lại theo thứ tự xuất hiện, rồi chọn bảng nhỏ nhất.
+Khóa luôn là một biến đổi thật của câu đố, nên lời giải ánh xạ ngược luôn đúng. Khi vượt
+giới hạn thử, hai câu đố tương đương chỉ có thể nhận hai khóa khác nhau.
+"""
+import itertools
+import math
+import threading
+from collections import OrderedDict
+
+# Số thứ tự hàng (và cột) tối đa được thử khi các bất biến bằng nhau
+MAX_TIE_ORDERS = 16
+
+
+class SymmetryTransform:
+    """
+    Phép biến đổi từ một câu đố sang dạng chính tắc: chuyển vị (tùy chọn), chọn hàng và cột
+    theo thứ tự mới, đổi nhãn chữ số.
+    """
+
+    def __init__(self, grid_size, transpose, rows, cols, digits):
+        """
+        Args:
+            grid_size: Kích thước lưới
+            transpose: True nếu chuyển vị bảng trước khi hoán vị
+            rows: rows[i] là chỉ số hàng (của bảng sau chuyển vị) đứng ở vị trí i
+            cols: cols[j] là chỉ số cột đứng ở vị trí j
+            digits: {chữ số gốc: chữ số chính tắc} của các chữ số có trong câu đố; các chữ
+                số còn thiếu được gán các nhãn còn lại theo thứ tự tăng dần
+        """
+        self.grid_size = grid_size
+        self.transpose = transpose
+        self.rows = rows
+        self.cols = cols
+        digits = dict(digits)
+        missing = [num for num in range(1, grid_size + 1) if num not in digits]
+        free = sorted(set(range(1, grid_size + 1)) - set(digits.values()))
+        digits.update(zip(missing, free))
+        self.digits = [0] * (grid_size + 1)
+        self.inverse = [0] * (grid_size + 1)
+        for original, label in digits.items():
+            self.digits[original] = label
+            self.inverse[label] = original
+
+    def apply(self, board):
+        """
+        Biến đổi một bảng (câu đố hoặc lời giải của nó) sang dạng chính tắc.
+
+        Args:
+            board: Bảng Sudoku 2D
+
+        Returns:
+            list: Bảng chính tắc
+        """
+        if self.transpose:
+            board = [list(column) for column in zip(*board)]
+        digits = self.digits
+        return [[digits[board[r][c]] for c in self.cols] for r in self.rows]
+
+    def invert(self, board):
+        """
+        Ánh xạ một bảng chính tắc (thường là lời giải đã lưu) về hệ tọa độ và nhãn gốc.
+
+        Args:
+            board: Bảng chính tắc 2D
+
+        Returns:
+            list: Bảng theo câu đố ban đầu
+        """
+        n = self.grid_size
+        inverse = self.inverse
+        result = [[0] * n for _ in range(n)]
+        for i, r in enumerate(self.rows):
+            target = result[r]
+            source = board[i]
+            for j, c in enumerate(self.cols):
+                target[c] = inverse[source[j]]
+        if self.transpose:
+            result = [list(column) for column in zip(*result)]
+        return result
+
+
+def _tied_orders(items, key, limit):
+    """
+    Các cách sắp 'items' tăng dần theo 'key', hoán vị hết các nhóm có khóa bằng nhau.
+
+    Args:
+        items: Các phần tử cần sắp
+        key: Hàm bất biến của phần tử
+        limit: Số cách sắp tối đa
+
+    Returns:
+        list: Các bộ phần tử theo thứ tự
+    """
+    ordered = sorted(items, key=key)
+    groups = [list(itertools.islice(itertools.permutations(group), limit))
+              for group in (list(group) for _, group in itertools.groupby(ordered, key=key))]
+    orders = (tuple(itertools.chain.from_iterable(parts)) for parts in itertools.product(*groups))
+    return list(itertools.islice(orders, limit))
+
+
+def _line_orders(keys, base, limit):
+    """
+    Các thứ tự hàng (hoặc cột) hợp lệ với Sudoku: dải sắp theo bất biến của dải, hàng trong
+    mỗi dải sắp theo bất biến của hàng.
+
+    Args:
+        keys: Bất biến của từng hàng
+        base: Cạnh của hộp (số hàng trong một dải)
+        limit: Số thứ tự tối đa
+
+    Returns:
+        list: Các bộ chỉ số hàng theo thứ tự mới
+    """
+    bands = [range(b * base, (b + 1) * base) for b in range(base)]
+    band_keys = [tuple(sorted(keys[i] for i in band)) for band in bands]
+    band_lines = [_tied_orders(band, keys.__getitem__, limit) for band in bands]
+    orders = []
+    for band_order in _tied_orders(range(base), band_keys.__getitem__, limit):
+        for lines in itertools.product(*(band_lines[b] for b in band_order)):
+            orders.append(tuple(itertools.chain.from_iterable(lines)))
+            if len(orders) >= limit:
+                return orders
+    return orders
+
+
+def _line_keys(board, base):
+    """
+    Bất biến của từng hàng: số ô đã điền, số ô đã điền trong từng hộp của hàng (đã sắp) và
+    số ô đã điền của các cột chứa chúng (đã sắp). Không đổi khi đổi nhãn chữ số hay hoán vị
+    hàng/cột hợp lệ.
+
+    Args:
+        board: Bảng Sudoku 2D
+        base: Cạnh của hộp
+
+    Returns:
+        list: Bất biến của từng hàng
+    """
+    col_counts = [sum(1 for value in column if value) for column in zip(*board)]
+    keys = []
+    for row in board:
+        filled = [c for c, value in enumerate(row) if value]
+        stacks = [0] * base
+        for c in filled:
+            stacks[c // base] += 1
+        keys.append((len(filled), tuple(sorted(stacks)), tuple(sorted(col_counts[c] for c in filled))))
+    return keys
+
+
+def _relabelled(board, rows, cols):
+    """
+    Bảng theo thứ tự hàng/cột cho trước, chữ số đánh nhãn lại theo thứ tự xuất hiện.
+
+    Returns:
+        tuple: (bảng phẳng dạng bytes, {chữ số gốc: nhãn mới})
+    """
+    labels = {}
+    cells = bytearray(len(rows) * len(cols))
+    k = 0
+    for r in rows:
+        source = board[r]
+        for c in cols:
+            value = source[c]
+            if value:
+                label = labels.get(value)
+                if label is None:
+                    label = labels[value] = len(labels) + 1
+                cells[k] = label
+            k += 1
+    return bytes(cells), labels
+
+
+def canonical_form(board, grid_size=9):
+    """
+    Đưa câu đố về dạng chính tắc theo các phép đối xứng của Sudoku.
+
+    Args:
+        board: Câu đố dạng bảng 2D (0 là ô trống)
+        grid_size: Kích thước lưới (cạnh hộp là căn bậc hai)
+
+    Returns:
+        tuple: (khóa chính tắc dạng bytes, SymmetryTransform từ câu đố sang dạng chính tắc)
+    """
+    base = math.isqrt(grid_size)
+    best = None
+    for transpose in (False, True):
+        oriented = [list(column) for column in zip(*board)] if transpose else board
+        row_orders = _line_orders(_line_keys(oriented, base), base, MAX_TIE_ORDERS)
+        col_orders = _line_orders(_line_keys([list(column) for column in zip(*oriented)], base), base,
+                                  MAX_TIE_ORDERS)
+        for rows in row_orders:
+            for cols in col_orders:
+                key, labels = _relabelled(oriented, rows, cols)
+                if best is None or key < best[0]:
+                    best = (key, transpose, rows, cols, labels)
+
+    key, transpose, rows, cols, labels = best
+    return key, SymmetryTransform(grid_size, transpose, rows, cols, labels)
+
+
+class SolutionCache:
+    """
+    Bộ nhớ đệm LRU có giới hạn, an toàn với nhiều luồng, kèm bộ đếm trúng/trượt/loại bỏ.
+    """
+
+    def __init__(self, maxsize=1024):
+        """
+        Args:
+            maxsize: Số mục tối đa; mục ít được dùng gần đây nhất bị loại khi đầy
+        """
+        if maxsize < 1:
+            raise ValueError(f"Kích thước bộ nhớ đệm không hợp lệ: {maxsize}")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Lấy giá trị của một khóa và đánh dấu là vừa được dùng.
+
+        Returns:
+            Giá trị đã lưu, hoặc None nếu không có
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Lưu giá trị của một khóa, loại mục cũ nhất nếu vượt maxsize."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Xóa mọi mục (giữ nguyên bộ đếm)."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self):
+        """
+        Returns:
+            dict: {'hits', 'misses', 'evictions', 'size', 'maxsize'}
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+            }
@@ -1,18 +1,33 @@
 import time
 import copy
+import threading
 from openai import OpenAI
+from solve import SearchCancelled
 client = OpenAI(api_key="open ai key")
 
 
 class SudokuController:
     """Controller class điều phối giữa model và view"""
 
+    # Chu kỳ (ms) luồng chính đọc tiến độ/kết quả của luồng giải nền
+    PROGRESS_POLL_MS = 100
+
+    # Giới hạn của một lần giải bằng thuật toán để giao diện không chờ mãi một câu đố khó
+    SOLVE_LIMITS = {'time_limit': 120, 'max_frontier': 2_000_000}
+
     def __init__(self, model, view, app):
         self.model = model
         self.view = view
         self.app = app
 
+        # Trạng thái của thuật toán đang chạy nền (luồng nền chỉ ghi, luồng chính đọc)
+        self._solve_thread = None
+        self._cancel_event = None
+        self._solve_progress = None
+        self._solve_outcome = None
+
         self.initial_board = copy.deepcopy(model.board)
+        self.original_cells = self._find_original_cells()
 
         self.view.set_controller(self)
 
@@ -80,15 +95,17 @@ class SudokuController:
 
     def new_game(self, difficulty="medium", grid_size=9):
         """Bắt đầu trò chơi mới với độ khó và kích thước lưới chỉ định"""
+        self.cancel_solving()
         self.model.grid_size = grid_size
         self.model.generate_puzzle(difficulty)
         self.initial_board = copy.deepcopy(self.model.board)
+        self.original_cells = self._find_original_cells()
         self._update_view()
         self.view.update_lives_display(self.model.lives)
 
     def make_move(self, row, col, num):
         """Thực hiện nước đi và cập nhật view"""
-        if getattr(self.model, 'is_paused', False):
+        if getattr(self.model, 'is_paused', False) or self.is_solving():
             return
         if (row, col) in self.view.original_cells:
             return
@@ -98,7 +115,7 @@ class SudokuController:
             return
 
         if self.model.is_correct_move(row, col, num):
-            self.model.board[row][col] = num
+            self.model.set_cell(row, col, num)
             self.view.highlight_cell(row, col, self.view.success_color)
 
             if self.model.is_solved():
@@ -119,18 +136,18 @@ class SudokuController:
 
             self.view.master.after(1500, lambda: self.clear_cell(row, col))
 
+    def _find_original_cells(self):
+        """Tập các ô đề bài của câu đố hiện tại, chỉ tính lại khi có câu đố mới"""
+        return {(i, j) for i, row in enumerate(self.initial_board) for j, value in enumerate(row) if value != 0}
+
     def _update_view(self):
         """Cập nhật view với trạng thái model hiện tại"""
-        original_cells = set()
-        for i in range(self.model.grid_size):
-            for j in range(self.model.grid_size):
-                if self.model.board[i][j] != 0:
-                    original_cells.add((i, j))
-
-        self.view.update_board(self.model.board, original_cells)
+        self.view.update_board(self.model.board, self.original_cells)
 
     def get_hint(self):
         """Cung cấp gợi ý cho người dùng"""
+        if self.is_solving():
+            return
         if self.model.game_over():
             self.view.show_error("Game Over", "Bạn đã hết mạng. Hãy bắt đầu trò chơi mới.")
             return
@@ -138,13 +155,8 @@ class SudokuController:
         hint = self.model.get_hint()
         if hint:
             row, col, value = hint
-            if self.model.grid_size == 16 and value > 9:
-                display_value = chr(ord('A') + value - 10)
-                self.view.cell_vars[row][col].set(display_value)
-            else:
-                self.view.cell_vars[row][col].set(str(value))
-
-            self.model.board[row][col] = value
+            self.view.set_cell_value(row, col, value)
+            self.model.set_cell(row, col, value)
             self.view.highlight_cell(row, col, self.view.highlight_color)
 
             display_value = value if value <= 9 else chr(ord('A') + value - 10)
@@ -182,19 +194,16 @@ class SudokuController:
 
     def solve_puzzle(self):
         """Giải toàn bộ câu đố"""
+        if self.is_solving():
+            return
         if self.view.confirm_dialog("Giải câu đố",
                                     "Bạn có chắc muốn xem lời giải? Điều này sẽ kết thúc trò chơi hiện tại."):
             for i in range(self.model.grid_size):
                 for j in range(self.model.grid_size):
                     if self.model.board[i][j] == 0:
                         value = self.model.solution[i][j]
-                        self.model.board[i][j] = value
-
-                        if self.model.grid_size == 16 and value > 9:
-                            self.view.cell_vars[i][j].set(chr(ord('A') + value - 10))
-                        else:
-                            self.view.cell_vars[i][j].set(str(value))
-
+                        self.model.set_cell(i, j, value)
+                        self.view.set_cell_value(i, j, value)
                         self.view.highlight_cell(i, j, self.view.highlight_color)
 
             self.model.game_active = False
@@ -202,6 +211,8 @@ class SudokuController:
 
     def clear_board(self):
         """Xóa tất cả đầu vào của người dùng và thuật toán, khôi phục bảng ban đầu"""
+        if self.is_solving():
+            return
         if self.view.confirm_dialog("Xóa bảng", "Bạn có chắc muốn xóa tất cả đầu vào và khôi phục bảng ban đầu?"):
             self.model.board = copy.deepcopy(self.initial_board)
             self._update_view()
@@ -212,27 +223,96 @@ class SudokuController:
         if getattr(self.model, 'is_paused', False):
             return
         if (row, col) not in self.view.original_cells:
-            self.model.board[row][col] = 0
-            self.view.cell_vars[row][col].set("")
+            self.model.clear_cell(row, col)
+            self.view.set_cell_value(row, col, 0)
             self.view.highlight_cell(row, col, "white")
 
+    def is_solving(self):
+        """Kiểm tra có thuật toán đang chạy nền hay không"""
+        return self._solve_thread is not None
+
     def solve_with_algorithm(self, algorithm):
         """
-        Giải Sudoku bằng thuật toán được chọn.
+        Giải Sudoku bằng thuật toán được chọn trên một luồng nền.
+        Luồng nền chỉ ghi tiến độ và kết quả; luồng chính đọc lại chúng qua master.after,
+        nên mọi lời gọi Tk đều diễn ra trên luồng chính và cửa sổ không bị treo.
         """
         if self.model.game_over():
             self.view.show_error("Game Over", "Bạn đã hết mạng. Hãy bắt đầu trò chơi mới.")
             return
+        if self.is_solving():
+            self.view.show_message("Đang giải", "Một thuật toán đang chạy. Hãy chờ hoặc nhấn Hủy.")
+            return
 
         self.view.update_status(f"Đang giải bằng thuật toán {algorithm}...")
 
-        solution, metrics = self.model.solve_with_algorithm(algorithm)
+        self._cancel_event = threading.Event()
+        self._solve_progress = None
+        self._solve_outcome = None
+        instrument = self.view.instrument_var.get()
+        self._solve_thread = threading.Thread(target=self._run_solver,
+                                              args=(algorithm, self._cancel_event, instrument), daemon=True)
+        self.view.set_solving(True)
+        self._solve_thread.start()
+        self.view.master.after(self.PROGRESS_POLL_MS, self._poll_solver, algorithm)
+
+    def cancel_solving(self):
+        """Yêu cầu thuật toán đang chạy dừng lại (dừng hợp tác ở lần kiểm tra tiến độ kế tiếp)"""
+        if self._cancel_event is not None and not self._cancel_event.is_set():
+            self._cancel_event.set()
+            self.view.show_progress("Đang hủy thuật toán...")
+
+    def _run_solver(self, algorithm, cancel_event, instrument=False):
+        """Chạy trên luồng nền: giải và ghi lại kết quả, không gọi Tk"""
+        try:
+            result = self.model.solve_with_algorithm(algorithm, self._report_progress, cancel_event,
+                                                     self.SOLVE_LIMITS, instrument)
+            outcome = ('done', result)
+        except SearchCancelled:
+            outcome = ('cancelled', None)
+        except Exception as error:
+            outcome = ('error', error)
+        self._solve_outcome = outcome
+
+    def _report_progress(self, progress):
+        """Được solver gọi từ luồng nền: chỉ lưu tiến độ mới nhất"""
+        self._solve_progress = progress
+
+    def _poll_solver(self, algorithm):
+        """Chạy trên luồng chính: hiển thị tiến độ, xử lý kết quả khi luồng nền kết thúc"""
+        outcome = self._solve_outcome
+        if outcome is None:
+            progress = self._solve_progress
+            if progress is not None and not self._cancel_event.is_set():
+                self.view.show_progress(
+                    f"Đang giải bằng {algorithm}: {progress['states_explored']:,} trạng thái, "
+                    f"độ sâu {progress['depth']}, biên {progress['frontier_size']:,}")
+            self.view.master.after(self.PROGRESS_POLL_MS, self._poll_solver, algorithm)
+            return
+
+        self._solve_thread = None
+        self._cancel_event = None
+        self.view.set_solving(False)
+
+        status, value = outcome
+        if status == 'cancelled':
+            self.view.update_status(f"Đã hủy thuật toán {algorithm}.")
+            return
+        if status == 'error':
+            self.view.show_error("Lỗi khi giải", f"Thuật toán {algorithm} gặp lỗi: {value}")
+            return
 
+        solution, metrics = value
         if solution:
             self.model.board = solution
             self._update_view()
             self.view.update_status(f"Đã giải thành công bằng thuật toán {algorithm}!")
             self.view.show_algorithm_comparison(metrics)
+        elif metrics.get('status') == 'aborted':
+            reasons = {'time': "quá thời gian cho phép", 'states': "quá số trạng thái cho phép",
+                       'frontier': "quá số trạng thái trong bộ nhớ cho phép"}
+            reason = reasons.get(metrics['abort_reason'], "vượt giới hạn")
+            self.view.show_error("Dừng thuật toán", f"Thuật toán {algorithm} đã dừng vì {reason}.")
         else:
             self.view.show_error("Không tìm thấy lời giải",
                                  f"Thuật toán {algorithm} không tìm thấy lời giải cho câu đố này.")
@@ -0,0 +1,414 @@
+"""
+Định dạng nhị phân cho bộ câu đố lớn, đọc bằng mmap.
+
+Tệp gồm một tiêu đề cố định HEADER_FORMAT: mã nhận dạng, phiên bản, kích thước lưới, cờ
+có lời giải và số câu đố. Sau đó là các bản ghi cùng độ dài. Mỗi bản ghi là câu đố (bitmask
+ô đã cho, 1 bit/ô, rồi giá trị - 1 của các ô, 4 bit/ô). Khi tệp có lời giải, bản ghi kèm
+thêm giá trị - 1 của lời giải (4 bit/ô). Giá trị - 1 của lưới 16x16 vẫn vừa 4 bit, còn ô
+trống được đánh dấu bằng bitmask. Một câu 9x9 chiếm 52 byte, một câu 16x16 chiếm 160 byte
+(bản ghi kèm lời giải thêm 41 và 128 byte). Lưới 25x25 không được hỗ trợ.
+
+CorpusReader ánh xạ tệp vào bộ nhớ. Bản ghi chỉ được giải nén khi cần, từng câu đố một hoặc
+theo khối thành mảng NumPy, nên bộ nhớ không phụ thuộc số câu đố trong tệp.
+
+Chuyển đổi với định dạng văn bản (trong thư mục app/, giống main.py):
+    python corpus.py pack puzzles.txt puzzles.sdkc
+    python corpus.py unpack puzzles.sdkc puzzles.txt
+    python corpus.py generate expert.sdkc --size 16 --difficulty expert --count 1000
+"""
+import argparse
+import mmap
+import struct
+import sys
+
+import numpy as np
+
+from puzzle_format import format_puzzle, parse_puzzle, puzzle_field
+
+MAGIC = b'SDKC'
+VERSION = 1
+# Mã nhận dạng, phiên bản, kích thước lưới, cờ, 1 byte trống, số câu đố
+HEADER_FORMAT = '<4sBBBxQ'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+FLAG_SOLUTIONS = 1
+PACKED_GRID_SIZES = (9, 16)
+
+
+def record_layout(grid_size, with_solutions):
+    """
+    Độ dài các phần của một bản ghi.
+
+    Args:
+        grid_size: Kích thước lưới (9 hoặc 16)
+        with_solutions: Bản ghi có kèm lời giải
+
+    Returns:
+        tuple: (số byte bitmask, số byte giá trị, độ dài bản ghi)
+    """
+    if grid_size not in PACKED_GRID_SIZES:
+        raise ValueError(f"Định dạng nhị phân chỉ hỗ trợ lưới {PACKED_GRID_SIZES}: {grid_size}")
+    cells = grid_size * grid_size
+    mask_bytes = (cells + 7) // 8
+    value_bytes = (cells + 1) // 2
+    return mask_bytes, value_bytes, mask_bytes + value_bytes * (2 if with_solutions else 1)
+
+
+def _pack_values(values, target, offset, grid_size, mask_offset=None):
+    """
+    Ghi giá trị - 1 của các ô (4 bit/ô, ô chẵn ở 4 bit thấp) vào 'target' từ 'offset'; với
+    'mask_offset', ô khác 0 được bật bit trong bitmask, ngược lại mọi ô phải có giá trị.
+    """
+    for i, value in enumerate(values):
+        if not value:
+            if mask_offset is None:
+                raise ValueError("Lời giải không được có ô trống")
+            continue
+        if not 1 <= value <= grid_size:
+            raise ValueError(f"Giá trị không hợp lệ cho lưới {grid_size}x{grid_size}: {value}")
+        if mask_offset is not None:
+            target[mask_offset + (i >> 3)] |= 1 << (i & 7)
+        target[offset + (i >> 1)] |= (value - 1) << (4 * (i & 1))
+
+
+def _unpack_values(data, offset, cells, grid_size, mask_offset=None):
+    """Đọc lại bảng 2D đã ghi bởi _pack_values."""
+    values = []
+    for i in range(cells):
+        if mask_offset is not None and not (data[mask_offset + (i >> 3)] >> (i & 7)) & 1:
+            values.append(0)
+        else:
+            values.append(((data[offset + (i >> 1)] >> (4 * (i & 1))) & 15) + 1)
+    return [values[r * grid_size:(r + 1) * grid_size] for r in range(grid_size)]
+
+
+class CorpusWriter:
+    """
+    Ghi tuần tự một tệp bộ câu đố nhị phân; số câu đố trong tiêu đề được cập nhật khi đóng.
+    Dùng được như context manager.
+    """
+
+    def __init__(self, path, grid_size, with_solutions=False):
+        """
+        Args:
+            path: Tệp cần ghi (ghi đè nếu đã có)
+            grid_size: Kích thước lưới của mọi câu đố (9 hoặc 16)
+            with_solutions: Mỗi câu đố có kèm lời giải
+        """
+        self.grid_size = grid_size
+        self.with_solutions = with_solutions
+        self.mask_bytes, self.value_bytes, self.record_size = record_layout(grid_size, with_solutions)
+        self.count = 0
+        self._file = open(path, 'wb')
+        self._write_header()
+
+    def _write_header(self):
+        flags = FLAG_SOLUTIONS if self.with_solutions else 0
+        self._file.write(struct.pack(HEADER_FORMAT, MAGIC, VERSION, self.grid_size, flags, self.count))
+
+    def append(self, board, solution=None):
+        """
+        Thêm một câu đố.
+
+        Args:
+            board: Câu đố dạng bảng 2D
+            solution: Lời giải dạng bảng 2D (bắt buộc nếu with_solutions)
+        """
+        if len(board) != self.grid_size:
+            raise ValueError(f"Câu đố không phải lưới {self.grid_size}x{self.grid_size}")
+        if self.with_solutions and solution is None:
+            raise ValueError("Tệp có lời giải nhưng câu đố không kèm lời giải")
+        record = bytearray(self.record_size)
+        _pack_values([value for row in board for value in row], record, self.mask_bytes, self.grid_size, 0)
+        if self.with_solutions:
+            _pack_values([value for row in solution for value in row], record, self.mask_bytes + self.value_bytes,
+                         self.grid_size)
+        self._file.write(record)
+        self.count += 1
+
+    def close(self):
+        """Ghi số câu đố vào tiêu đề và đóng tệp."""
+        if self._file.closed:
+            return
+        self._file.seek(0)
+        self._write_header()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+class CorpusReader:
+    """
+    Đọc tệp bộ câu đố nhị phân qua mmap: truy cập ngẫu nhiên O(1), duyệt lười từng câu đố,
+    hoặc giải nén theo khối thành mảng NumPy. Dùng được như context manager.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path: Tệp bộ câu đố
+
+        Raises:
+            ValueError: Nếu tệp không đúng định dạng
+        """
+        with open(path, 'rb') as source:
+            self._mmap = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(self._mmap) < HEADER_SIZE:
+                raise ValueError("Tệp quá ngắn để là bộ câu đố nhị phân")
+            magic, version, grid_size, flags, count = struct.unpack_from(HEADER_FORMAT, self._mmap)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError("Tệp không phải bộ câu đố nhị phân hoặc khác phiên bản")
+            self.grid_size = grid_size
+            self.with_solutions = bool(flags & FLAG_SOLUTIONS)
+            self.mask_bytes, self.value_bytes, self.record_size = record_layout(grid_size, self.with_solutions)
+            if len(self._mmap) < HEADER_SIZE + count * self.record_size:
+                raise ValueError("Tệp bị cắt ngắn")
+            self.count = count
+        except ValueError:
+            self._mmap.close()
+            raise
+
+    def __len__(self):
+        return self.count
+
+    def _offset(self, index):
+        """Vị trí của bản ghi thứ 'index' (hỗ trợ chỉ số âm)."""
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(f"Chỉ số câu đố ngoài phạm vi: {index}")
+        return HEADER_SIZE + index * self.record_size
+
+    def __getitem__(self, index):
+        """Câu đố thứ 'index' dạng bảng 2D."""
+        offset = self._offset(index)
+        return _unpack_values(self._mmap, offset + self.mask_bytes, self.grid_size * self.grid_size,
+                              self.grid_size, offset)
+
+    def solution(self, index):
+        """Lời giải của câu đố thứ 'index' dạng bảng 2D, None nếu tệp không có lời giải."""
+        if not self.with_solutions:
+            return None
+        offset = self._offset(index) + self.mask_bytes + self.value_bytes
+        return _unpack_values(self._mmap, offset, self.grid_size * self.grid_size, self.grid_size)
+
+    def __iter__(self):
+        """Duyệt lười các câu đố."""
+        for index in range(self.count):
+            yield self[index]
+
+    def records(self):
+        """
+        Duyệt lười các cặp (câu đố, lời giải); lời giải là None nếu tệp không có lời giải.
+
+        Yields:
+            tuple: (câu đố, lời giải)
+        """
+        for index in range(self.count):
+            yield self[index], self.solution(index)
+
+    def packed_view(self, start=0, stop=None):
+        """
+        Mảng uint8 (số câu đố, độ dài bản ghi) trỏ thẳng vào vùng nhớ ánh xạ, không sao chép.
+        Mảng chỉ hợp lệ khi tệp còn mở.
+
+        Args:
+            start: Câu đố đầu tiên
+            stop: Sau câu đố cuối cùng (mặc định hết tệp)
+
+        Returns:
+            np.ndarray: Các bản ghi đã nén
+        """
+        start, stop, _ = slice(start, stop).indices(self.count)
+        count = max(0, stop - start)
+        return np.frombuffer(self._mmap, dtype=np.uint8, count=count * self.record_size,
+                             offset=HEADER_SIZE + start * self.record_size).reshape(count, self.record_size)
+
+    def boards_array(self, start=0, stop=None, solutions=False):
+        """
+        Giải nén một khối câu đố (hoặc lời giải) thành mảng (số câu đố, N, N) bằng NumPy.
+
+        Args:
+            start: Câu đố đầu tiên
+            stop: Sau câu đố cuối cùng (mặc định hết tệp)
+            solutions: True để lấy lời giải thay cho câu đố
+
+        Returns:
+            np.ndarray: Mảng uint8, 0 là ô trống
+        """
+        if solutions and not self.with_solutions:
+            raise ValueError("Tệp không có lời giải")
+        records = self.packed_view(start, stop)
+        cells = self.grid_size * self.grid_size
+        offset = self.mask_bytes + (self.value_bytes if solutions else 0)
+        packed = records[:, offset:offset + self.value_bytes]
+        values = np.empty((len(records), 2 * self.value_bytes), dtype=np.uint8)
+        values[:, 0::2] = packed & 15
+        values[:, 1::2] = packed >> 4
+        values = values[:, :cells] + 1
+        if not solutions:
+            values *= np.unpackbits(records[:, :self.mask_bytes], axis=1, bitorder='little')[:, :cells]
+        return values.reshape(len(records), self.grid_size, self.grid_size)
+
+    def close(self):
+        """Đóng tệp; nếu còn mảng của packed_view, vùng nhớ được giải phóng khi chúng bị hủy."""
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+def is_corpus_file(path):
+    """Kiểm tra tệp có bắt đầu bằng mã nhận dạng của định dạng nhị phân không."""
+    try:
+        with open(path, 'rb') as source:
+            return source.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def text_to_corpus(lines, path, with_solutions=False):
+    """
+    Chuyển các dòng văn bản "câu đố[,lời giải]" thành tệp nhị phân; bỏ qua dòng trống và dòng
+    chú thích '#'. Kích thước lưới lấy từ câu đố đầu tiên.
+
+    Args:
+        lines: Iterable các dòng văn bản
+        path: Tệp nhị phân cần ghi
+        with_solutions: Đọc lời giải ở cột thứ hai của mỗi dòng
+
+    Returns:
+        int: Số câu đố đã ghi
+
+    Raises:
+        ValueError: Nếu một dòng không đọc được hoặc khác kích thước lưới
+    """
+    writer = None
+    try:
+        for line in lines:
+            text = puzzle_field(line)
+            if not text or text.startswith('#'):
+                continue
+            board, grid_size = parse_puzzle(text)
+            solution = None
+            if with_solutions:
+                fields = line.strip().split(',')
+                if len(fields) < 2:
+                    raise ValueError(f"Thiếu lời giải: {text}")
+                solution, _ = parse_puzzle(puzzle_field(fields[1]))
+            if writer is None:
+                writer = CorpusWriter(path, grid_size, with_solutions)
+            writer.append(board, solution)
+        if writer is None:
+            raise ValueError("Không có câu đố nào để ghi")
+        return writer.count
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def corpus_to_text(path, target):
+    """
+    Ghi tệp nhị phân ra văn bản, mỗi dòng "câu đố" hoặc "câu đố,lời giải".
+
+    Args:
+        path: Tệp nhị phân
+        target: Luồng văn bản cần ghi
+
+    Returns:
+        int: Số câu đố đã ghi
+    """
+    with CorpusReader(path) as reader:
+        for board, solution in reader.records():
+            line = format_puzzle(board)
+            if solution is not None:
+                line += ',' + format_puzzle(solution)
+            target.write(line + '\n')
+        return len(reader)
+
+
+def build_parser():
+    """Tạo bộ đọc tham số dòng lệnh."""
+    parser = argparse.ArgumentParser(description="Chuyển bộ câu đố giữa dạng văn bản và dạng nhị phân.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    pack = commands.add_parser('pack', help="Văn bản -> nhị phân")
+    pack.add_argument('input', help="Tệp văn bản, '-' để đọc stdin")
+    pack.add_argument('output', help="Tệp nhị phân")
+    pack.add_argument('--solutions', action='store_true', help="Đọc lời giải ở cột thứ hai của mỗi dòng")
+    unpack = commands.add_parser('unpack', help="Nhị phân -> văn bản")
+    unpack.add_argument('input', help="Tệp nhị phân")
+    unpack.add_argument('output', nargs='?', default='-', help="Tệp văn bản, '-' để ghi stdout (mặc định)")
+    generate = commands.add_parser('generate', help="Tạo câu đố mới (kèm lời giải) ghi thẳng ra tệp nhị phân")
+    generate.add_argument('output', help="Tệp nhị phân")
+    generate.add_argument('--size', type=int, choices=PACKED_GRID_SIZES, default=9, help="Kích thước lưới")
+    generate.add_argument('--difficulty', default='medium', help="Độ khó (mặc định medium)")
+    generate.add_argument('--count', type=int, default=100, help="Số câu đố (mặc định 100)")
+    return parser
+
+
+def generate_corpus(path, grid_size, difficulty, count):
+    """
+    Tạo câu đố bằng SudokuModel và ghi lần lượt ra tệp nhị phân kèm lời giải.
+
+    Args:
+        path: Tệp nhị phân cần ghi
+        grid_size: Kích thước lưới
+        difficulty: Độ khó
+        count: Số câu đố
+
+    Returns:
+        int: Số câu đố đã ghi
+    """
+    from puzzle_pool import generate_puzzle
+    with CorpusWriter(path, grid_size, with_solutions=True) as writer:
+        for _ in range(count):
+            board, solution, _ = generate_puzzle(grid_size, difficulty)
+            writer.append(board, solution)
+        return writer.count
+
+
+def main(argv=None):
+    """
+    Điểm vào dòng lệnh.
+
+    Args:
+        argv: Danh sách tham số (mặc định sys.argv[1:])
+
+    Returns:
+        int: Mã thoát
+    """
+    args = build_parser().parse_args(argv)
+    if args.command == 'pack':
+        source = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+        try:
+            count = text_to_corpus(source, args.output, args.solutions)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+    elif args.command == 'generate':
+        count = generate_corpus(args.output, args.size, args.difficulty, args.count)
+    else:
+        target = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+        try:
+            count = corpus_to_text(args.input, target)
+        finally:
+            if target is not sys.stdout:
+                target.close()
+    print(f"{count} câu đố", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""
+Đo bộ nhớ, cấp phát, GC và thời gian theo nhóm hàm của một lần tìm kiếm.
+
+Chỉ dùng khi bật set_instrumentation của solver: tracemalloc và cProfile làm lần giải chậm
+đi nhiều lần, nên thời gian theo nhóm là tỷ lệ tương đối chứ không phải thời gian thực.
+"""
+import cProfile
+import gc
+import pstats
+import sys
+import time
+import tracemalloc
+
+
+def profile_function_name(function):
+    """
+    Tên ngắn của một mục trong cProfile: tên hàm Python, 'heapq.heappush' cho hàm dựng sẵn
+    của module, 'deque.popleft' cho phương thức dựng sẵn.
+
+    Args:
+        function: Khóa (tệp, dòng, tên) của pstats
+
+    Returns:
+        str: Tên ngắn
+    """
+    _, _, name = function
+    if name.startswith("<built-in method "):
+        return name[len("<built-in method "):-1].lstrip('_')
+    if name.startswith("<method '"):
+        method, _, owner = name[len("<method '"):].partition("' of '")
+        owner = owner.split("'")[0].split('.')[-1]
+        return f"{owner}.{method}"
+    return name
+
+
+class SearchProfiler:
+    """
+    Context manager đo một lần tìm kiếm: bộ nhớ đỉnh (tracemalloc), số khối được cấp phát
+    thêm, số lần và thời gian dừng của GC, thời gian riêng (tottime) của các hàm theo nhóm.
+    """
+
+    def __init__(self, sections):
+        """
+        Args:
+            sections: {tên nhóm: tập tên hàm (theo profile_function_name)}
+        """
+        self.sections = sections
+        self.report = None
+        self._profiler = None
+        self._gc_started = None
+        self._gc_collections = 0
+        self._gc_pause = 0.0
+
+    def _on_gc(self, phase, info):
+        """Callback của gc: cộng dồn thời gian giữa 'start' và 'stop' của mỗi lần thu gom."""
+        if phase == 'start':
+            self._gc_started = time.perf_counter()
+        elif self._gc_started is not None:
+            self._gc_pause += time.perf_counter() - self._gc_started
+            self._gc_collections += 1
+            self._gc_started = None
+
+    def __enter__(self):
+        self._owns_tracing = not tracemalloc.is_tracing()
+        if self._owns_tracing:
+            tracemalloc.start()
+        else:
+            tracemalloc.reset_peak()
+        self._memory_start = tracemalloc.get_traced_memory()[0]
+        self._blocks_start = sys.getallocatedblocks()
+        gc.callbacks.append(self._on_gc)
+
+        self._profiler = cProfile.Profile()
+        try:
+            self._profiler.enable()
+        except ValueError:
+            # Một trình profile khác đang chạy: vẫn đo bộ nhớ và GC, bỏ thời gian theo nhóm
+            self._profiler = None
+        self._start_time = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        elapsed = time.perf_counter() - self._start_time
+        if self._profiler is not None:
+            self._profiler.disable()
+        blocks = sys.getallocatedblocks() - self._blocks_start
+        _, peak = tracemalloc.get_traced_memory()
+        if self._owns_tracing:
+            tracemalloc.stop()
+        gc.callbacks.remove(self._on_gc)
+
+        self.report = {
+            'peak_memory_bytes': max(0, peak - self._memory_start),
+            'allocated_blocks': blocks,
+            'gc_collections': self._gc_collections,
+            'gc_pause_time': self._gc_pause,
+            'profiled_time': elapsed,
+            'section_times': self._section_times(elapsed),
+        }
+        return False
+
+    def _section_times(self, elapsed):
+        """
+        Cộng thời gian riêng của các hàm vào nhóm của chúng; phần còn lại vào 'other'.
+
+        Args:
+            elapsed: Tổng thời gian của lần đo
+
+        Returns:
+            dict: {tên nhóm: giây}, rỗng nếu không chạy được cProfile
+        """
+        if self._profiler is None:
+            return {}
+        owner = {name: section for section, names in self.sections.items() for name in names}
+        times = dict.fromkeys(self.sections, 0.0)
+        for function, (_, _, total_time, _, _) in pstats.Stats(self._profiler).stats.items():
+            section = owner.get(profile_function_name(function))
+            if section is not None:
+                times[section] += total_time
+        times['other'] = max(0.0, elapsed - sum(times.values()))
+        return times
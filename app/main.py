@@ -1,7 +1,11 @@
+import os
 import tkinter as tk
 from model import SudokuModel
 from view import SelectionScreen, GameScreen
 from controller import SudokuController
+from puzzle_pool import PuzzlePool
+from canonical import SolutionCache
+from solution_store import SolutionStore
 import ttkbootstrap as ttkb
 import matplotlib
 
@@ -10,6 +14,15 @@ import matplotlib.pyplot as plt
 from solve import SudokuSolver
 'test'
 
+# Tệp lưu kho câu đố tạo sẵn giữa các lần chạy
+PUZZLE_POOL_PATH = os.path.join(os.path.expanduser("~"), ".sudoku_puzzle_pool.json")
+# Số lời giải giữ trong bộ nhớ đệm dùng chung cho các ván trong một lần chạy
+SOLUTION_CACHE_SIZE = 256
+# Kho lời giải trên đĩa, dùng chung với batch.py --store; chỉ giữ các lời giải mới nhất
+SOLUTION_STORE_PATH = os.path.join(os.path.expanduser("~"), ".sudoku_solutions.sqlite3")
+SOLUTION_STORE_MAX_ENTRIES = 100_000
+
+
 class SudokuApp:
     def __init__(self, root):
         self.root = root
@@ -24,6 +37,11 @@ class SudokuApp:
             pass
 
         self.model = None
+        self.puzzle_pool = PuzzlePool(PUZZLE_POOL_PATH)
+        self.puzzle_pool.start()
+        self.solution_cache = SolutionCache(SOLUTION_CACHE_SIZE)
+        self.solution_store = SolutionStore(SOLUTION_STORE_PATH)
+        self.solution_store.prune(SOLUTION_STORE_MAX_ENTRIES)
         self.show_selection_screen()
 
     def show_selection_screen(self):
@@ -34,7 +52,8 @@ class SudokuApp:
     def start_game(self, grid_size, difficulty, difficulty_display):
         for widget in self.root.winfo_children():
             widget.destroy()
-        self.model = SudokuModel(difficulty=difficulty, grid_size=grid_size)
+        self.model = SudokuModel(difficulty=difficulty, grid_size=grid_size, pool=self.puzzle_pool,
+                                 solution_cache=self.solution_cache, solution_store=self.solution_store)
         self.game_screen = GameScreen(self.root, grid_size)
         self.controller = SudokuController(self.model, self.game_screen, self)
         self.game_screen.set_controller(self.controller)
@@ -44,7 +63,11 @@ class SudokuApp:
 def main():
     root = ttkb.Window(title="Sudoku Game", themename="flatly")
     app = SudokuApp(root)
-    root.mainloop()
+    try:
+        root.mainloop()
+    finally:
+        app.puzzle_pool.stop(timeout=5)
+        app.solution_store.close()
 
 
 if __name__ == "__main__":
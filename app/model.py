@@ -1,7 +1,10 @@
 import random
 import copy
+import math
 import time
-from solve import get_solver
+from solve import BacktrackingSolver, BitboardState, DLXSolver, get_solver
+from rating import rate_puzzle
+from canonical import canonical_form
 
 
 class SudokuModel:
@@ -23,8 +26,39 @@ class SudokuModel:
         "expert": (190, 220)
     }
 
-    def __init__(self, difficulty="medium", max_lives=3, grid_size=9):
+    # Khoảng điểm (rating.rate_puzzle) mục tiêu của từng độ khó; số ô trống ở trên chỉ là
+    # điểm xuất phát, câu đố được tạo lại đến khi điểm rơi vào khoảng mục tiêu
+    DIFFICULTY_SCORES = {
+        "super_easy": (0, 20),
+        "easy": (20, 60),
+        "medium": (60, 120),
+        "difficult": (120, 180),
+        "expert": (180, float('inf'))
+    }
+
+    DIFFICULTY_SCORES_16X16 = {
+        "super_easy": (0, 60),
+        "easy": (60, 125),
+        "medium": (125, 155),
+        "difficult": (155, 175),
+        "expert": (175, float('inf'))
+    }
+
+    # Số lần tạo câu đố tối đa để tìm điểm nằm trong khoảng mục tiêu; hết số lần thì giữ
+    # câu đố có điểm gần khoảng nhất
+    MAX_RATING_ATTEMPTS = 8
+
+    # Số nút tìm kiếm tối đa cho mỗi lần thử một ứng viên khác khi xóa ô; vượt quá thì ô
+    # được giữ lại (coi như có thể có lời giải khác) để thời gian tạo câu đố luôn bị chặn
+    UNIQUENESS_CHECK_BUDGET = 64
+
+    def __init__(self, difficulty="medium", max_lives=3, grid_size=9, pool=None, solution_cache=None,
+                 solution_store=None):
         self.difficulty = difficulty
+        self.pool = pool
+        self.solution_cache = solution_cache
+        self.solution_store = solution_store
+        self.rating = None
         self.board = None
         self.solution = None
         self.max_lives = max_lives
@@ -41,8 +75,11 @@ class SudokuModel:
         self.generate_puzzle(difficulty)
 
     def generate_puzzle(self, difficulty):
-        """Tạo câu đố Sudoku mới với độ khó chỉ định"""
-        if self.grid_size == 9:
+        """Tạo câu đố Sudoku mới với độ khó chỉ định, lấy từ kho câu đố tạo sẵn nếu có"""
+        puzzle = self.pool.pop(self.grid_size, difficulty) if self.pool is not None else None
+        if puzzle is not None:
+            self.board, self.solution, self.rating = puzzle
+        elif self.grid_size == 9:
             self._generate_9x9_puzzle(difficulty)
         else:
             self._generate_16x16_puzzle(difficulty)
@@ -59,7 +96,52 @@ class SudokuModel:
 
     def _generate_9x9_puzzle(self, difficulty):
         """Tạo câu đố Sudoku 9x9"""
-        base = 3
+        self._generate_rated_puzzle(self.DIFFICULTY_LEVELS.get(difficulty, (40, 50)),
+                                    self.DIFFICULTY_SCORES.get(difficulty, (60, 120)))
+
+    def _generate_16x16_puzzle(self, difficulty):
+        """Tạo câu đố Sudoku 16x16"""
+        self._generate_rated_puzzle(self.DIFFICULTY_LEVELS_16X16.get(difficulty, (130, 160)),
+                                    self.DIFFICULTY_SCORES_16X16.get(difficulty, (125, 155)))
+
+    def _generate_rated_puzzle(self, empty_range, score_range):
+        """
+        Tạo câu đố có lời giải duy nhất và điểm độ khó trong khoảng mục tiêu. Câu đố được
+        tạo lại tối đa MAX_RATING_ATTEMPTS lần; nếu không lần nào đạt thì giữ câu đố có
+        điểm gần khoảng nhất. Kết quả chấm điểm được lưu vào self.rating.
+
+        Args:
+            empty_range: (min, max) số ô trống cần xóa
+            score_range: (min, max) điểm mục tiêu
+        """
+        base = math.isqrt(self.grid_size)
+        low, high = score_range
+        best = None
+        for _ in range(self.MAX_RATING_ATTEMPTS):
+            solution = self._generate_solution(base)
+            board = self._remove_cells(solution, random.randint(*empty_range))
+            rating = rate_puzzle(board, self.grid_size)
+            distance = max(low - rating['score'], rating['score'] - high, 0)
+            if best is None or distance < best[0]:
+                best = (distance, board, solution, rating)
+            if distance == 0:
+                break
+
+        _, self.board, self.solution, self.rating = best
+
+    @staticmethod
+    def _generate_solution(base):
+        """
+        Tạo một lưới đầy đủ ngẫu nhiên cho hộp cạnh 'base' không cần tìm kiếm: lấy lưới mẫu
+        hợp lệ rồi hoán vị các dải hàng/cột, các hàng/cột trong mỗi dải, đổi nhãn chữ số và
+        chuyển vị ngẫu nhiên. Mọi phép biến đổi đều giữ tính hợp lệ nên chi phí là O(N²).
+
+        Args:
+            base: Cạnh của hộp (3 cho 9x9, 4 cho 16x16, 5 cho 25x25)
+
+        Returns:
+            list: Lưới Sudoku đầy đủ cạnh base * base
+        """
         side = base * base
 
         def pattern(r, c):
@@ -71,147 +153,202 @@ class SudokuModel:
         rBase = range(base)
         rows = [g * base + r for g in shuffle(rBase) for r in shuffle(rBase)]
         cols = [g * base + c for g in shuffle(rBase) for c in shuffle(rBase)]
-        nums = shuffle(range(1, base * base + 1))
-
-        self.solution = [[nums[pattern(r, c)] for c in cols] for r in rows]
-
-        self.board = copy.deepcopy(self.solution)
+        nums = shuffle(range(1, side + 1))
 
-        squares = side * side
-        min_empty, max_empty = self.DIFFICULTY_LEVELS.get(difficulty, (40, 50))
-        empties = random.randint(min_empty, max_empty)
-
-        coords = [(i, j) for i in range(side) for j in range(side)]
-        random.shuffle(coords)
+        grid = [[nums[pattern(r, c)] for c in cols] for r in rows]
+        if random.random() < 0.5:
+            grid = [list(column) for column in zip(*grid)]
+        return grid
 
-        for i in range(empties):
-            if i < len(coords):
-                x, y = coords[i]
-                self.board[x][y] = 0
+    def count_solutions(self, board=None, limit=2):
+        """
+        Đếm số lời giải của bảng bằng DLX, dừng khi đạt 'limit' (2 là đủ để biết tính duy nhất)
 
-    def _generate_16x16_puzzle(self, difficulty):
-        """Tạo câu đố Sudoku 16x16"""
+        Args:
+            board: Bảng cần đếm (mặc định bảng hiện tại)
+            limit: Số lời giải tối đa cần đếm
 
-        self.board = [[0 for _ in range(16)] for _ in range(16)]
-        self.solution = [[0 for _ in range(16)] for _ in range(16)]
+        Returns:
+            int: Số lời giải (không vượt quá limit)
+        """
+        board = self.board if board is None else board
+        return DLXSolver(board, self.grid_size).count_solutions(limit)
 
-        self._fill_diagonal_boxes()
-        self._solve_sudoku(self.solution, 4)
+    def _remove_cells(self, solution, empties):
+        """
+        Xóa tối đa 'empties' ô theo thứ tự ngẫu nhiên, chỉ giữ lần xóa khi câu đố vẫn có
+        đúng một lời giải. Vì câu đố trước khi xóa chỉ có lời giải 'solution', mọi lời giải
+        khác sau khi xóa ô (row, col) phải đặt giá trị khác tại ô đó; nên chỉ cần thử từng
+        ứng viên khác của ô thay vì đếm lại toàn bộ lời giải. Với độ khó cao có thể không
+        xóa đủ 'empties' ô.
 
-        self.board = copy.deepcopy(self.solution)
+        Args:
+            solution: Lời giải đầy đủ
+            empties: Số ô trống mong muốn
 
-        min_empty, max_empty = self.DIFFICULTY_LEVELS_16X16.get(difficulty, (130, 160))
-        empties = random.randint(min_empty, max_empty)
+        Returns:
+            list: Câu đố có lời giải duy nhất
+        """
+        side = self.grid_size
+        board = copy.deepcopy(solution)
+        state = BitboardState(board, side, math.isqrt(side))
 
-        coords = [(i, j) for i in range(16) for j in range(16)]
+        coords = [(i, j) for i in range(side) for j in range(side)]
         random.shuffle(coords)
 
-        for i in range(empties):
-            if i < len(coords):
-                x, y = coords[i]
-                self.board[x][y] = 0
-
-    def _fill_diagonal_boxes(self):
-        """Điền các hộp chéo của bảng 16x16 (các hộp không phụ thuộc lẫn nhau)"""
-        box_size = 4
-        # Điền các hộp chéo
-        for i in range(0, 16, box_size):
-            self._fill_box(i, i)
-
-    def _fill_box(self, row, col):
-        """Điền một hộp 4x4 với các số 1-16 ngẫu nhiên"""
-        box_size = 4
-        nums = list(range(1, 17))
-        random.shuffle(nums)
-
-        index = 0
-        for i in range(box_size):
-            for j in range(box_size):
-                self.solution[row + i][col + j] = nums[index]
-                index += 1
-
-    def _solve_sudoku(self, board, base):
-        """Giải câu đố Sudoku sử dụng thuật toán backtracking"""
-        side = base * base
-
-        row, col = self._find_empty(board, side)
-        if row is None:
-            return True
+        removed = 0
+        for row, col in coords:
+            if removed >= empties:
+                break
+            value = board[row][col]
+            board[row][col] = 0
+            state.unplace(row, col, value)
+            if self._has_other_solution(board, row, col, value, state.candidate_mask(row, col)):
+                board[row][col] = value
+                state.place(row, col, value)
+            else:
+                removed += 1
+
+        return board
+
+    def _has_other_solution(self, board, row, col, value, mask):
+        """
+        Kiểm tra bảng có lời giải với ô (row, col) khác 'value' không. Ô chỉ còn một ứng
+        viên thì bị ép về 'value' nên không cần giải. Mỗi ứng viên khác được thử bằng quay
+        lui MRV trong tối đa UNIQUENESS_CHECK_BUDGET nút; hết ngân sách thì trả về True để
+        ô được giữ lại, nên câu đố trả về luôn có lời giải duy nhất.
 
-        numbers = list(range(1, side + 1))
-        random.shuffle(numbers)
-        for num in numbers:
-            if self._is_valid_placement(board, row, col, num, base):
-                board[row][col] = num
+        Args:
+            board: Bảng (ô (row, col) đang trống, được trả về trống sau khi kiểm tra)
+            row, col: Vị trí ô vừa xóa
+            value: Giá trị của ô trong lời giải đã biết
+            mask: Bitmask ứng viên của ô
 
-                if self._solve_sudoku(board, base):
+        Returns:
+            bool: True nếu tồn tại lời giải khác
+        """
+        mask &= ~(1 << (value - 1))
+        try:
+            for candidate in BitboardState.mask_to_values(mask):
+                board[row][col] = candidate
+                solver = BacktrackingSolver(board, self.grid_size)
+                solver.set_limits(max_states=self.UNIQUENESS_CHECK_BUDGET)
+                if solver.solve() or solver.status == 'aborted':
                     return True
-
-                board[row][col] = 0
-
-        return False
-
-    def _find_empty(self, board, side):
-        """Tìm một ô trống trong bảng"""
-        for i in range(side):
-            for j in range(side):
-                if board[i][j] == 0:
-                    return i, j
-        return None, None
-
-    def _is_valid_placement(self, board, row, col, num, base):
-        """Kiểm tra xem việc đặt 'num' tại vị trí (row, col) có hợp lệ không"""
-        side = base * base
-
-        for j in range(side):
-            if board[row][j] == num:
-                return False
-
-        for i in range(side):
-            if board[i][col] == num:
-                return False
-
-        box_row, box_col = base * (row // base), base * (col // base)
-        for i in range(box_row, box_row + base):
-            for j in range(box_col, box_col + base):
-                if board[i][j] == num:
-                    return False
-
-        return True
+            return False
+        finally:
+            board[row][col] = 0
 
     def is_valid_move(self, row, col, num):
         """Kiểm tra xem việc đặt 'num' tại vị trí (row, col) có hợp lệ theo quy tắc Sudoku không"""
-        if self.board[row][col] != 0:
-            return False
+        return self._board[row][col] == 0 and self._state.can_place(row, col, num)
 
-        for i in range(self.grid_size):
-            if self.board[row][i] == num:
-                return False
+    @property
+    def board(self):
+        """Bảng hiện tại; gán bảng mới sẽ dựng lại trạng thái theo dõi tăng dần"""
+        return self._board
 
-        for i in range(self.grid_size):
-            if self.board[i][col] == num:
-                return False
+    @board.setter
+    def board(self, board):
+        self._board = board
+        self._rebuild_tracking()
+
+    @property
+    def filled_count(self):
+        """Số ô đã có giá trị trên bảng hiện tại"""
+        return self.grid_size * self.grid_size - len(self._empty_cells) if self._board else 0
+
+    def _rebuild_tracking(self):
+        """
+        Dựng lại các chỉ mục tăng dần từ bảng hiện tại (O(N²), chỉ khi thay cả bảng).
+        Gồm bitmask từng hàng/cột/hộp (BitboardState), số lần xuất hiện của mỗi giá trị
+        trong từng đơn vị để đếm giá trị trùng, và danh sách ô trống kèm vị trí để xóa O(1).
+        """
+        self._empty_cells = []
+        self._empty_index = {}
+        self._unit_counts = []
+        self._duplicates = 0
+        self._state = None
+        if self._board is None:
+            return
+
+        size = len(self._board)
+        box_size = math.isqrt(size)
+        self._state = BitboardState([[0] * size for _ in range(size)], size, box_size)
+        self._unit_counts = [[0] * (size + 1) for _ in range(3 * size)]
+        for row in range(size):
+            for col in range(size):
+                value = self._board[row][col]
+                if value:
+                    self._track_value(row, col, value)
+                else:
+                    self._empty_index[(row, col)] = len(self._empty_cells)
+                    self._empty_cells.append((row, col))
+
+    def _units_of(self, row, col):
+        """Chỉ số hàng, cột và hộp của ô (row, col) trong _unit_counts"""
+        size = self._state.grid_size
+        return row, size + col, 2 * size + self._state.box_index[row][col]
+
+    def _track_value(self, row, col, value):
+        """Ghi nhận giá trị vừa đặt vào ô (row, col) trong các bộ đếm và bitmask"""
+        for unit in self._units_of(row, col):
+            counts = self._unit_counts[unit]
+            if counts[value]:
+                self._duplicates += 1
+            counts[value] += 1
+        self._state.place(row, col, value)
+
+    def _untrack_value(self, row, col, value):
+        """Gỡ giá trị khỏi ô (row, col); bit chỉ bị tắt khi không còn ô nào trong đơn vị giữ giá trị đó"""
+        masks = (self._state.rows, row), (self._state.cols, col), (self._state.boxes, self._state.box_index[row][col])
+        for unit, (mask, index) in zip(self._units_of(row, col), masks):
+            counts = self._unit_counts[unit]
+            counts[value] -= 1
+            if counts[value]:
+                self._duplicates -= 1
+            else:
+                mask[index] &= ~(1 << (value - 1))
+
+    def set_cell(self, row, col, value):
+        """
+        Đặt giá trị cho một ô và cập nhật tăng dần trạng thái theo dõi (O(1)).
 
-        box_size = 3 if self.grid_size == 9 else 4
-        box_row, box_col = box_size * (row // box_size), box_size * (col // box_size)
-        for i in range(box_row, box_row + box_size):
-            for j in range(box_col, box_col + box_size):
-                if self.board[i][j] == num:
-                    return False
+        Args:
+            row: Chỉ số hàng
+            col: Chỉ số cột
+            value: Giá trị mới (0 để xóa ô)
+        """
+        current = self._board[row][col]
+        if current == value:
+            return
+        if current:
+            self._untrack_value(row, col, current)
+        else:
+            # Hoán vị ô trống cuối danh sách vào chỗ ô vừa được điền
+            index = self._empty_index.pop((row, col))
+            last = self._empty_cells.pop()
+            if last != (row, col):
+                self._empty_cells[index] = last
+                self._empty_index[last] = index
+        self._board[row][col] = value
+        if value:
+            self._track_value(row, col, value)
+        else:
+            self._empty_index[(row, col)] = len(self._empty_cells)
+            self._empty_cells.append((row, col))
 
-        return True
+    def clear_cell(self, row, col):
+        """Xóa giá trị của ô (row, col)"""
+        self.set_cell(row, col, 0)
 
     def is_correct_move(self, row, col, num):
         """Kiểm tra xem nước đi có khớp với giải pháp không"""
         return self.solution[row][col] == num
 
     def is_solved(self):
-        """Kiểm tra xem câu đố đã được giải chưa"""
-        for i in range(self.grid_size):
-            for j in range(self.grid_size):
-                if self.board[i][j] == 0 or self.board[i][j] != self.solution[i][j]:
-                    return False
-        return True
+        """Kiểm tra xem câu đố đã được giải chưa (bảng đầy đủ và không có giá trị trùng)"""
+        return not self._empty_cells and self._duplicates == 0
 
     def game_over(self):
         """Kiểm tra xem trò chơi đã kết thúc do hết mạng chưa"""
@@ -219,16 +356,10 @@ class SudokuModel:
 
     def get_hint(self):
         """Cung cấp gợi ý bằng cách hiển thị một ô đúng"""
-        empty_cells = []
-        for i in range(self.grid_size):
-            for j in range(self.grid_size):
-                if self.board[i][j] == 0:
-                    empty_cells.append((i, j))
-
-        if not empty_cells:
+        if not self._empty_cells:
             return None
 
-        row, col = random.choice(empty_cells)
+        row, col = random.choice(self._empty_cells)
         value = self.solution[row][col]
 
         return (row, col, value)
@@ -260,23 +391,86 @@ class SudokuModel:
             self._pause_start_time = None
             self.is_paused = False
 
-    def solve_with_algorithm(self, algorithm):
+    def solve_with_algorithm(self, algorithm, progress_callback=None, cancel_event=None, limits=None,
+                             instrument=False):
         """
         Giải Sudoku bằng thuật toán được chỉ định.
 
+        Khi có solution_cache hoặc solution_store, câu đố được đưa về dạng chính tắc
+        (canonical.canonical_form). Nếu câu đố tương đương đã được cùng thuật toán giải thì
+        lời giải đã lưu được ánh xạ ngược về câu đố hiện tại mà không giải lại. Bộ nhớ đệm
+        được tra trước, rồi đến kho trên đĩa. Thông số khi đó là của lần giải đã lưu, kèm
+        'cache_hit' và 'lookup_time'. Chế độ đo chi tiết luôn giải thật.
+
         Args:
-            algorithm: Tên thuật toán ('dfs', 'bfs', 'backtracking', 'hill_climbing')
+            algorithm: Tên thuật toán của get_solver
+            progress_callback: Hàm nhận tiến độ (states_explored, depth, frontier_size), gọi từ luồng giải
+            cancel_event: threading.Event để hủy giữa chừng (solver báo SearchCancelled)
+            limits: Tham số set_limits của solver; vượt giới hạn thì metrics['status'] là 'aborted'
+            instrument: Bật đo bộ nhớ đỉnh, cấp phát, GC và thời gian theo nhóm hàm (chậm hơn)
 
         Returns:
             tuple: (solved_board, metrics) nếu tìm thấy lời giải, (None, metrics) nếu không
         """
+        canonical = None
+        if (self.solution_cache is not None or self.solution_store is not None) and not instrument:
+            lookup_start = time.perf_counter()
+            canonical, transform = canonical_form(self.board, self.grid_size)
+            cached = self._lookup_solution(algorithm, canonical)
+            if cached is not None:
+                solution, metrics = cached
+                metrics = dict(metrics, cache_hit=True, lookup_time=time.perf_counter() - lookup_start)
+                return (transform.invert(solution), metrics)
+
         solver = get_solver(algorithm, self.board, self.grid_size)
+        solver.set_monitor(progress_callback, cancel_event)
+        solver.set_limits(**(limits or {}))
+        solver.set_instrumentation(instrument)
 
         solved = solver.solve()
 
         metrics = solver.get_performance_metrics()
+        if canonical is not None:
+            if solved:
+                self._remember_solution(algorithm, canonical, transform.apply(solver.solution), metrics)
+            metrics['cache_hit'] = False
 
         if solved:
             return (solver.solution, metrics)
         else:
-            return (None, metrics)
\ No newline at end of file
+            return (None, metrics)
+
+    def _lookup_solution(self, algorithm, canonical):
+        """
+        Tìm lời giải đã lưu của một câu đố chính tắc: bộ nhớ đệm trước, rồi kho trên đĩa
+        (mục tìm thấy trong kho được đưa vào bộ nhớ đệm).
+
+        Args:
+            algorithm: Tên thuật toán
+            canonical: Khóa chính tắc của câu đố
+
+        Returns:
+            tuple: (lời giải chính tắc, thông số) hoặc None
+        """
+        cache_key = (algorithm, self.grid_size, canonical)
+        cached = self.solution_cache.get(cache_key) if self.solution_cache is not None else None
+        if cached is None and self.solution_store is not None:
+            cached = self.solution_store.get(algorithm, self.grid_size, canonical)
+            if cached is not None and self.solution_cache is not None:
+                self.solution_cache.put(cache_key, cached)
+        return cached
+
+    def _remember_solution(self, algorithm, canonical, solution, metrics):
+        """
+        Lưu lời giải chính tắc vào bộ nhớ đệm và kho trên đĩa (nếu có).
+
+        Args:
+            algorithm: Tên thuật toán
+            canonical: Khóa chính tắc của câu đố
+            solution: Lời giải chính tắc
+            metrics: Thông số của lần giải
+        """
+        if self.solution_cache is not None:
+            self.solution_cache.put((algorithm, self.grid_size, canonical), (solution, dict(metrics)))
+        if self.solution_store is not None:
+            self.solution_store.put(algorithm, self.grid_size, canonical, solution, metrics)
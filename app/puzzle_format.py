@@ -0,0 +1,69 @@
+import math
+
+# Ký tự của giá trị 1..25: '1'-'9' rồi 'A'-'P' (lưới 16x16 dùng '1'-'9', 'A'-'G')
+VALUE_CHARS = '123456789ABCDEFGHIJKLMNOP'
+EMPTY_CHARS = '.0-_'
+SUPPORTED_LENGTHS = {81: 9, 256: 16, 625: 25}
+
+_CHAR_VALUES = {char: value for value, char in enumerate(VALUE_CHARS, start=1)}
+_CHAR_VALUES.update({char.lower(): value for char, value in list(_CHAR_VALUES.items()) if char.isalpha()})
+_CHAR_VALUES.update({char: 0 for char in EMPTY_CHARS})
+
+
+def puzzle_field(line):
+    """
+    Lấy chuỗi câu đố từ một dòng: phần trước dấu phẩy hoặc khoảng trắng đầu tiên, để các
+    tệp dạng "câu đố,lời giải" hoặc có cột phụ vẫn đọc được.
+
+    Args:
+        line: Một dòng của tệp câu đố
+
+    Returns:
+        str: Chuỗi câu đố (có thể rỗng)
+    """
+    field = line.strip().split(',', 1)[0]
+    parts = field.split()
+    return parts[0] if parts else ''
+
+
+def parse_puzzle(text):
+    """
+    Chuyển chuỗi một dòng (81, 256 hoặc 625 ký tự) thành bảng 2D.
+
+    Args:
+        text: Chuỗi câu đố, ô trống là '.', '0', '-' hoặc '_'
+
+    Returns:
+        tuple: (bảng 2D, kích thước lưới)
+
+    Raises:
+        ValueError: Nếu độ dài hoặc ký tự không hợp lệ
+    """
+    grid_size = SUPPORTED_LENGTHS.get(len(text))
+    if grid_size is None:
+        raise ValueError(f"Độ dài câu đố không hợp lệ: {len(text)}")
+
+    values = []
+    for char in text:
+        value = _CHAR_VALUES.get(char)
+        if value is None or value > grid_size:
+            raise ValueError(f"Ký tự không hợp lệ cho lưới {grid_size}x{grid_size}: {char!r}")
+        values.append(value)
+    return [values[i * grid_size:(i + 1) * grid_size] for i in range(grid_size)], grid_size
+
+
+def format_puzzle(board, empty='.'):
+    """
+    Chuyển bảng 2D thành chuỗi một dòng.
+
+    Args:
+        board: Bảng Sudoku 2D
+        empty: Ký tự dùng cho ô trống
+
+    Returns:
+        str: Chuỗi câu đố
+    """
+    grid_size = len(board)
+    if math.isqrt(grid_size) ** 2 != grid_size:
+        raise ValueError(f"Kích thước lưới không hợp lệ: {grid_size}")
+    return ''.join(VALUE_CHARS[value - 1] if value else empty for row in board for value in row)
@@ -0,0 +1,201 @@
+"""
+Kho câu đố tạo sẵn cho từng cặp (kích thước lưới, độ khó).
+
+Một luồng nền giữ mỗi ngăn của kho đủ 'depth' câu đố để trò chơi mới lấy ra ngay (O(1))
+thay vì tạo câu đố trên luồng giao diện. Kho được lưu ra tệp JSON khi luồng nền rảnh và
+khi dừng, nên các câu đố chưa dùng được giữ lại cho lần chạy sau.
+"""
+import json
+import os
+import threading
+from collections import deque
+
+from puzzle_format import format_puzzle, parse_puzzle
+
+GRID_SIZES = (9, 16)
+DIFFICULTIES = ("super_easy", "easy", "medium", "difficult", "expert")
+
+
+def generate_puzzle(grid_size, difficulty):
+    """
+    Tạo một câu đố mới bằng SudokuModel.
+
+    Args:
+        grid_size: Kích thước lưới
+        difficulty: Độ khó
+
+    Returns:
+        tuple: (câu đố, lời giải, kết quả chấm độ khó)
+    """
+    from model import SudokuModel
+    model = SudokuModel(difficulty=difficulty, grid_size=grid_size)
+    return model.board, model.solution, model.rating
+
+
+class PuzzlePool:
+    """
+    Kho câu đố theo (kích thước lưới, độ khó) với luồng nền bổ sung và lưu trữ ra tệp.
+    Mọi truy cập vào các ngăn đều đi qua một khóa; việc tạo câu đố diễn ra ngoài khóa.
+    """
+
+    def __init__(self, path=None, depth=3, keys=None, generator=generate_puzzle):
+        """
+        Args:
+            path: Tệp JSON để nạp/lưu kho (None để không lưu)
+            depth: Số câu đố cần giữ sẵn trong mỗi ngăn
+            keys: Các cặp (kích thước lưới, độ khó) cần giữ sẵn (mặc định mọi cặp)
+            generator: Hàm (grid_size, difficulty) -> (câu đố, lời giải, kết quả chấm độ khó)
+        """
+        self.path = path
+        self.depth = depth
+        self.generator = generator
+        keys = keys if keys is not None else [(size, level) for size in GRID_SIZES for level in DIFFICULTIES]
+        self._bins = {key: deque() for key in keys}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._stopped = False
+        self._dirty = False
+        self._thread = None
+        self.load()
+
+    def _bin(self, grid_size, difficulty):
+        """Lấy (hoặc tạo) ngăn của một cặp; phải được gọi khi đang giữ khóa."""
+        key = (grid_size, difficulty)
+        if key not in self._bins:
+            self._bins[key] = deque()
+        return self._bins[key]
+
+    def pop(self, grid_size, difficulty):
+        """
+        Lấy một câu đố tạo sẵn và đánh thức luồng nền để bổ sung.
+
+        Args:
+            grid_size: Kích thước lưới
+            difficulty: Độ khó
+
+        Returns:
+            tuple: (câu đố, lời giải, kết quả chấm độ khó) hoặc None nếu ngăn đang trống
+        """
+        with self._lock:
+            puzzles = self._bin(grid_size, difficulty)
+            entry = puzzles.popleft() if puzzles else None
+            self._dirty = self._dirty or entry is not None
+            self._wakeup.notify()
+        if entry is None:
+            return None
+        return parse_puzzle(entry[0])[0], parse_puzzle(entry[1])[0], entry[2]
+
+    def push(self, grid_size, difficulty, board, solution, rating):
+        """
+        Thêm một câu đố vào ngăn tương ứng; kết quả chấm độ khó được lưu cùng câu đố để
+        không phải chấm lại.
+
+        Args:
+            grid_size: Kích thước lưới
+            difficulty: Độ khó
+            board: Câu đố dạng bảng 2D
+            solution: Lời giải dạng bảng 2D
+            rating: Kết quả của rating.rate_puzzle
+        """
+        entry = (format_puzzle(board), format_puzzle(solution), rating)
+        with self._lock:
+            self._bin(grid_size, difficulty).append(entry)
+            self._dirty = True
+
+    def size(self, grid_size, difficulty):
+        """Số câu đố đang có trong ngăn của một cặp."""
+        with self._lock:
+            return len(self._bins.get((grid_size, difficulty), ()))
+
+    def _next_missing(self):
+        """Cặp có ít câu đố nhất còn thiếu so với depth, None nếu mọi ngăn đã đủ (giữ khóa khi gọi)."""
+        key, puzzles = min(self._bins.items(), key=lambda item: len(item[1]), default=(None, ()))
+        return key if key is not None and len(puzzles) < self.depth else None
+
+    def refill(self):
+        """Bổ sung mọi ngăn đến depth trên luồng hiện tại (dùng khi không chạy luồng nền)."""
+        while True:
+            with self._lock:
+                key = self._next_missing()
+            if key is None:
+                return
+            self.push(*key, *self.generator(*key))
+
+    def start(self):
+        """Khởi động luồng nền bổ sung kho (không làm gì nếu đang chạy)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="puzzle-pool", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """
+        Dừng luồng nền (sau khi câu đố đang tạo xong) rồi lưu kho.
+
+        Args:
+            timeout: Thời gian chờ luồng nền tối đa (giây)
+        """
+        with self._lock:
+            self._stopped = True
+            self._wakeup.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.save()
+
+    def _run(self):
+        """Vòng lặp của luồng nền: tạo câu đố cho ngăn thiếu nhiều nhất, lưu kho khi đã đủ."""
+        while True:
+            with self._lock:
+                key = self._next_missing()
+                dirty = key is None and self._dirty
+                if dirty:
+                    self._dirty = False
+                elif key is None and not self._stopped:
+                    self._wakeup.wait()
+                if self._stopped:
+                    return
+            if key is None:
+                if dirty:
+                    self.save()
+                continue
+            self.push(*key, *self.generator(*key))
+
+    def load(self):
+        """Nạp kho từ tệp; bỏ qua tệp không đọc được và các câu đố sai định dạng hoặc chưa chấm điểm."""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as source:
+                data = json.load(source)
+        except (OSError, ValueError):
+            return
+
+        with self._lock:
+            for name, entries in data.items():
+                grid_size, _, difficulty = name.partition(':')
+                if not grid_size.isdigit():
+                    continue
+                puzzles = self._bin(int(grid_size), difficulty)
+                for entry in entries:
+                    try:
+                        board, solution, rating = entry
+                        if (isinstance(rating, dict) and 'score' in rating
+                                and parse_puzzle(board)[1] == parse_puzzle(solution)[1] == int(grid_size)):
+                            puzzles.append((board, solution, rating))
+                    except (TypeError, ValueError):
+                        continue
+
+    def save(self):
+        """Ghi kho ra tệp (ghi vào tệp tạm rồi đổi tên để không để lại tệp hỏng)."""
+        if not self.path:
+            return
+        with self._lock:
+            data = {f"{size}:{level}": [list(entry) for entry in puzzles]
+                    for (size, level), puzzles in self._bins.items()}
+            self._dirty = False
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as target:
+            json.dump(data, target)
+        os.replace(temp_path, self.path)
@@ -0,0 +1,48 @@
+"""
+Chấm độ khó câu đố theo cách người chơi giải.
+
+Câu đố được giải bằng PropagationSolver; số lần loại bỏ ứng viên của từng luật được nhân
+với trọng số của luật (luật càng khó trọng số càng lớn), chia cho số ô của lưới, cộng thêm
+một khoản cố định cho mỗi lần phải đoán (phân nhánh).
+"""
+from solve import PropagationSolver
+
+TECHNIQUE_WEIGHTS = {
+    'naked_single': 1,
+    'hidden_single': 2,
+    'naked_pair': 4,
+    'hidden_pair': 5,
+    'pointing': 4,
+    'box_line': 4,
+}
+BRANCH_WEIGHT = 50
+
+
+def rate_puzzle(board, grid_size=9):
+    """
+    Chấm điểm độ khó của một câu đố.
+
+    Args:
+        board: Câu đố dạng bảng 2D
+        grid_size: Kích thước lưới
+
+    Returns:
+        dict: {'score', 'techniques' (số lần loại bỏ của từng luật), 'branch_points',
+               'hardest' (luật khó nhất đã dùng hoặc None), 'solved'}
+    """
+    solver = PropagationSolver(board, grid_size)
+    solved = solver.solve()
+    techniques = dict(solver.eliminations)
+
+    weighted = sum(TECHNIQUE_WEIGHTS[rule] * count for rule, count in techniques.items())
+    score = 100 * weighted / (grid_size * grid_size) + BRANCH_WEIGHT * solver.branch_points
+    used = [rule for rule, count in techniques.items() if count]
+    hardest = max(used, key=TECHNIQUE_WEIGHTS.get) if used else None
+
+    return {
+        'score': round(score, 1),
+        'techniques': techniques,
+        'branch_points': solver.branch_points,
+        'hardest': hardest,
+        'solved': solved,
+    }
@@ -0,0 +1,169 @@
+"""
+Kho lời giải lưu trên đĩa (SQLite), dùng chung giữa giao diện, giải hàng loạt và các tiến
+trình con.
+
+Mỗi mục được khóa bởi (thuật toán, kích thước lưới, khóa chính tắc của canonical_form). Giá
+trị gồm lời giải chính tắc (mỗi ô một byte) và thông số của lần giải. Vì vậy câu đố tương
+đương với một câu đã giải cũng không phải giải lại. Chỉ lần giải thành công mới được lưu.
+
+Cơ sở dữ liệu chạy ở chế độ WAL nên nhiều tiến trình đọc được song song với một tiến trình
+ghi. Mỗi luồng có kết nối riêng (threading.local), nên một đối tượng SolutionStore dùng
+được từ nhiều luồng. Tiến trình con phải tự mở SolutionStore từ đường dẫn.
+"""
+import json
+import sqlite3
+import threading
+import time
+
+# Số tham số tối đa trong một câu lệnh IN (giới hạn mặc định của SQLite cũ là 999)
+LOOKUP_BATCH_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS solutions (
+    id INTEGER PRIMARY KEY,
+    algorithm TEXT NOT NULL,
+    grid_size INTEGER NOT NULL,
+    puzzle BLOB NOT NULL,
+    solution BLOB NOT NULL,
+    metrics TEXT NOT NULL,
+    created REAL NOT NULL,
+    UNIQUE (algorithm, grid_size, puzzle)
+)
+"""
+
+
+class SolutionStore:
+    """
+    Kho lời giải SQLite với thao tác đơn lẻ, hàng loạt và cắt bớt theo số mục.
+    """
+
+    def __init__(self, path, timeout=30.0):
+        """
+        Args:
+            path: Tệp cơ sở dữ liệu (được tạo nếu chưa có)
+            timeout: Thời gian chờ khóa ghi của tiến trình khác tối đa (giây)
+        """
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.execute(_SCHEMA)
+
+    def _connection(self):
+        """Kết nối của luồng hiện tại, được mở và cấu hình ở lần dùng đầu tiên."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, algorithm, grid_size, key):
+        """
+        Lấy lời giải đã lưu của một câu đố chính tắc.
+
+        Args:
+            algorithm: Tên thuật toán
+            grid_size: Kích thước lưới
+            key: Khóa chính tắc (bytes)
+
+        Returns:
+            tuple: (lời giải chính tắc dạng bảng 2D, thông số) hoặc None
+        """
+        return self.get_many(algorithm, [(grid_size, key)]).get((grid_size, key))
+
+    def get_many(self, algorithm, keys):
+        """
+        Lấy lời giải của nhiều câu đố chính tắc bằng ít truy vấn.
+
+        Args:
+            algorithm: Tên thuật toán
+            keys: Danh sách (kích thước lưới, khóa chính tắc)
+
+        Returns:
+            dict: {(kích thước lưới, khóa): (lời giải chính tắc, thông số)} của các câu đố đã lưu
+        """
+        found = {}
+        by_size = {}
+        for grid_size, key in keys:
+            by_size.setdefault(grid_size, set()).add(bytes(key))
+        connection = self._connection()
+        for grid_size, puzzles in by_size.items():
+            puzzles = list(puzzles)
+            for start in range(0, len(puzzles), LOOKUP_BATCH_SIZE):
+                batch = puzzles[start:start + LOOKUP_BATCH_SIZE]
+                rows = connection.execute(
+                    f"SELECT puzzle, solution, metrics FROM solutions "
+                    f"WHERE algorithm = ? AND grid_size = ? AND puzzle IN ({','.join('?' * len(batch))})",
+                    (algorithm, grid_size, *batch))
+                for puzzle, solution, metrics in rows:
+                    found[(grid_size, bytes(puzzle))] = (_decode(solution, grid_size), json.loads(metrics))
+        return found
+
+    def put(self, algorithm, grid_size, key, solution, metrics):
+        """
+        Lưu lời giải của một câu đố chính tắc (ghi đè mục cũ).
+
+        Args:
+            algorithm: Tên thuật toán
+            grid_size: Kích thước lưới
+            key: Khóa chính tắc (bytes)
+            solution: Lời giải chính tắc dạng bảng 2D
+            metrics: Thông số của lần giải (ghi được bằng json)
+        """
+        self.put_many(algorithm, [(grid_size, key, solution, metrics)])
+
+    def put_many(self, algorithm, entries):
+        """
+        Lưu nhiều lời giải trong một giao dịch.
+
+        Args:
+            algorithm: Tên thuật toán
+            entries: Iterable (kích thước lưới, khóa chính tắc, lời giải chính tắc, thông số)
+        """
+        now = time.time()
+        rows = [(algorithm, grid_size, bytes(key), _encode(solution), json.dumps(metrics), now)
+                for grid_size, key, solution, metrics in entries]
+        if not rows:
+            return
+        with self._connection() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO solutions (algorithm, grid_size, puzzle, solution, metrics, created) "
+                "VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+    def prune(self, max_entries):
+        """
+        Xóa các mục được lưu sớm nhất, chỉ giữ lại 'max_entries' mục mới nhất.
+
+        Args:
+            max_entries: Số mục tối đa được giữ
+
+        Returns:
+            int: Số mục đã xóa
+        """
+        with self._connection() as connection:
+            cursor = connection.execute(
+                "DELETE FROM solutions WHERE id IN (SELECT id FROM solutions ORDER BY id DESC LIMIT -1 OFFSET ?)",
+                (max_entries,))
+            return cursor.rowcount
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+
+    def close(self):
+        """Đóng kết nối của luồng hiện tại (luồng khác tự đóng khi kết thúc)."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+def _encode(board):
+    """Bảng 2D thành bytes phẳng, mỗi ô một byte."""
+    return bytes(value for row in board for value in row)
+
+
+def _decode(flat, grid_size):
+    """bytes phẳng thành bảng 2D."""
+    return [list(flat[i * grid_size:(i + 1) * grid_size]) for i in range(grid_size)]
@@ -4,29 +4,201 @@ import math
 import heapq
 import random
 import copy
+import sys
+import threading
+import multiprocessing
 from collections import deque
-import numpy as np
-from typing import List, Dict, Any, Tuple
-from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from board import NumpyBoard
+from instrumentation import SearchProfiler
+
+
+class SearchCancelled(Exception):
+    """Báo lần giải bị hủy giữa chừng qua sự kiện hủy của bộ theo dõi."""
+
+
+class SearchAborted(SearchCancelled):
+    """
+    Báo lần giải vượt quá một giới hạn của set_limits. Được bắt trong solve(), nên người gọi
+    chỉ thấy solve() trả về False với trạng thái 'aborted' trong thông số hiệu suất.
+    """
+
+    def __init__(self, reason, message):
+        super().__init__(message)
+        self.reason = reason
+
+
+class BitboardState:
+    """
+    Trạng thái ràng buộc của bảng Sudoku dưới dạng bitmask.
+    Mỗi hàng, cột và hộp giữ một số nguyên, bit thứ (num - 1) được bật khi giá trị num
+    đã xuất hiện trong đơn vị đó. Việc đặt/xóa giá trị được cập nhật tăng dần nên tra cứu
+    ứng viên chỉ còn vài phép AND/NOT.
+    """
+
+    def __init__(self, board, grid_size, box_size):
+        """
+        Khởi tạo trạng thái bitmask từ bảng Sudoku.
+
+        Args:
+            board: Bảng Sudoku 2D (list of lists)
+            grid_size: Kích thước lưới
+            box_size: Kích thước hộp
+        """
+        self.grid_size = grid_size
+        self.box_size = box_size
+        self.full_mask = (1 << grid_size) - 1
+
+        self.rows = [0] * grid_size
+        self.cols = [0] * grid_size
+        self.boxes = [0] * grid_size
+        self.box_index = [[(i // box_size) * box_size + j // box_size for j in range(grid_size)]
+                          for i in range(grid_size)]
+
+        for i in range(grid_size):
+            for j in range(grid_size):
+                if board[i][j] != 0:
+                    self.place(i, j, board[i][j])
+
+    def place(self, row, col, num):
+        """Đánh dấu giá trị 'num' đã xuất hiện tại hàng, cột và hộp của ô (row, col)."""
+        bit = 1 << (num - 1)
+        self.rows[row] |= bit
+        self.cols[col] |= bit
+        self.boxes[self.box_index[row][col]] |= bit
+
+    def unplace(self, row, col, num):
+        """Bỏ đánh dấu giá trị 'num' khỏi hàng, cột và hộp của ô (row, col)."""
+        bit = ~(1 << (num - 1))
+        self.rows[row] &= bit
+        self.cols[col] &= bit
+        self.boxes[self.box_index[row][col]] &= bit
+
+    def copy(self):
+        """
+        Sao chép trạng thái bitmask mà không quét lại bảng (O(N)).
+
+        Returns:
+            BitboardState: Bản sao độc lập
+        """
+        clone = object.__new__(type(self))
+        clone.grid_size = self.grid_size
+        clone.box_size = self.box_size
+        clone.full_mask = self.full_mask
+        clone.rows = self.rows[:]
+        clone.cols = self.cols[:]
+        clone.boxes = self.boxes[:]
+        clone.box_index = self.box_index
+        return clone
+
+    def candidate_mask(self, row, col):
+        """
+        Lấy bitmask các giá trị chưa xuất hiện trong hàng, cột và hộp của ô (row, col).
+
+        Returns:
+            int: Bitmask ứng viên
+        """
+        return self.full_mask & ~(self.rows[row] | self.cols[col] | self.boxes[self.box_index[row][col]])
+
+    def can_place(self, row, col, num):
+        """Kiểm tra 'num' chưa xuất hiện trong hàng, cột và hộp của ô (row, col)."""
+        used = self.rows[row] | self.cols[col] | self.boxes[self.box_index[row][col]]
+        return not (used >> (num - 1)) & 1
+
+    @staticmethod
+    def mask_to_values(mask):
+        """
+        Chuyển bitmask thành danh sách giá trị tăng dần.
+
+        Args:
+            mask: Bitmask ứng viên
+
+        Returns:
+            list: Danh sách các giá trị
+        """
+        values = []
+        while mask:
+            low_bit = mask & -mask
+            values.append(low_bit.bit_length())
+            mask ^= low_bit
+        return values
+
+
+# Các kiểu trạng thái ràng buộc (backend) của bảng mà mọi thuật toán có thể dùng. Một backend
+# được khởi tạo bằng (board, grid_size, box_size) và cung cấp cùng giao diện với BitboardState:
+# place/unplace/copy/candidate_mask/can_place, mask_to_values và các thuộc tính rows, cols,
+# boxes, box_index, full_mask (A* với heuristic 'candidates' và PropagationSolver đọc trực tiếp
+# các bitmask này).
+BOARD_BACKENDS = {
+    'bitset': BitboardState,
+}
+
+# Các thuật toán theo tên dùng trong get_solver, theo thứ tự đăng ký
+SOLVERS = {}
+
+
+def register_solver(name):
+    """
+    Decorator đăng ký một lớp giải thuật với get_solver dưới tên 'name'.
+
+    Args:
+        name: Tên thuật toán
+
+    Returns:
+        Hàm đăng ký lớp
+    """
+    def register(solver_class):
+        if name in SOLVERS:
+            raise ValueError(f"Thuật toán '{name}' đã được đăng ký")
+        solver_class.algorithm_name = name
+        SOLVERS[name] = solver_class
+        return solver_class
+    return register
 
 
 class SudokuSolver:
     """
     Lớp cơ sở cho các thuật toán giải Sudoku.
     Chứa các phương thức chung và thuộc tính để theo dõi hiệu suất.
+
+    solve() là đường giải chung của mọi thuật toán (đo thời gian, giới hạn, đo chi tiết, ghi
+    lời giải và g/h/f); lớp con chỉ cài đặt _find_solution() và nếu cần _prepare_search().
     """
 
-    def __init__(self, board, grid_size=9):
+    algorithm_name = None
+
+    PROGRESS_INTERVAL = 1024
+
+    # Nhóm các hàm nóng để chia thời gian khi bật set_instrumentation (tên theo
+    # instrumentation.profile_function_name); lớp con có thể bổ sung
+    PROFILE_SECTIONS = {
+        'candidates': {'get_possible_values', 'get_possible_values_flat', 'candidate_mask', 'mask_to_values',
+                       'can_place', '_find_best_empty_cell', '_candidate_peers', '_expand_candidates',
+                       '_propagate', '_naked_singles', '_hidden_singles', '_naked_pairs', '_hidden_pairs',
+                       '_all_positions', '_pointing', '_box_line', 'cover', 'uncover'},
+        'heuristic': {'calculate_heuristic', 'count_conflicts', '_child_heuristic', '_candidate_total',
+                      '_child_candidate_total', '_calculate_number_of_errors'},
+        'frontier': {'heapq.heappush', 'heapq.heappop', 'deque.append', 'deque.popleft', 'deque.pop',
+                     '_push', '_drop', '_evict'},
+    }
+
+    def __init__(self, board, grid_size=9, backend='bitset'):
         """
         Khởi tạo giải thuật với bảng Sudoku và kích thước lưới.
 
         Args:
             board: Bảng Sudoku 2D (list of lists)
             grid_size: Kích thước lưới (9 hoặc 16)
+            backend: Tên trạng thái ràng buộc trong BOARD_BACKENDS
         """
+        if backend not in BOARD_BACKENDS:
+            raise ValueError(f"Backend không hợp lệ: {backend}")
         self.board = copy.deepcopy(board)
         self.grid_size = grid_size
-        self.box_size = 3 if grid_size == 9 else 4
+        self.box_size = math.isqrt(grid_size)
+        self.backend = backend
+        self.state_class = BOARD_BACKENDS[backend]
+        self.state = self.state_class(self.board, grid_size, self.box_size)
 
         self.execution_time = 0
         self.states_explored = 0
@@ -38,12 +210,181 @@ class SudokuSolver:
         self.solution = None
         self.is_solved = False
 
+        self.progress_callback = None
+        self.cancel_event = None
+        self.progress_interval = self.PROGRESS_INTERVAL
+        self._monitored = False
+        self._ticks = 0
+
+        self.time_limit = None
+        self.max_states = None
+        self.max_frontier = None
+        self.abort_reason = None
+        self._deadline = None
+        self._states_limit = float('inf')
+        self._frontier_limit = float('inf')
+
+        self.instrumented = False
+        self.instrumentation = None
+
     def solve(self):
         """
-        Phương thức giải Sudoku cần được ghi đè bởi các lớp con.
+        Giải Sudoku bằng thuật toán của lớp con (_find_solution) trong các giới hạn của
+        set_limits.
+
+        Returns:
+            bool: True nếu tìm thấy lời giải, False nếu không
+        """
+        start_time = time.time()
+        self.states_explored = 0
+        self.max_states_in_memory = 0
+        self._prepare_search()
+
+        result = self._run_search(self._find_solution)
+
+        self.execution_time = time.time() - start_time
+        self.is_solved = result
+        self.solution = copy.deepcopy(self.board) if result else None
+
+        if result:
+            self.h_value = 0
+        else:
+            self.h_value = self._unsolved_heuristic()
+
+        self.f_value = self.g_value + self.h_value
+
+        return result
+
+    def _prepare_search(self):
+        """Đặt lại các bộ đếm riêng của thuật toán trước mỗi lần giải (lớp con ghi đè nếu cần)."""
+
+    def _find_solution(self):
+        """
+        Tìm kiếm chính của thuật toán, cần được ghi đè bởi các lớp con. Khi tìm thấy lời giải,
+        self.board phải chứa lời giải.
+
+        Returns:
+            bool: True nếu tìm thấy lời giải, False nếu không
         """
         raise NotImplementedError("Phương thức này cần được ghi đè bởi lớp con")
 
+    def _unsolved_heuristic(self):
+        """Giá trị h khi không tìm được lời giải."""
+        return self.calculate_heuristic()
+
+    def set_monitor(self, progress_callback=None, cancel_event=None, interval=None):
+        """
+        Gắn hàm báo tiến độ và sự kiện hủy cho các lần giải sau.
+
+        Args:
+            progress_callback: Hàm nhận dict {'states_explored', 'depth', 'frontier_size'}, được gọi
+                từ luồng đang giải sau mỗi 'interval' trạng thái
+            cancel_event: threading.Event; khi được đặt, lần giải dừng bằng SearchCancelled
+            interval: Số trạng thái giữa hai lần báo tiến độ và kiểm tra hủy
+        """
+        self.progress_callback = progress_callback
+        self.cancel_event = cancel_event
+        self.progress_interval = interval or self.PROGRESS_INTERVAL
+        self._ticks = 0
+        self._update_monitored()
+
+    def set_limits(self, time_limit=None, max_states=None, max_frontier=None):
+        """
+        Đặt giới hạn cho các lần giải sau; None là không giới hạn. Khi vượt một giới hạn,
+        solve() dừng và trả về False, get_performance_metrics() báo trạng thái 'aborted'
+        cùng lý do ('time', 'states' hoặc 'frontier').
+
+        Args:
+            time_limit: Thời gian giải tối đa (giây)
+            max_states: Số trạng thái được duyệt tối đa
+            max_frontier: Số trạng thái tối đa trong biên/ngăn xếp/hàng đợi
+        """
+        self.time_limit = time_limit
+        self.max_states = max_states
+        self.max_frontier = max_frontier
+        self._states_limit = float('inf') if max_states is None else max_states
+        self._frontier_limit = float('inf') if max_frontier is None else max_frontier
+        self._update_monitored()
+
+    def set_instrumentation(self, enabled=True):
+        """
+        Bật/tắt chế độ đo chi tiết cho các lần giải sau: bộ nhớ đỉnh (tracemalloc), số khối
+        được cấp phát thêm, số lần và thời gian dừng của GC, thời gian theo nhóm hàm nóng
+        (PROFILE_SECTIONS). Kết quả được thêm vào get_performance_metrics(). Chế độ này làm
+        lần giải chậm đi nhiều lần; với các chuỗi luyện kim song song chỉ tiến trình chính
+        được đo.
+
+        Args:
+            enabled: True để bật
+        """
+        self.instrumented = enabled
+
+    def _update_monitored(self):
+        """Bật _tick trong vòng lặp tìm kiếm khi có bộ theo dõi hoặc giới hạn."""
+        self._monitored = (self.progress_callback is not None or self.cancel_event is not None
+                           or self.time_limit is not None or self.max_states is not None
+                           or self.max_frontier is not None)
+
+    def _run_search(self, search, *args, default=False):
+        """
+        Chạy hàm tìm kiếm chính của solve() trong các giới hạn của set_limits.
+
+        Khi bật set_instrumentation, lần chạy được đo bằng SearchProfiler.
+
+        Args:
+            search: Hàm tìm kiếm
+            *args: Tham số của hàm tìm kiếm
+            default: Giá trị trả về khi lần giải bị dừng vì vượt giới hạn
+
+        Returns:
+            Kết quả của hàm tìm kiếm, hoặc 'default' nếu bị dừng
+        """
+        self.abort_reason = None
+        self.instrumentation = None
+        profiler = SearchProfiler(self.PROFILE_SECTIONS) if self.instrumented else None
+        self._deadline = None if self.time_limit is None else time.perf_counter() + self.time_limit
+        try:
+            if profiler is None:
+                return search(*args)
+            with profiler:
+                return search(*args)
+        except SearchAborted as error:
+            self.abort_reason = error.reason
+            return default
+        finally:
+            if profiler is not None:
+                self.instrumentation = profiler.report
+
+    def _tick(self, depth, frontier_size, steps=1):
+        """
+        Ghi nhận các trạng thái vừa được duyệt và kiểm tra giới hạn của set_limits (chỉ vài
+        phép so sánh); sau mỗi progress_interval trạng thái thì kiểm tra sự kiện hủy và báo
+        tiến độ. Chỉ được gọi khi có bộ theo dõi hoặc giới hạn (_monitored).
+
+        Args:
+            depth: Độ sâu hiện tại của tìm kiếm
+            frontier_size: Số trạng thái đang giữ trong biên/ngăn xếp
+            steps: Số trạng thái vừa được duyệt
+        """
+        if self.states_explored > self._states_limit:
+            raise SearchAborted('states', f"Vượt quá {self.max_states} trạng thái")
+        if frontier_size > self._frontier_limit:
+            raise SearchAborted('frontier', f"Biên vượt quá {self.max_frontier} trạng thái")
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            raise SearchAborted('time', f"Vượt quá {self.time_limit} giây")
+        self._ticks += steps
+        if self._ticks < self.progress_interval:
+            return
+        self._ticks = 0
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise SearchCancelled(f"Đã hủy sau {self.states_explored} trạng thái")
+        if self.progress_callback is not None:
+            self.progress_callback({
+                'states_explored': self.states_explored,
+                'depth': depth,
+                'frontier_size': frontier_size,
+            })
+
     def is_valid_move(self, row, col, num):
         """
         Kiểm tra xem việc đặt 'num' tại vị trí (row, col) có hợp lệ không.
@@ -56,33 +397,68 @@ class SudokuSolver:
         Returns:
             bool: True nếu hợp lệ, False nếu không
         """
-        for j in range(self.grid_size):
-            if self.board[row][j] == num:
-                return False
+        return self.state.can_place(row, col, num)
 
-        for i in range(self.grid_size):
-            if self.board[i][col] == num:
-                return False
+    def place_value(self, row, col, num):
+        """
+        Đặt 'num' vào ô (row, col) và cập nhật trạng thái bitmask.
 
-        box_row, box_col = self.box_size * (row // self.box_size), self.box_size * (col // self.box_size)
-        for i in range(box_row, box_row + self.box_size):
-            for j in range(box_col, box_col + self.box_size):
-                if self.board[i][j] == num:
-                    return False
+        Args:
+            row: Chỉ số hàng
+            col: Chỉ số cột
+            num: Giá trị cần đặt
+        """
+        self.board[row][col] = num
+        self.state.place(row, col, num)
 
-        return True
+    def remove_value(self, row, col):
+        """
+        Xóa giá trị tại ô (row, col) và cập nhật trạng thái bitmask.
+
+        Args:
+            row: Chỉ số hàng
+            col: Chỉ số cột
+        """
+        num = self.board[row][col]
+        if num != 0:
+            self.state.unplace(row, col, num)
+            self.board[row][col] = 0
+
+    def set_board(self, board, state=None):
+        """
+        Thay bảng hiện tại và trạng thái bitmask tương ứng.
+        Bảng được dùng trực tiếp (không sao chép), nên người gọi không được sửa nó sau đó.
+
+        Args:
+            board: Bảng Sudoku 2D mới
+            state: Trạng thái bitmask đã khớp với bảng; nếu None sẽ dựng lại từ bảng
+        """
+        self.board = board
+        self.state = state if state is not None else self.state_class(board, self.grid_size, self.box_size)
 
-    def find_empty(self):
+    def is_board_valid(self):
+        """
+        Kiểm tra bảng không có giá trị trùng trong hàng, cột hoặc hộp.
+
+        Returns:
+            bool: True nếu hợp lệ, False nếu không
+        """
+        return NumpyBoard(self.board).is_valid()
+
+    def find_empty(self, start=0):
         """
         Tìm một ô trống trong bảng.
 
+        Args:
+            start: Chỉ số ô (row * grid_size + col) bắt đầu tìm; các ô trước đó được coi là đã điền
+
         Returns:
             tuple: (row, col) nếu tìm thấy ô trống, None nếu không có ô trống
         """
-        for i in range(self.grid_size):
-            for j in range(self.grid_size):
-                if self.board[i][j] == 0:
-                    return (i, j)
+        for index in range(start, self.grid_size * self.grid_size):
+            i, j = divmod(index, self.grid_size)
+            if self.board[i][j] == 0:
+                return (i, j)
         return None
 
     def count_empty_cells(self):
@@ -113,42 +489,12 @@ class SudokuSolver:
     def count_conflicts(self):
         """
         Đếm số xung đột trong bảng (số lần một giá trị xuất hiện nhiều hơn một lần trong hàng/cột/hộp).
+        Việc đếm được vector hóa trên NumpyBoard.
 
         Returns:
             int: Số xung đột
         """
-        conflicts = 0
-
-        for i in range(self.grid_size):
-            values = [0] * (self.grid_size + 1)
-            for j in range(self.grid_size):
-                if self.board[i][j] != 0:
-                    values[self.board[i][j]] += 1
-            for val in values:
-                if val > 1:
-                    conflicts += val - 1
-
-        for j in range(self.grid_size):
-            values = [0] * (self.grid_size + 1)
-            for i in range(self.grid_size):
-                if self.board[i][j] != 0:
-                    values[self.board[i][j]] += 1
-            for val in values:
-                if val > 1:
-                    conflicts += val - 1
-
-        for box_row in range(0, self.grid_size, self.box_size):
-            for box_col in range(0, self.grid_size, self.box_size):
-                values = [0] * (self.grid_size + 1)
-                for i in range(box_row, box_row + self.box_size):
-                    for j in range(box_col, box_col + self.box_size):
-                        if self.board[i][j] != 0:
-                            values[self.board[i][j]] += 1
-                for val in values:
-                    if val > 1:
-                        conflicts += val - 1
-
-        return conflicts
+        return NumpyBoard(self.board).count_conflicts()
 
     def get_possible_values(self, row, col):
         """
@@ -161,11 +507,56 @@ class SudokuSolver:
         Returns:
             list: Danh sách các giá trị hợp lệ
         """
-        possible_values = []
-        for num in range(1, self.grid_size + 1):
-            if self.is_valid_move(row, col, num):
-                possible_values.append(num)
-        return possible_values
+        return BitboardState.mask_to_values(self.state.candidate_mask(row, col))
+
+    def encode_board(self, board=None):
+        """
+        Mã hóa bảng thành chuỗi bytes phẳng N^2 ô (mỗi ô một byte), dùng làm trạng thái gọn
+        và khóa băm cho các thuật toán lưu nhiều trạng thái.
+
+        Args:
+            board: Bảng cần mã hóa; mặc định là bảng hiện tại
+
+        Returns:
+            bytes: Trạng thái dạng phẳng
+        """
+        board = self.board if board is None else board
+        return bytes(value for row in board for value in row)
+
+    def decode_board(self, flat):
+        """
+        Giải mã trạng thái phẳng thành bảng 2D.
+
+        Args:
+            flat: Trạng thái dạng bytes
+
+        Returns:
+            list: Bảng Sudoku 2D
+        """
+        n = self.grid_size
+        return [list(flat[i * n:(i + 1) * n]) for i in range(n)]
+
+    def get_possible_values_flat(self, flat, row, col):
+        """
+        Lấy các giá trị hợp lệ cho ô (row, col) của một trạng thái phẳng.
+        Chỉ đọc hàng, cột và hộp của ô qua các lát cắt bytes (O(N)), không dựng lại bảng.
+
+        Args:
+            flat: Trạng thái dạng bytes
+            row: Chỉ số hàng
+            col: Chỉ số cột
+
+        Returns:
+            list: Danh sách các giá trị hợp lệ
+        """
+        n = self.grid_size
+        box_size = self.box_size
+        used = set(flat[row * n:(row + 1) * n])
+        used.update(flat[col::n])
+        box_row, box_col = row - row % box_size, col - col % box_size
+        for i in range(box_row, box_row + box_size):
+            used.update(flat[i * n + box_col:i * n + box_col + box_size])
+        return [num for num in range(1, n + 1) if num not in used]
 
     def get_performance_metrics(self):
         """
@@ -181,102 +572,92 @@ class SudokuSolver:
             'h_value': self.h_value,
             'g_value': self.g_value,
             'f_value': self.f_value,
-            'is_solved': self.is_solved
+            'is_solved': self.is_solved,
+            'status': self.status,
+            'abort_reason': self.abort_reason,
+            **(self.instrumentation or {})
         }
 
+    @property
+    def status(self):
+        """Trạng thái của lần giải gần nhất: 'solved', 'unsolved' hoặc 'aborted' (vượt giới hạn)."""
+        if self.abort_reason is not None:
+            return 'aborted'
+        return 'solved' if self.is_solved else 'unsolved'
 
+
+@register_solver('DFS')
 class DFSSolver(SudokuSolver):
     """
     Giải Sudoku bằng thuật toán tìm kiếm theo chiều sâu (DFS).
     """
 
-    def solve(self):
+    def _find_solution(self):
         """
         Giải Sudoku bằng DFS.
 
         Returns:
             bool: True nếu tìm thấy lời giải, False nếu không
         """
-        start_time = time.time()
-        self.states_explored = 0
-        self.max_states_in_memory = 0
-
-        result = self._dfs()
-
-        self.execution_time = time.time() - start_time
-        self.is_solved = result
-        self.solution = copy.deepcopy(self.board) if result else None
+        empty_cells = [(i, j) for i in range(self.grid_size) for j in range(self.grid_size)
+                       if self.board[i][j] == 0]
+        return self._dfs(empty_cells, 0)
 
-        if result:
-            self.h_value = 0
-        else:
-            self.h_value = self.calculate_heuristic()
-
-        self.f_value = self.g_value + self.h_value
-
-        return result
-
-    def _dfs(self):
+    def _dfs(self, empty_cells, index):
         """
         Thuật toán DFS đệ quy.
+        Các ô trống được điền theo thứ tự hàng-cột nên ô trống đầu tiên ở độ sâu 'index'
+        chính là empty_cells[index].
+
+        Args:
+            empty_cells: Danh sách các ô trống theo thứ tự duyệt
+            index: Vị trí ô trống hiện tại trong danh sách
 
         Returns:
             bool: True nếu tìm thấy lời giải, False nếu không
         """
         self.states_explored += 1
+        if self._monitored:
+            self._tick(index, index + 1)
 
-        # Tìm ô trống
-        empty_cell = self.find_empty()
-        if not empty_cell:
+        if index == len(empty_cells):
             return True
 
-        row, col = empty_cell
+        row, col = empty_cells[index]
 
         possible_values = self.get_possible_values(row, col)
 
         for num in possible_values:
-            self.board[row][col] = num
+            self.place_value(row, col, num)
             self.g_value += 1
 
-            if self._dfs():
+            if self._dfs(empty_cells, index + 1):
                 return True
 
-            self.board[row][col] = 0
+            self.remove_value(row, col)
             self.g_value -= 1
 
         return False
 
 
+@register_solver('BFS')
 class BFSSolver(SudokuSolver):
     """
     Giải Sudoku bằng thuật toán tìm kiếm theo chiều rộng (BFS).
     """
 
-    def solve(self):
+    def _prepare_search(self):
+        """Đặt lại kích thước ước tính của một trạng thái trong hàng đợi."""
+        self.bytes_per_state = 0
+
+    def _find_solution(self):
         """
         Giải Sudoku bằng BFS.
 
         Returns:
             bool: True nếu tìm thấy lời giải, False nếu không
         """
-        start_time = time.time()
-        self.states_explored = 0
-        self.max_states_in_memory = 0
-
-        result = self._bfs()
-
-        self.execution_time = time.time() - start_time
-        self.is_solved = result
-        self.solution = copy.deepcopy(self.board) if result else None
-
-        if result:
-            self.h_value = 0
-        else:
-            self.h_value = self.calculate_heuristic()
-
-        self.f_value = self.g_value + self.h_value
-
-        return result
+        return self._bfs()
 
     def _bfs(self):
         """
@@ -289,71 +670,75 @@ class BFSSolver(SudokuSolver):
         if not empty_cell:
             return True
 
-        queue = deque([(copy.deepcopy(self.board), 0)])  # (board, g_value)
+        # Trạng thái là bytes phẳng N^2 ô: sao chép, băm và so sánh đều rẻ
+        initial = self.encode_board()
+        self.bytes_per_state = sys.getsizeof(initial)
+
+        # (trạng thái, g_value, chỉ số bắt đầu tìm ô trống)
+        queue = deque([(initial, 0, 0)])
 
         visited = set()
 
         while queue:
             self.max_states_in_memory = max(self.max_states_in_memory, len(queue))
 
-            current_board, g_value = queue.popleft()
+            current, g_value, start = queue.popleft()
             self.states_explored += 1
+            if self._monitored:
+                self._tick(g_value, len(queue))
 
-            board_str = str(current_board)
-            if board_str in visited:
+            if current in visited:
                 continue
 
-            visited.add(board_str)
+            visited.add(current)
 
-            self.board = copy.deepcopy(current_board)
             self.g_value = g_value
 
-            empty_cell = self.find_empty()
-            if not empty_cell:
+            index = current.find(0, start)
+            if index == -1:
+                self.set_board(self.decode_board(current))
                 return True
 
-            row, col = empty_cell
+            row, col = divmod(index, self.grid_size)
 
-            possible_values = self.get_possible_values(row, col)
+            possible_values = self.get_possible_values_flat(current, row, col)
 
+            prefix, suffix = current[:index], current[index + 1:]
             for num in possible_values:
-                new_board = copy.deepcopy(current_board)
-                new_board[row][col] = num
-                queue.append((new_board, g_value + 1))
+                queue.append((prefix + bytes((num,)) + suffix, g_value + 1, index + 1))
 
         return False
 
+    def get_performance_metrics(self):
+        """
+        Trả về các thông số hiệu suất, kèm số bytes của mỗi trạng thái trong hàng đợi.
+
+        Returns:
+            dict: Từ điển chứa các thông số hiệu suất
+        """
+        metrics = super().get_performance_metrics()
+        metrics['bytes_per_state'] = self.bytes_per_state
+        return metrics
 
+
+@register_solver('BackTracking')
 class BacktrackingSolver(SudokuSolver):
     """
     Giải Sudoku bằng thuật toán quay lui (Backtracking) với tối ưu hóa.
     """
 
-    def solve(self):
+    def _prepare_search(self):
+        """Backtracking chỉ giữ một bảng."""
+        self.max_states_in_memory = 1
+
+    def _find_solution(self):
         """
         Giải Sudoku bằng Backtracking.
 
         Returns:
             bool: True nếu tìm thấy lời giải, False nếu không
         """
-        start_time = time.time()
-        self.states_explored = 0
-        self.max_states_in_memory = 1
-
-        result = self._backtrack()
-
-        self.execution_time = time.time() - start_time
-        self.is_solved = result
-        self.solution = copy.deepcopy(self.board) if result else None
-
-        if result:
-            self.h_value = 0
-        else:
-            self.h_value = self.calculate_heuristic()
-
-        self.f_value = self.g_value + self.h_value
-
-        return result
+        return self._backtrack()
 
     def _find_best_empty_cell(self):
         """
@@ -364,24 +749,27 @@ class BacktrackingSolver(SudokuSolver):
         """
         min_possibilities = self.grid_size + 1
         best_cell = None
-        best_values = []
+        best_mask = 0
 
         for i in range(self.grid_size):
+            board_row = self.board[i]
             for j in range(self.grid_size):
-                if self.board[i][j] == 0:
-                    possible_values = self.get_possible_values(i, j)
-                    num_possibilities = len(possible_values)
+                if board_row[j] == 0:
+                    mask = self.state.candidate_mask(i, j)
+                    num_possibilities = bin(mask).count('1')
 
                     if num_possibilities < min_possibilities:
                         min_possibilities = num_possibilities
                         best_cell = (i, j)
-                        best_values = possible_values
+                        best_mask = mask
 
-                        if num_possibilities == 1:
-                            return (i, j, best_values)
+                        if num_possibilities <= 1:
+                            break
+            if min_possibilities <= 1:
+                break
 
         if best_cell:
-            return (*best_cell, best_values)
+            return (*best_cell, BitboardState.mask_to_values(best_mask))
         return None
 
     def _backtrack(self):
@@ -392,6 +780,8 @@ class BacktrackingSolver(SudokuSolver):
             bool: True nếu tìm thấy lời giải, False nếu không
         """
         self.states_explored += 1
+        if self._monitored:
+            self._tick(self.g_value, self.g_value + 1)
 
         best_empty = self._find_best_empty_cell()
         if not best_empty:
@@ -403,546 +793,1726 @@ class BacktrackingSolver(SudokuSolver):
             return False
 
         for num in possible_values:
-            self.board[row][col] = num
+            self.place_value(row, col, num)
             self.g_value += 1
 
             if self._backtrack():
                 return True
 
-            self.board[row][col] = 0
+            self.remove_value(row, col)
             self.g_value -= 1
 
         return False
 
 
+@register_solver('SimulatedAnnealing')
 class SimulatedAnnealingSolver(SudokuSolver):
     """
     Giải Sudoku bằng thuật toán mô phỏng luyện kim (Simulated Annealing).
     Thuật toán này dựa trên việc tối ưu hóa bằng cách chấp nhận cả những thay đổi làm tăng chi phí
     với một xác suất nhất định, giúp tránh bị mắc kẹt ở cực tiểu cục bộ.
+
+    Mỗi hộp được điền đủ các giá trị còn thiếu, sau đó chỉ hoán đổi hai ô không cố định trong
+    cùng một hộp. Bảng được giữ ở dạng phẳng cùng mảng đếm giá trị của từng hàng và cột, nên
+    mỗi đề xuất được chấm bằng độ chênh lỗi trên hai hàng và hai cột bị ảnh hưởng (O(1)) và
+    chỉ được áp dụng tại chỗ khi được chấp nhận; vòng lặp không sao chép bảng.
+
+    Với chains > 1, các chuỗi luyện kim độc lập (mỗi chuỗi một hạt giống) chạy song song
+    trong một ProcessPoolExecutor; chuỗi đầu tiên đạt 0 lỗi thắng và các chuỗi còn lại được
+    báo dừng. Giới hạn thời gian và số trạng thái của set_limits áp dụng cho từng chuỗi.
     """
 
-    def solve(self):
+    MAX_ATTEMPTS = 3
+    MAX_LOOPS = 2000
+    DECREASE_FACTOR = 0.99
+    REHEAT_AFTER = 80
+
+    def __init__(self, board, grid_size=9, seed=None, chains=1, workers=None, backend='bitset'):
         """
-        Giải Sudoku bằng Simulated Annealing.
+        Khởi tạo giải thuật với bộ sinh số ngẫu nhiên riêng.
 
-        Returns:
-            bool: True nếu tìm thấy lời giải, False nếu không
+        Args:
+            board: Bảng Sudoku 2D (list of lists)
+            grid_size: Kích thước lưới
+            seed: Hạt giống ngẫu nhiên (None để lấy ngẫu nhiên)
+            chains: Số chuỗi luyện kim độc lập; lớn hơn 1 thì chạy song song trên nhiều tiến trình
+            workers: Số tiến trình tối đa (mặc định bằng số chuỗi)
+            backend: Tên trạng thái ràng buộc trong BOARD_BACKENDS
         """
-        start_time = time.time()
-        self.states_explored = 0
+        if chains < 1:
+            raise ValueError(f"Số chuỗi không hợp lệ: {chains}")
+        super().__init__(board, grid_size, backend)
+        self.seed = seed
+        self.chains = chains
+        self.workers = workers
+        self._random = random.Random(seed)
+        self._stop_event = None
+
+        self.best_score = float('inf')
+        self.cpu_time = 0
+        self.chain_results = []
+
+        n = grid_size
+        self._givens = list(self.encode_board())
+        self._row_of = [index // n for index in range(n * n)]
+        self._col_of = [index % n for index in range(n * n)]
+        self._cells = None
+        self._row_counts = None
+        self._col_counts = None
+        self._blocks = None
+        self._score = 0
+
+    def _prepare_search(self):
+        """Đặt lại số lần đổi chỗ, điểm tốt nhất và kết quả các chuỗi."""
         self.max_states_in_memory = 1
+        self.g_value = 0
+        self.best_score = float('inf')
+        self.chain_results = []
 
-        fixed_cells = self._create_fixed_cells()
-
-        list_of_blocks = self._create_list_of_blocks()
-
-        self._randomly_fill_blocks(fixed_cells, list_of_blocks)
+    def _find_solution(self):
+        """
+        Giải Sudoku bằng Simulated Annealing. Với một chuỗi, bảng luôn được cập nhật thành
+        trạng thái tốt nhất đã tìm được, kể cả khi lần giải bị dừng vì vượt giới hạn.
 
-        result = self._simulated_annealing(fixed_cells, list_of_blocks)
+        Returns:
+            bool: True nếu tìm thấy lời giải, False nếu không
+        """
+        if self.chains > 1:
+            return self._parallel_annealing()
+        cpu_start = time.process_time()
+        try:
+            return self._simulated_annealing()
+        finally:
+            self.cpu_time = time.process_time() - cpu_start
+            if self._cells is not None:
+                self.set_board(self.decode_board(self._cells))
+
+    def _unsolved_heuristic(self):
+        """Giá trị h khi không tìm được lời giải: số lỗi của trạng thái tốt nhất."""
+        return self.best_score
+
+    def _randomly_fill_blocks(self):
+        """
+        Điền ngẫu nhiên các giá trị còn thiếu vào từng hộp, rồi dựng mảng đếm giá trị của
+        hàng, cột và tổng số lỗi.
 
-        self.execution_time = time.time() - start_time
-        self.is_solved = result
-        self.solution = copy.deepcopy(self.board) if result else None
-
-        if result:
-            self.h_value = 0
-        else:
-            self.h_value = self._calculate_number_of_errors()
+        Returns:
+            bool: False nếu một hộp có giá trị cho trước bị trùng (không thể điền đủ)
+        """
+        n, box_size = self.grid_size, self.box_size
+        cells = self._givens[:]
+        self._blocks = []
+
+        for box_row in range(0, n, box_size):
+            for box_col in range(0, n, box_size):
+                indices = [(box_row + i) * n + box_col + j for i in range(box_size) for j in range(box_size)]
+                free = [index for index in indices if cells[index] == 0]
+                present = {cells[index] for index in indices}
+                missing = [num for num in range(1, n + 1) if num not in present]
+                if len(missing) != len(free):
+                    return False
+                self._random.shuffle(missing)
+                for index, num in zip(free, missing):
+                    cells[index] = num
+                if len(free) >= 2:
+                    self._blocks.append(free)
+
+        self._cells = cells
+        self._row_counts = [[0] * (n + 1) for _ in range(n)]
+        self._col_counts = [[0] * (n + 1) for _ in range(n)]
+        for index, num in enumerate(cells):
+            self._row_counts[self._row_of[index]][num] += 1
+            self._col_counts[self._col_of[index]][num] += 1
+        self._score = self._calculate_number_of_errors()
+        return True
 
-        self.f_value = self.g_value + self.h_value
+    def _calculate_number_of_errors(self):
+        """
+        Tính tổng số lỗi trên toàn bộ bảng Sudoku (số phần tử trùng lặp trong hàng và cột)
+        từ mảng đếm giá trị.
 
-        return result
+        Returns:
+            int: Tổng số lỗi
+        """
+        errors = 0
+        for counts in self._row_counts + self._col_counts:
+            errors += sum(count - 1 for count in counts[1:] if count > 1)
+        return errors
 
-    def _create_fixed_cells(self):
+    def _anneal(self, iterations, sigma):
         """
-        Tạo ma trận đánh dấu các ô cố định trong bảng Sudoku.
-        Giá trị 1 cho biết ô đó đã có giá trị ban đầu, 0 cho biết ô trống.
+        Thực hiện một số đề xuất hoán đổi ở nhiệt độ 'sigma'.
+        Độ chênh lỗi chỉ phụ thuộc hai hàng và hai cột chứa hai ô được hoán đổi: bỏ giá trị v
+        khỏi một hàng giảm một lỗi nếu v đang bị trùng, thêm v tăng một lỗi nếu v đã có mặt.
+
+        Args:
+            iterations: Số đề xuất
+            sigma: Nhiệt độ hiện tại
 
         Returns:
-            list: Ma trận đánh dấu các ô cố định
+            bool: True nếu đạt bảng không còn lỗi
         """
-        fixed_cells = [[0 for _ in range(self.grid_size)] for _ in range(self.grid_size)]
-        for i in range(self.grid_size):
-            for j in range(self.grid_size):
-                if self.board[i][j] != 0:
-                    fixed_cells[i][j] = 1
-        return fixed_cells
+        cells, row_counts, col_counts = self._cells, self._row_counts, self._col_counts
+        row_of, col_of = self._row_of, self._col_of
+        blocks = self._blocks
+        block_count = len(blocks)
+        rand = self._random.random
+        # Độ chênh tối đa là 4 (mỗi hàng/cột bị ảnh hưởng thêm nhiều nhất một lỗi)
+        acceptance = [1.0] + [math.exp(-delta / sigma) for delta in range(1, 5)]
+        score = self._score
+        proposals = accepted = 0
+
+        for _ in range(iterations):
+            proposals += 1
+            free = blocks[int(rand() * block_count)]
+            size = len(free)
+            i = int(rand() * size)
+            j = int(rand() * (size - 1))
+            if j >= i:
+                j += 1
+            a, b = free[i], free[j]
+            value_a, value_b = cells[a], cells[b]
+            row_a, row_b, col_a, col_b = row_of[a], row_of[b], col_of[a], col_of[b]
+
+            delta = 0
+            if row_a != row_b:
+                counts_a, counts_b = row_counts[row_a], row_counts[row_b]
+                delta += ((counts_a[value_b] > 0) - (counts_a[value_a] > 1)
+                          + (counts_b[value_a] > 0) - (counts_b[value_b] > 1))
+            if col_a != col_b:
+                counts_a, counts_b = col_counts[col_a], col_counts[col_b]
+                delta += ((counts_a[value_b] > 0) - (counts_a[value_a] > 1)
+                          + (counts_b[value_a] > 0) - (counts_b[value_b] > 1))
+
+            if delta > 0 and rand() >= acceptance[delta]:
+                continue
+
+            cells[a], cells[b] = value_b, value_a
+            if row_a != row_b:
+                counts_a, counts_b = row_counts[row_a], row_counts[row_b]
+                counts_a[value_a] -= 1
+                counts_a[value_b] += 1
+                counts_b[value_b] -= 1
+                counts_b[value_a] += 1
+            if col_a != col_b:
+                counts_a, counts_b = col_counts[col_a], col_counts[col_b]
+                counts_a[value_a] -= 1
+                counts_a[value_b] += 1
+                counts_b[value_b] -= 1
+                counts_b[value_a] += 1
+
+            if delta:
+                accepted += 1
+                score += delta
+                if score == 0:
+                    break
+
+        self._score = score
+        self.states_explored += proposals
+        self.g_value += accepted
+        if self._monitored:
+            self._tick(0, 1, proposals)
+        return score == 0
 
-    def _create_list_of_blocks(self):
+    def _calculate_initial_sigma(self):
         """
-        Tạo danh sách các khối trong bảng Sudoku (3x3 cho lưới 9x9, 4x4 cho lưới 16x16).
+        Tính giá trị sigma ban đầu dựa trên độ lệch chuẩn của số lỗi qua một chuỗi hoán đổi
+        ngẫu nhiên (mọi đề xuất đều được chấp nhận).
 
         Returns:
-            list: Danh sách các khối
+            float: Giá trị sigma ban đầu
         """
-        final_list_of_blocks = []
-        block_size = self.box_size
+        list_of_differences = []
+        for _ in range(10):
+            self._anneal(1, float('inf'))
+            list_of_differences.append(self._score)
 
-        for r in range(0, self.grid_size):
-            tmp_list = []
-            block1 = [i + block_size * ((r) % block_size) for i in range(0, block_size)]
-            block2 = [i + block_size * math.trunc((r) / block_size) for i in range(0, block_size)]
-            for x in block1:
-                for y in block2:
-                    tmp_list.append([x, y])
-            final_list_of_blocks.append(tmp_list)
-        return final_list_of_blocks
+        sigma = statistics.pstdev(list_of_differences)
+        return sigma if sigma > 0 else 1.0
 
-    def _randomly_fill_blocks(self, fixed_cells, list_of_blocks):
+    def _choose_number_of_iterations(self):
         """
-        Điền ngẫu nhiên các giá trị vào các khối của bảng Sudoku.
+        Xác định số đề xuất ở mỗi mức nhiệt độ theo số ô không cố định.
 
-        Args:
-            fixed_cells: Ma trận đánh dấu các ô cố định
-            list_of_blocks: Danh sách các khối
+        Returns:
+            int: Số lần lặp
         """
-        for block in list_of_blocks:
-            for box in block:
-                if self.board[box[0]][box[1]] == 0:
-                    current_block_values = []
-                    for b in block:
-                        current_block_values.append(self.board[b[0]][b[1]])
+        free_count = sum(len(free) for free in self._blocks)
+        base_iterations = 100
+        if self.grid_size == 16:
+            base_iterations = 200
 
-                    possible_values = [i for i in range(1, self.grid_size + 1) if i not in current_block_values]
-                    if possible_values:
-                        self.board[box[0]][box[1]] = random.choice(possible_values)
+        return max(free_count, base_iterations)
 
-    def _calculate_number_of_errors(self):
+    def _simulated_annealing(self):
         """
-        Tính tổng số lỗi trên toàn bộ bảng Sudoku (số xung đột trong hàng và cột).
+        Thuật toán Simulated Annealing để giải Sudoku.
+        Mỗi lượt điền lại ngẫu nhiên các hộp rồi hạ nhiệt dần; khi số lỗi không giảm quá
+        REHEAT_AFTER mức nhiệt độ liên tiếp thì tăng nhiệt độ lên để thoát cực tiểu cục bộ.
 
         Returns:
-            int: Tổng số lỗi
+            bool: True nếu tìm thấy lời giải, False nếu không
         """
-        number_of_errors = 0
-        for i in range(self.grid_size):
-            number_of_errors += self._calculate_errors_row_column(i, i)
-        return number_of_errors
+        for _ in range(self.MAX_ATTEMPTS):
+            if not self._randomly_fill_blocks():
+                return False
+            self.best_score = min(self.best_score, self._score)
+            if self._score == 0:
+                return True
+            if not self._blocks:
+                return False
+
+            sigma = self._calculate_initial_sigma()
+            iterations = self._choose_number_of_iterations()
+            stuck_count = 0
+
+            for _ in range(self.MAX_LOOPS):
+                # Chuỗi song song dừng khi một chuỗi khác đã tìm thấy lời giải
+                if self._stop_event is not None and self._stop_event.is_set():
+                    return False
+
+                previous_score = self._score
+                solved = self._anneal(iterations, sigma)
+                self.best_score = min(self.best_score, self._score)
+                if solved:
+                    return True
+
+                sigma *= self.DECREASE_FACTOR
 
-    def _calculate_errors_row_column(self, row, column):
+                if self._score >= previous_score:
+                    stuck_count += 1
+                else:
+                    stuck_count = 0
+
+                if stuck_count > self.REHEAT_AFTER:
+                    sigma += 2
+                    stuck_count = 0
+
+                if sigma < 0.001:
+                    break
+
+        return False
+
+    def _parallel_annealing(self):
         """
-        Tính số lỗi (số phần tử trùng lặp) trong một hàng và một cột.
+        Chạy 'chains' chuỗi luyện kim với các hạt giống khác nhau trên một ProcessPoolExecutor.
+        Chuỗi đầu tiên tìm thấy lời giải đặt sự kiện dừng dùng chung; các chuỗi đang chạy
+        kiểm tra sự kiện này ở mỗi mức nhiệt độ, các chuỗi chưa bắt đầu bị hủy.
 
-        Args:
-            row: Chỉ số hàng
-            column: Chỉ số cột
+        Returns:
+            bool: True nếu một chuỗi tìm thấy lời giải, False nếu không
+        """
+        seeds = random.Random(self.seed).sample(range(2 ** 31), self.chains)
+        workers = min(self.workers or self.chains, self.chains)
+        stop_event = multiprocessing.Event()
+        results = {}
+        winner = None
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_annealing_chain,
+                                 initargs=(stop_event,)) as executor:
+            limits = {'time_limit': self.time_limit, 'max_states': self.max_states}
+            futures = {executor.submit(_run_annealing_chain, self.board, self.grid_size, seed, limits): chain
+                       for chain, seed in enumerate(seeds)}
+            for future in as_completed(futures):
+                if future.cancelled():
+                    continue
+                chain_result = future.result()
+                results[futures[future]] = chain_result
+                if chain_result['is_solved'] and winner is None:
+                    winner = chain_result
+                    stop_event.set()
+                    for pending in futures:
+                        pending.cancel()
+
+        self.chain_results = [results[chain] for chain in sorted(results)]
+        self.states_explored = sum(chain['states_explored'] for chain in self.chain_results)
+        self.cpu_time = sum(chain['cpu_time'] for chain in self.chain_results)
+        self.max_states_in_memory = workers
+        self.best_score = min((chain['best_score'] for chain in self.chain_results), default=float('inf'))
+
+        if winner is None:
+            reasons = [chain['abort_reason'] for chain in self.chain_results if chain['abort_reason']]
+            if reasons:
+                raise SearchAborted(reasons[0], f"Mọi chuỗi dừng vì vượt giới hạn ({reasons[0]})")
+            return False
+        self.g_value = winner['g_value']
+        self.set_board(winner['solution'])
+        return True
+
+    def get_performance_metrics(self):
+        """
+        Trả về các thông số hiệu suất, kèm số lỗi tốt nhất, thời gian CPU và kết quả của
+        từng chuỗi khi chạy song song.
 
         Returns:
-            int: Số lỗi trong hàng và cột
+            dict: Từ điển chứa các thông số hiệu suất
         """
-        col_values = [self.board[i][column] for i in range(self.grid_size) if self.board[i][column] != 0]
-        unique_col_values = set(col_values)
-        col_errors = len(col_values) - len(unique_col_values)
+        metrics = super().get_performance_metrics()
+        metrics['best_score'] = self.best_score
+        metrics['cpu_time'] = self.cpu_time
+        metrics['chains'] = self.chains
+        if self.chain_results:
+            metrics['chain_best_scores'] = [chain['best_score'] for chain in self.chain_results]
+            metrics['chain_states_explored'] = [chain['states_explored'] for chain in self.chain_results]
+            metrics['winning_seed'] = next((chain['seed'] for chain in self.chain_results if chain['is_solved']),
+                                           None)
+        return metrics
+
 
-        row_values = [self.board[row][j] for j in range(self.grid_size) if self.board[row][j] != 0]
-        unique_row_values = set(row_values)
-        row_errors = len(row_values) - len(unique_row_values)
+# Sự kiện dừng dùng chung của tiến trình con, được gán bởi initializer của ProcessPoolExecutor
+_annealing_stop_event = None
 
-        return col_errors + row_errors
 
-    def _two_random_boxes_within_block(self, fixed_cells, block):
+def _init_annealing_chain(stop_event):
+    """
+    Khởi tạo tiến trình con chạy chuỗi luyện kim.
+
+    Args:
+        stop_event: multiprocessing.Event báo các chuỗi dừng lại
+    """
+    global _annealing_stop_event
+    _annealing_stop_event = stop_event
+
+
+def _run_annealing_chain(board, grid_size, seed, limits=None):
+    """
+    Chạy một chuỗi luyện kim trong tiến trình con.
+
+    Args:
+        board: Bảng Sudoku 2D
+        grid_size: Kích thước lưới
+        seed: Hạt giống của chuỗi
+        limits: Tham số set_limits áp dụng cho riêng chuỗi này
+
+    Returns:
+        dict: Kết quả và thông số của chuỗi
+    """
+    solver = SimulatedAnnealingSolver(board, grid_size, seed=seed)
+    solver._stop_event = _annealing_stop_event
+    solver.set_limits(**(limits or {}))
+    solver.solve()
+    return {
+        'seed': seed,
+        'is_solved': solver.is_solved,
+        'solution': solver.solution,
+        'best_score': solver.best_score,
+        'states_explored': solver.states_explored,
+        'g_value': solver.g_value,
+        'cpu_time': solver.cpu_time,
+        'abort_reason': solver.abort_reason,
+    }
+
+
+@register_solver('A*')
+class AStarSolver(SudokuSolver):
+    """
+    Giải Sudoku bằng thuật toán A*.
+    Sử dụng hàm heuristic để tìm đường đi tối ưu nhất đến lời giải.
+
+    Hai heuristic được hỗ trợ:
+    - 'empty': số ô trống + 10 * số xung đột, tính tăng dần h(con) = h(cha) - 1.
+    - 'candidates': dựa trên ứng viên của từng ô. Mọi heuristic chấp nhận được đều bị chặn
+      bởi số ô trống (mỗi ô cần đúng một bước), nên h bằng số ô trống với trạng thái còn
+      sống và bằng vô cùng khi một ô trống hết ứng viên; các trạng thái đó bị cắt ngay khi
+      sinh. Mỗi nút mang bitmask hàng/cột/hộp được cập nhật từ cha trong O(N); nút được mở
+      rộng tại ô ít ứng viên nhất, và các nút cùng f ưu tiên nút sâu hơn rồi nút còn nhiều
+      ứng viên hơn (giá trị ít ràng buộc nhất).
+    """
+
+    HEURISTICS = ('empty', 'candidates')
+
+    # Danh sách ô liên quan theo kích thước lưới, dùng chung giữa các đối tượng
+    _peers_cache = {}
+
+    def __init__(self, board, grid_size=9, heuristic='empty', backend='bitset'):
         """
-        Chọn ngẫu nhiên hai ô không cố định trong một khối.
+        Khởi tạo giải thuật với heuristic được chọn.
 
         Args:
-            fixed_cells: Ma trận đánh dấu các ô cố định
-            block: Danh sách các ô trong một khối
+            board: Bảng Sudoku 2D (list of lists)
+            grid_size: Kích thước lưới
+            heuristic: 'empty' hoặc 'candidates'
+            backend: Tên trạng thái ràng buộc trong BOARD_BACKENDS
+        """
+        if heuristic not in self.HEURISTICS:
+            raise ValueError(f"Heuristic không hợp lệ: {heuristic}")
+        super().__init__(board, grid_size, backend)
+        self.heuristic = heuristic
+        self.bytes_per_state = 0
+        self.pruned_states = 0
+        self._peers = None
+
+    def _prepare_search(self):
+        """Đặt lại số trạng thái bị cắt tỉa và kích thước ước tính của một trạng thái."""
+        self.pruned_states = 0
+        self.bytes_per_state = 0
+
+    def _find_solution(self):
+        """
+        Giải Sudoku bằng A*.
 
         Returns:
-            list: Hai ô được chọn hoặc None nếu không tìm thấy
+            bool: True nếu tìm thấy lời giải, False nếu không
         """
-        non_fixed_boxes = [box for box in block if fixed_cells[box[0]][box[1]] != 1]
+        return self._astar()
 
-        if len(non_fixed_boxes) < 2:
-            return None
+    def _astar(self):
+        """
+        Thuật toán A* sử dụng hàng đợi ưu tiên.
+
+        Returns:
+            bool: True nếu tìm thấy lời giải, False nếu không
+        """
+        empty_cell = self.find_empty()
+        if not empty_cell:
+            return True
+        if self.heuristic == 'candidates':
+            return self._astar_candidates()
+
+        # Trạng thái là bytes phẳng N^2 ô: sao chép, băm và so sánh đều rẻ
+        initial = self.encode_board()
+        self.bytes_per_state = sys.getsizeof(initial)
+
+        # (f, g, trạng thái, h, chỉ số bắt đầu tìm ô trống)
+        h_value = self.calculate_heuristic()
+        priority_queue = [(h_value, 0, initial, h_value, 0)]
+        heapq.heapify(priority_queue)
+
+        visited = set()
+
+        while priority_queue:
+            self.max_states_in_memory = max(self.max_states_in_memory, len(priority_queue))
 
-        first_box = random.choice(non_fixed_boxes)
-        second_box = random.choice([box for box in non_fixed_boxes if box != first_box])
+            f_value, g_value, current, current_h, start = heapq.heappop(priority_queue)
+            self.states_explored += 1
+            if self._monitored:
+                self._tick(g_value, len(priority_queue))
 
-        return [first_box, second_box]
+            if current in visited:
+                continue
 
-    def _flip_boxes(self, boxes_to_flip):
+            visited.add(current)
+
+            self.g_value = g_value
+
+            index = current.find(0, start)
+            if index == -1:
+                self.set_board(self.decode_board(current))
+                return True
+
+            row, col = divmod(index, self.grid_size)
+
+            possible_values = self.get_possible_values_flat(current, row, col)
+
+            new_g_value = g_value + 1
+            prefix, suffix = current[:index], current[index + 1:]
+            for num in possible_values:
+                h_value = self._child_heuristic(current, index, num, current_h)
+                heapq.heappush(priority_queue, (new_g_value + h_value, new_g_value, prefix + bytes((num,)) + suffix,
+                                                h_value, index + 1))
+
+        return False
+
+    def _child_heuristic(self, state, index, num, parent_h):
         """
-        Hoán đổi giá trị của hai ô.
+        Tính h(n) của trạng thái con khi điền ứng viên 'num' vào ô 'index' của 'state'.
+        Ứng viên không trùng với hàng/cột/hộp nên con có ít hơn một ô trống và không thêm
+        xung đột: h(con) = h(cha) - 1, không cần quét lại bảng.
 
         Args:
-            boxes_to_flip: Hai ô cần hoán đổi
+            state: Trạng thái phẳng của cha
+            index: Chỉ số ô được điền
+            num: Giá trị được điền
+            parent_h: Giá trị heuristic của cha
 
         Returns:
-            list: Bảng Sudoku sau khi hoán đổi
+            int: Giá trị heuristic của con
         """
-        proposed_board = copy.deepcopy(self.board)
+        return parent_h - 1
+
+    def _astar_candidates(self):
+        """
+        A* với heuristic 'candidates': mỗi mục trong hàng đợi mang bitmask của trạng thái và
+        tổng số ứng viên của các ô trống, cả hai được cập nhật từ cha.
+
+        Returns:
+            bool: True nếu tìm thấy lời giải, False nếu không
+        """
+        initial = self.encode_board()
+        self.bytes_per_state = sys.getsizeof(initial)
+
+        h_value = self.calculate_heuristic()
+        total = self._candidate_total(initial, self.state)
+        # (f, -g, -tổng ứng viên, thứ tự chèn, trạng thái, bitmask, h, tổng ứng viên)
+        counter = 0
+        priority_queue = [(h_value, 0, -total, counter, initial, self.state.copy(), h_value, total)]
+
+        visited = set()
+
+        while priority_queue:
+            self.max_states_in_memory = max(self.max_states_in_memory, len(priority_queue))
 
-        place_holder = proposed_board[boxes_to_flip[0][0]][boxes_to_flip[0][1]]
-        proposed_board[boxes_to_flip[0][0]][boxes_to_flip[0][1]] = proposed_board[boxes_to_flip[1][0]][
-            boxes_to_flip[1][1]]
-        proposed_board[boxes_to_flip[1][0]][boxes_to_flip[1][1]] = place_holder
+            _, neg_g, _, _, current, bitboard, current_h, total = heapq.heappop(priority_queue)
+            self.states_explored += 1
+            if self._monitored:
+                self._tick(-neg_g, len(priority_queue))
+
+            if current in visited:
+                continue
+
+            visited.add(current)
+
+            self.g_value = -neg_g
+
+            index, row, col, children = self._expand_candidates(current, bitboard, total)
+            if index == -1:
+                self.set_board(self.decode_board(current), bitboard)
+                return True
+
+            new_g_value = self.g_value + 1
+            h_value = current_h - 1
+            prefix, suffix = current[:index], current[index + 1:]
+            for child_total, num in children:
+                child_bitboard = bitboard.copy()
+                child_bitboard.place(row, col, num)
+                counter += 1
+                heapq.heappush(priority_queue, (new_g_value + h_value, -new_g_value, -child_total, counter,
+                                                prefix + bytes((num,)) + suffix, child_bitboard, h_value,
+                                                child_total))
+
+        return False
 
-        return proposed_board
+    def _candidate_peers(self):
+        """
+        Lấy danh sách ô liên quan của từng ô: (chỉ số, hàng, cột, hộp) của các ô cùng hàng,
+        cột hoặc hộp. Danh sách chỉ phụ thuộc kích thước lưới nên được lưu chung cho mọi đối tượng.
 
-    def _proposed_state(self, fixed_cells, list_of_blocks):
+        Returns:
+            list: Danh sách tuple ô liên quan theo chỉ số phẳng
         """
-        Tạo trạng thái đề xuất bằng cách hoán đổi hai ô không cố định trong một khối.
+        if self._peers is None:
+            self._peers = AStarSolver._peers_cache.get(self.grid_size)
+        if self._peers is None:
+            n, box_size = self.grid_size, self.box_size
+            box_index = self.state.box_index
+            peers = []
+            for index in range(n * n):
+                row, col = divmod(index, n)
+                box_row, box_col = row - row % box_size, col - col % box_size
+                cells = {row * n + j for j in range(n)} | {i * n + col for i in range(n)}
+                cells |= {(box_row + i) * n + box_col + j for i in range(box_size) for j in range(box_size)}
+                cells.discard(index)
+                peers.append(tuple((p, p // n, p % n, box_index[p // n][p % n]) for p in sorted(cells)))
+            self._peers = AStarSolver._peers_cache[self.grid_size] = peers
+        return self._peers
+
+    def _candidate_total(self, state, bitboard):
+        """
+        Tính tổng số ứng viên của mọi ô trống (chỉ dùng cho trạng thái gốc).
 
         Args:
-            fixed_cells: Ma trận đánh dấu các ô cố định
-            list_of_blocks: Danh sách các khối
+            state: Trạng thái phẳng
+            bitboard: Bitmask tương ứng với trạng thái
 
         Returns:
-            tuple: (bảng mới, các ô đã hoán đổi) hoặc (bảng hiện tại, None) nếu không thể tạo trạng thái mới
+            int: Tổng số ứng viên
+        """
+        total = 0
+        index = state.find(0)
+        while index != -1:
+            row, col = divmod(index, self.grid_size)
+            total += bin(bitboard.candidate_mask(row, col)).count('1')
+            index = state.find(0, index + 1)
+        return total
+
+    def _child_candidate_total(self, state, bitboard, index, num, total):
         """
-        shuffled_blocks = random.sample(list_of_blocks, len(list_of_blocks))
+        Tính tổng số ứng viên sau khi điền 'num' vào ô 'index', chỉ xét các ô liên quan (O(N)).
 
-        for random_block in shuffled_blocks:
-            fixed_count = sum(fixed_cells[box[0]][box[1]] for box in random_block)
-            max_fixed = 6 if self.grid_size == 9 else 12
-            if fixed_count > max_fixed:
-                continue
-            boxes_to_flip = self._two_random_boxes_within_block(fixed_cells, random_block)
-            if boxes_to_flip:
-                proposed_board = self._flip_boxes(boxes_to_flip)
-                return proposed_board, boxes_to_flip
-        return self.board, None
+        Args:
+            state: Trạng thái phẳng của cha
+            bitboard: Bitmask của cha
+            index: Chỉ số ô được điền
+            num: Giá trị được điền
+            total: Tổng số ứng viên của cha
 
-    def _choose_new_state(self, fixed_cells, list_of_blocks, sigma):
+        Returns:
+            int: Tổng số ứng viên của con, hoặc None nếu một ô trống liên quan hết ứng viên
+        """
+        row, col = divmod(index, self.grid_size)
+        total -= bin(bitboard.candidate_mask(row, col)).count('1')
+        bit = 1 << (num - 1)
+        full_mask = bitboard.full_mask
+        rows, cols, boxes = bitboard.rows, bitboard.cols, bitboard.boxes
+        for peer, peer_row, peer_col, peer_box in self._candidate_peers()[index]:
+            if state[peer] == 0:
+                mask = full_mask & ~(rows[peer_row] | cols[peer_col] | boxes[peer_box])
+                if mask & bit:
+                    if mask == bit:
+                        return None
+                    total -= 1
+        return total
+
+    def _expand_candidates(self, state, bitboard, total):
         """
-        Quyết định chấp nhận trạng thái mới hay không dựa trên chi phí và nhiệt độ.
+        Chọn ô trống ít ứng viên nhất và sinh các giá trị con còn sống của nó.
+        Con làm một ô trống liên quan hết ứng viên có heuristic vô cùng và bị cắt.
 
         Args:
-            fixed_cells: Ma trận đánh dấu các ô cố định
-            list_of_blocks: Danh sách các khối
-            sigma: Nhiệt độ hiện tại
+            state: Trạng thái phẳng (bytes hoặc bytearray)
+            bitboard: Bitmask tương ứng với trạng thái
+            total: Tổng số ứng viên của các ô trống trong trạng thái
 
         Returns:
-            tuple: (bảng mới, thay đổi chi phí)
+            tuple: (chỉ số, hàng, cột, danh sách (tổng ứng viên của con, giá trị)) sắp theo
+                   tổng ứng viên giảm dần; chỉ số là -1 khi không còn ô trống
         """
-        proposed_board, boxes_to_flip = self._proposed_state(fixed_cells, list_of_blocks)
+        grid_size = self.grid_size
+        best_index, best_mask, best_count = -1, 0, grid_size + 1
+        index = state.find(0)
+        while index != -1:
+            mask = bitboard.candidate_mask(*divmod(index, grid_size))
+            count = bin(mask).count('1')
+            if count < best_count:
+                best_index, best_mask, best_count = index, mask, count
+                if count <= 1:
+                    break
+            index = state.find(0, index + 1)
+
+        if best_index == -1:
+            return -1, 0, 0, []
+
+        children = []
+        for num in BitboardState.mask_to_values(best_mask):
+            child_total = self._child_candidate_total(state, bitboard, best_index, num, total)
+            if child_total is None:
+                self.pruned_states += 1
+            else:
+                children.append((child_total, num))
+        children.sort(reverse=True)
+        row, col = divmod(best_index, grid_size)
+        return best_index, row, col, children
 
-        if boxes_to_flip is None:
-            return self.board, 0
+    def get_performance_metrics(self):
+        """
+        Trả về các thông số hiệu suất, kèm heuristic đã dùng, số bytes của mỗi trạng thái
+        trong hàng đợi và số trạng thái con bị cắt.
 
-        current_board = copy.deepcopy(self.board)
+        Returns:
+            dict: Từ điển chứa các thông số hiệu suất
+        """
+        metrics = super().get_performance_metrics()
+        metrics['heuristic'] = self.heuristic
+        metrics['bytes_per_state'] = self.bytes_per_state
+        metrics['pruned_states'] = self.pruned_states
+        return metrics
 
-        current_cost = 0
-        for box in boxes_to_flip:
-            current_cost += self._calculate_errors_row_column(box[0], box[1])
 
-        self.board = proposed_board
+@register_solver('IDA*')
+class IDAStarSolver(AStarSolver):
+    """
+    Giải Sudoku bằng A* lặp sâu dần (IDA*).
+    Mỗi vòng là một lượt tìm kiếm theo chiều sâu bị chặn bởi ngưỡng f; ngưỡng tăng lên
+    giá trị f nhỏ nhất vượt ngưỡng ở vòng trước. Bộ nhớ chỉ gồm đường đi hiện tại.
 
-        new_cost = 0
-        for box in boxes_to_flip:
-            new_cost += self._calculate_errors_row_column(box[0], box[1])
+    Với heuristic mặc định (số ô trống + xung đột) f = g + h không đổi dọc mọi đường đi,
+    nên IDA* kết thúc sau một vòng và duyệt giống DFS; các vòng sau chỉ xuất hiện khi
+    heuristic của con thay đổi (_child_heuristic được ghi đè).
+    """
 
-        cost_difference = new_cost - current_cost
+    FOUND = -1
 
-        rho = math.exp(-cost_difference / sigma)
+    def _astar(self):
+        """
+        Thuật toán IDA* trên một trạng thái phẳng dùng chung (bytearray).
 
-        if random.uniform(0, 1) < rho:
-            return proposed_board, cost_difference
-        else:
-            self.board = current_board
-            return current_board, 0
+        Returns:
+            bool: True nếu tìm thấy lời giải, False nếu không
+        """
+        empty_cell = self.find_empty()
+        if not empty_cell:
+            return True
 
-    def _calculate_initial_sigma(self, fixed_cells, list_of_blocks):
+        current = bytearray(self.encode_board())
+        self.bytes_per_state = sys.getsizeof(bytes(current))
+
+        h_value = self.calculate_heuristic()
+        bound = h_value
+        if self.heuristic == 'candidates':
+            bitboard = self.state.copy()
+            total = self._candidate_total(current, bitboard)
+
+        while True:
+            if self.heuristic == 'candidates':
+                result = self._bounded_search_candidates(current, bitboard, 0, h_value, total, bound)
+            else:
+                result = self._bounded_search(current, 0, h_value, bound, 0)
+            if result == self.FOUND:
+                self.set_board(self.decode_board(current))
+                return True
+            if result == float('inf'):
+                return False
+            bound = result
+
+    def _bounded_search(self, current, g_value, h_value, bound, start):
         """
-        Tính giá trị sigma ban đầu dựa trên độ lệch chuẩn của các chi phí khác nhau.
+        Tìm kiếm theo chiều sâu với ngưỡng f.
 
         Args:
-            fixed_cells: Ma trận đánh dấu các ô cố định
-            list_of_blocks: Danh sách các khối
+            current: Trạng thái phẳng, được sửa tại chỗ và hoàn tác khi quay lui
+            g_value: Số bước đã thực hiện
+            h_value: Giá trị heuristic của trạng thái
+            bound: Ngưỡng f của vòng hiện tại
+            start: Chỉ số bắt đầu tìm ô trống
 
         Returns:
-            float: Giá trị sigma ban đầu
+            FOUND nếu tìm thấy lời giải, ngược lại là giá trị f nhỏ nhất vượt ngưỡng
         """
-        list_of_differences = []
-        current_board = copy.deepcopy(self.board)
+        self.states_explored += 1
+        self.max_states_in_memory = max(self.max_states_in_memory, g_value + 1)
+        if self._monitored:
+            self._tick(g_value, g_value + 1)
 
-        tmp_board = copy.deepcopy(self.board)
+        f_value = g_value + h_value
+        if f_value > bound:
+            return f_value
 
-        for i in range(10):
-            proposed_board, boxes_to_flip = self._proposed_state(fixed_cells, list_of_blocks)
+        index = current.find(0, start)
+        if index == -1:
+            self.g_value = g_value
+            return self.FOUND
+
+        row, col = divmod(index, self.grid_size)
+        minimum = float('inf')
+        for num in self.get_possible_values_flat(current, row, col):
+            child_h = self._child_heuristic(current, index, num, h_value)
+            current[index] = num
+            result = self._bounded_search(current, g_value + 1, child_h, bound, index + 1)
+            if result == self.FOUND:
+                return self.FOUND
+            minimum = min(minimum, result)
+        current[index] = 0
+
+        return minimum
+
+    def _bounded_search_candidates(self, current, bitboard, g_value, h_value, total, bound):
+        """
+        Tìm kiếm theo chiều sâu với ngưỡng f cho heuristic 'candidates': mở rộng ô ít ứng
+        viên nhất, bitmask được đặt/xóa tại chỗ cùng trạng thái phẳng.
 
-            if boxes_to_flip:
-                self.board = proposed_board
-                list_of_differences.append(self._calculate_number_of_errors())
+        Args:
+            current: Trạng thái phẳng, được sửa tại chỗ và hoàn tác khi quay lui
+            bitboard: Bitmask tương ứng, được sửa tại chỗ và hoàn tác khi quay lui
+            g_value: Số bước đã thực hiện
+            h_value: Giá trị heuristic của trạng thái
+            total: Tổng số ứng viên của các ô trống
+            bound: Ngưỡng f của vòng hiện tại
 
-        self.board = tmp_board
+        Returns:
+            FOUND nếu tìm thấy lời giải, ngược lại là giá trị f nhỏ nhất vượt ngưỡng
+        """
+        self.states_explored += 1
+        self.max_states_in_memory = max(self.max_states_in_memory, g_value + 1)
+        if self._monitored:
+            self._tick(g_value, g_value + 1)
 
-        if len(list_of_differences) > 1:
-            return statistics.pstdev(list_of_differences)
-        else:
-            return 1.0
+        f_value = g_value + h_value
+        if f_value > bound:
+            return f_value
+
+        index, row, col, children = self._expand_candidates(current, bitboard, total)
+        if index == -1:
+            self.g_value = g_value
+            return self.FOUND
+
+        minimum = float('inf')
+        for child_total, num in children:
+            current[index] = num
+            bitboard.place(row, col, num)
+            result = self._bounded_search_candidates(current, bitboard, g_value + 1, h_value - 1, child_total, bound)
+            if result == self.FOUND:
+                return self.FOUND
+            bitboard.unplace(row, col, num)
+            minimum = min(minimum, result)
+        current[index] = 0
+
+        return minimum
+
+
+class _SMANode:
+    """Nút trong cây tìm kiếm của SMA*."""
+
+    __slots__ = ('state', 'g', 'h', 'f', 'parent', 'num', 'index', 'pending', 'live_children',
+                 'in_queue', 'seq', 'bitboard', 'total')
+
+    def __init__(self, state, g, h, f, parent, num):
+        self.state = state
+        self.g = g
+        self.h = h
+        self.f = f
+        self.parent = parent
+        self.num = num
+        self.index = None
+        # Các giá trị con chưa sinh hoặc đã bị quên: danh sách (f ước lượng, giá trị)
+        self.pending = None
+        self.live_children = 0
+        self.in_queue = False
+        self.seq = 0
+        # Chỉ dùng với heuristic 'candidates': bitmask và tổng số ứng viên của trạng thái
+        self.bitboard = None
+        self.total = 0
+
+
+@register_solver('SMA*')
+class SMAStarSolver(AStarSolver):
+    """
+    Giải Sudoku bằng A* giới hạn bộ nhớ theo kiểu SMA*.
+    Số nút trong bộ nhớ không vượt quá node_budget: khi đầy, các lá có f lớn nhất bị quên,
+    giá trị f sao lưu của chúng (f nhỏ nhất của các con còn chờ sinh) được giữ ở nút cha
+    để sinh lại khi cần.
+
+    Với heuristic mặc định f không đổi dọc mọi đường đi và thế hòa được phá theo độ sâu,
+    nên thứ tự duyệt giống DFS và hiếm khi cần quên nút; việc quên nút chỉ đáng kể khi
+    heuristic của con thay đổi (_child_heuristic được ghi đè).
+    """
 
-    def _choose_number_of_iterations(self, fixed_cells):
+    DEFAULT_NODE_BUDGET = 50000
+
+    def __init__(self, board, grid_size=9, node_budget=DEFAULT_NODE_BUDGET, heuristic='empty', backend='bitset'):
         """
-        Xác định số lần lặp dựa trên số ô cố định.
+        Khởi tạo giải thuật với ngân sách số nút.
 
         Args:
-            fixed_cells: Ma trận đánh dấu các ô cố định
+            board: Bảng Sudoku 2D (list of lists)
+            grid_size: Kích thước lưới
+            node_budget: Số nút tối đa được giữ trong bộ nhớ
+            heuristic: 'empty' hoặc 'candidates'
+            backend: Tên trạng thái ràng buộc trong BOARD_BACKENDS
+        """
+        super().__init__(board, grid_size, heuristic, backend)
+        self.node_budget = node_budget
+        self.evicted_nodes = 0
+
+    def _astar(self):
+        """
+        Thuật toán SMA* với sinh con lần lượt (mỗi lần lấy nút chỉ sinh một con).
 
         Returns:
-            int: Số lần lặp
+            bool: True nếu tìm thấy lời giải, False nếu không
         """
-        fixed_count = sum(sum(row) for row in fixed_cells)
-        base_iterations = 100
-        if self.grid_size == 16:
-            base_iterations = 200
+        empty_cell = self.find_empty()
+        if not empty_cell:
+            return True
 
-        return max(fixed_count, base_iterations)
+        initial = self.encode_board()
+        self.bytes_per_state = sys.getsizeof(initial)
+
+        # Một nhánh dài nhất cần (số ô trống + 1) nút, cộng thêm một lá để có thể quên
+        empty_count = self.count_empty_cells()
+        budget = max(self.node_budget, empty_count + 2)
+
+        h_value = self.calculate_heuristic()
+        root = _SMANode(initial, 0, h_value, h_value, None, 0)
+        candidates = self.heuristic == 'candidates'
+        if candidates:
+            root.bitboard = self.state.copy()
+            root.total = self._candidate_total(initial, root.bitboard)
+        self.evicted_nodes = 0
+        self._queue = []
+        self._seq = 0
+        self._nodes_in_memory = 1
+        self._push(root, root.f)
+
+        while self._queue:
+            _, _, seq, node = heapq.heappop(self._queue)
+            if not node.in_queue or node.seq != seq:
+                continue
+            node.in_queue = False
+            self.states_explored += 1
+            if self._monitored:
+                self._tick(node.g, self._nodes_in_memory)
 
-    def _simulated_annealing(self, fixed_cells, list_of_blocks):
+            if node.index is None:
+                if candidates:
+                    node.index, _, _, children = self._expand_candidates(node.state, node.bitboard, node.total)
+                    values = [num for _, num in children]
+                else:
+                    node.index = node.state.find(0)
+                if node.index == -1:
+                    self.g_value = node.g
+                    self.set_board(self.decode_board(node.state))
+                    return True
+                if not candidates:
+                    values = self.get_possible_values_flat(node.state, *divmod(node.index, self.grid_size))
+                node.pending = [(node.f, num) for num in values]
+
+            if not node.pending:
+                self._drop(node)
+                continue
+
+            # Giải phóng chỗ trước khi sinh con để số nút không bao giờ vượt ngân sách
+            if self._nodes_in_memory >= budget:
+                self._evict(budget)
+
+            # Sắp ổn định theo f để cùng f vẫn giữ thứ tự sinh giá trị ban đầu
+            node.pending.sort(key=lambda entry: entry[0])
+            child_f, num = node.pending.pop(0)
+            index = node.index
+            child_state = node.state[:index] + bytes((num,)) + node.state[index + 1:]
+            child_h = self._child_heuristic(node.state, index, num, node.h)
+            child = _SMANode(child_state, node.g + 1, child_h, max(child_f, node.g + 1 + child_h), node, num)
+            if candidates:
+                child.total = self._child_candidate_total(node.state, node.bitboard, index, num, node.total)
+                child.bitboard = node.bitboard.copy()
+                child.bitboard.place(*divmod(index, self.grid_size), num)
+            node.live_children += 1
+            self._nodes_in_memory += 1
+            self._push(child, child.f)
+            if node.pending:
+                self._push(node, node.pending[0][0])
+
+            self.max_states_in_memory = max(self.max_states_in_memory, self._nodes_in_memory)
+
+        return False
+
+    def _push(self, node, key):
+        """Đưa nút vào hàng đợi ưu tiên (các mục cũ của nút trở thành vô hiệu)."""
+        self._seq += 1
+        node.seq = self._seq
+        node.in_queue = True
+        # Ưu tiên f nhỏ, cùng f thì ưu tiên nút sâu hơn
+        heapq.heappush(self._queue, (key, -node.g, self._seq, node))
+
+    def _drop(self, node):
         """
-        Thuật toán Simulated Annealing để giải Sudoku.
+        Loại nút đã duyệt hết khỏi bộ nhớ và loại tiếp các tổ tiên không còn nhánh nào.
 
         Args:
-            fixed_cells: Ma trận đánh dấu các ô cố định
-            list_of_blocks: Danh sách các khối
+            node: Nút không còn con sống và không còn giá trị con chờ sinh
+        """
+        while node is not None and not node.in_queue and node.live_children == 0 and not node.pending:
+            self._nodes_in_memory -= 1
+            parent = node.parent
+            node.parent = None
+            if parent is not None:
+                parent.live_children -= 1
+            node = parent
+
+    def _evict(self, budget):
+        """
+        Quên các lá có f lớn nhất (cùng f thì nông nhất) cho đến khi còn 3/4 ngân sách.
+        Giá trị của lá bị quên được trả về danh sách chờ của nút cha cùng f sao lưu: f nhỏ
+        nhất trong các con còn chờ sinh của lá (hoặc f của lá nếu nó chưa được mở rộng),
+        để nhánh đã biết là tốn kém không bị sinh lại với f cũ.
+
+        Args:
+            budget: Số nút tối đa trong bộ nhớ
+        """
+        target = budget * 3 // 4
+        leaves = [entry for entry in self._queue
+                  if entry[3].in_queue and entry[3].seq == entry[2] and entry[3].live_children == 0
+                  and entry[3].parent is not None]
+        leaves.sort(key=lambda entry: (entry[0], entry[1]), reverse=True)
+
+        for _, _, _, leaf in leaves:
+            if self._nodes_in_memory <= target:
+                break
+            parent = leaf.parent
+            backed_up_f = min(leaf.pending)[0] if leaf.pending else leaf.f
+            leaf.in_queue = False
+            leaf.parent = None
+            self._nodes_in_memory -= 1
+            self.evicted_nodes += 1
+            parent.live_children -= 1
+            parent.pending.append((max(backed_up_f, leaf.f), leaf.num))
+            parent.pending.sort(key=lambda entry: entry[0])
+            self._push(parent, parent.pending[0][0])
+
+        self._queue = [entry for entry in self._queue if entry[3].in_queue and entry[3].seq == entry[2]]
+        heapq.heapify(self._queue)
+
+    def get_performance_metrics(self):
+        """
+        Trả về các thông số hiệu suất, kèm ngân sách nút và số nút đã bị quên.
 
         Returns:
-            bool: True nếu tìm thấy lời giải, False nếu không
+            dict: Từ điển chứa các thông số hiệu suất
         """
-        solution_found = False
-        attempts = 0
-        max_attempts = 3
+        metrics = super().get_performance_metrics()
+        metrics['node_budget'] = self.node_budget
+        metrics['evicted_nodes'] = self.evicted_nodes
+        return metrics
 
-        while not solution_found and attempts < max_attempts:
-            attempts += 1
-            self.states_explored += 1
 
-            if attempts > 1:
-                self.board = [[0 if fixed_cells[i][j] == 0 else self.board[i][j]
-                               for j in range(self.grid_size)]
-                              for i in range(self.grid_size)]
-                self._randomly_fill_blocks(fixed_cells, list_of_blocks)
+@register_solver('Propagation')
+class PropagationSolver(SudokuSolver):
+    """
+    Giải Sudoku bằng lan truyền ràng buộc kết hợp phân nhánh.
+    Trước mỗi lần phân nhánh, các luật suy diễn (naked/hidden single, naked/hidden pair,
+    pointing và box-line reduction) được áp dụng đến điểm bất động. Luật đơn giản luôn
+    được thử trước; khi một luật tạo ra tiến triển thì quay lại luật đầu tiên.
+    """
 
-            decrease_factor = 0.99
-            stuck_count = 0
+    RULES = ('naked_single', 'hidden_single', 'naked_pair', 'hidden_pair', 'pointing', 'box_line')
 
-            sigma = self._calculate_initial_sigma(fixed_cells, list_of_blocks)
+    # Đơn vị, bitmask và ô liên quan chỉ phụ thuộc kích thước lưới nên được dựng một lần và
+    # dùng chung (chỉ đọc) giữa các đối tượng, ví dụ khi một tiến trình giải hàng loạt câu đố
+    _geometry_cache = {}
 
-            score = self._calculate_number_of_errors()
+    def __init__(self, board, grid_size=9, backend='bitset'):
+        super().__init__(board, grid_size, backend)
 
-            iterations = self._choose_number_of_iterations(fixed_cells)
+        geometry = self._geometry_cache.get(grid_size)
+        if geometry is None:
+            geometry = self._geometry_cache[grid_size] = self._build_geometry()
+        (self.rows_units, self.cols_units, self.boxes_units, self.units, self.box_row_masks, self.box_col_masks,
+         self.line_segment_masks, self.box_of, self.box_slot, self.peers) = geometry
 
-            if score <= 0:
-                solution_found = True
-                break
+        self.eliminations = {rule: 0 for rule in self.RULES}
+        self.branch_points = 0
+        self._unit_positions = None
+
+    def _build_geometry(self):
+        """
+        Dựng các đơn vị, bitmask vị trí và danh sách ô liên quan cho kích thước lưới hiện tại.
 
-            max_loops = 500
-            current_loop = 0
+        Returns:
+            tuple: Các cấu trúc theo thứ tự được gán trong __init__
+        """
+        n = self.grid_size
+        rows_units = [[i * n + j for j in range(n)] for i in range(n)]
+        cols_units = [[i * n + j for i in range(n)] for j in range(n)]
+        boxes_units = []
+        for box_row in range(0, n, self.box_size):
+            for box_col in range(0, n, self.box_size):
+                boxes_units.append([i * n + j
+                                    for i in range(box_row, box_row + self.box_size)
+                                    for j in range(box_col, box_col + self.box_size)])
+        units = rows_units + cols_units + boxes_units
+        # Bitmask vị trí (theo thứ tự ô trong đơn vị) của từng hàng/cột trong một hộp
+        # và của từng đoạn thuộc một hộp trong một hàng/cột
+        b = self.box_size
+        segment = (1 << b) - 1
+        box_row_masks = [segment << (r * b) for r in range(b)]
+        box_col_masks = [sum(1 << (i * b + c) for i in range(b)) for c in range(b)]
+        line_segment_masks = [segment << (k * b) for k in range(b)]
+        box_of = [self.state.box_index[c // n][c % n] for c in range(n * n)]
+        box_slot = [(c // n % self.box_size) * self.box_size + c % n % self.box_size for c in range(n * n)]
+        peers_list = []
+        for c in range(n * n):
+            row, col, box = c // n, c % n, box_of[c]
+            peers = set(rows_units[row]) | set(cols_units[col]) | set(boxes_units[box])
+            peers.discard(c)
+            peers_list.append(tuple(peers))
+
+        return (rows_units, cols_units, boxes_units, units, box_row_masks, box_col_masks,
+                line_segment_masks, box_of, box_slot, peers_list)
+
+    def _prepare_search(self):
+        """Đặt lại số lần loại bỏ của từng luật và số lần phân nhánh."""
+        self.max_states_in_memory = 1
+        self.eliminations = {rule: 0 for rule in self.RULES}
+        self.branch_points = 0
 
-            while not solution_found and current_loop < max_loops:
-                current_loop += 1
-                previous_score = score
+    def _find_solution(self):
+        """
+        Giải Sudoku bằng lan truyền ràng buộc.
 
-                for i in range(iterations):
-                    new_board, score_diff = self._choose_new_state(fixed_cells, list_of_blocks, sigma)
+        Returns:
+            bool: True nếu tìm thấy lời giải, False nếu không
+        """
+        n = self.grid_size
+        values = [self.board[c // n][c % n] for c in range(n * n)]
+        candidates = [0 if values[c] else self.state.candidate_mask(c // n, c % n) for c in range(n * n)]
 
-                    self.board = new_board
-                    score += score_diff
+        if not self.is_board_valid() or not all(values[c] or candidates[c] for c in range(n * n)):
+            return False
+        solution = self._search(values, candidates, 1)
+        if solution is None:
+            return False
 
-                    self.states_explored += 1
-                    self.g_value += 1 if score_diff != 0 else 0
+        self.g_value = sum(1 for row in self.board for value in row if value == 0)
+        self.set_board([solution[i * n:(i + 1) * n] for i in range(n)])
+        return True
 
-                    if score <= 0:
-                        solution_found = True
-                        break
+    def get_performance_metrics(self):
+        """
+        Trả về các thông số hiệu suất, kèm số lần loại bỏ ứng viên của từng luật.
 
-                sigma *= decrease_factor
+        Returns:
+            dict: Từ điển chứa các thông số hiệu suất
+        """
+        metrics = super().get_performance_metrics()
+        metrics['eliminations'] = dict(self.eliminations)
+        metrics['branch_points'] = self.branch_points
+        return metrics
 
-                if score <= 0:
-                    solution_found = True
-                    break
+    def _search(self, values, candidates, depth):
+        """
+        Lan truyền đến điểm bất động rồi phân nhánh tại ô có ít ứng viên nhất.
 
-                if score >= previous_score:
-                    stuck_count += 1
-                else:
-                    stuck_count = 0
+        Args:
+            values: Danh sách phẳng giá trị các ô (0 là ô trống)
+            candidates: Danh sách phẳng bitmask ứng viên (0 với ô đã điền)
+            depth: Độ sâu hiện tại của cây tìm kiếm
 
-                if stuck_count > 80:
-                    sigma += 2
+        Returns:
+            list: Danh sách giá trị lời giải, hoặc None nếu không có lời giải
+        """
+        self.states_explored += 1
+        self.max_states_in_memory = max(self.max_states_in_memory, depth)
+        if self._monitored:
+            self._tick(depth, depth)
 
-                if self._calculate_number_of_errors() == 0:
-                    solution_found = True
-                    break
+        if not self._propagate(values, candidates):
+            return None
 
-                if sigma < 0.001:
-                    break
+        best_cell = None
+        min_count = self.grid_size + 1
+        for c, mask in enumerate(candidates):
+            if mask:
+                count = bin(mask).count('1')
+                if count < min_count:
+                    min_count = count
+                    best_cell = c
+                    if count == 2:
+                        break
 
-        return solution_found
+        if best_cell is None:
+            return values
 
+        self.branch_points += 1
+        for num in BitboardState.mask_to_values(candidates[best_cell]):
+            new_values = values[:]
+            new_candidates = candidates[:]
+            if self._assign(new_values, new_candidates, best_cell, num) < 0:
+                continue
+            result = self._search(new_values, new_candidates, depth + 1)
+            if result is not None:
+                return result
 
-class AStarSolver(SudokuSolver):
-    """
-    Giải Sudoku bằng thuật toán A*.
-    Sử dụng hàm heuristic để tìm đường đi tối ưu nhất đến lời giải.
-    """
+        return None
 
-    def solve(self):
+    def _assign(self, values, candidates, cell, num):
         """
-        Giải Sudoku bằng A*.
+        Đặt 'num' vào ô và loại nó khỏi ứng viên của các ô liên quan.
 
         Returns:
-            bool: True nếu tìm thấy lời giải, False nếu không
+            int: Số ứng viên bị loại khỏi các ô liên quan, -1 nếu gây mâu thuẫn
         """
-        start_time = time.time()
-        self.states_explored = 0
-        self.max_states_in_memory = 0
+        bit = 1 << (num - 1)
+        values[cell] = num
+        candidates[cell] = 0
+        removed = 0
+        for peer in self.peers[cell]:
+            mask = candidates[peer]
+            if mask & bit:
+                mask &= ~bit
+                candidates[peer] = mask
+                removed += 1
+                if not mask:
+                    return -1
+        return removed
+
+    def _propagate(self, values, candidates):
+        """
+        Áp dụng các luật suy diễn theo thứ tự đến khi không còn tiến triển.
 
-        result = self._astar()
+        Returns:
+            bool: False nếu phát hiện mâu thuẫn, True nếu không
+        """
+        rules = (self._naked_singles, self._hidden_singles, self._naked_pairs,
+                 self._hidden_pairs, self._pointing, self._box_line)
+        while True:
+            # Bitmask vị trí chỉ được lập khi cần và dùng chung cho các luật trong cùng một vòng;
+            # vòng kết thúc ngay khi có luật tạo tiến triển nên chúng không bao giờ bị cũ.
+            self._unit_positions = None
+            for rule in rules:
+                progress = rule(values, candidates)
+                if progress < 0:
+                    return False
+                if progress:
+                    break
+            else:
+                return True
 
-        self.execution_time = time.time() - start_time
-        self.is_solved = result
-        self.solution = copy.deepcopy(self.board) if result else None
+    def _naked_singles(self, values, candidates):
+        """Điền các ô chỉ còn đúng một ứng viên."""
+        progress = 0
+        for c, mask in enumerate(candidates):
+            if mask and not mask & (mask - 1):
+                removed = self._assign(values, candidates, c, mask.bit_length())
+                if removed < 0:
+                    return -1
+                self.eliminations['naked_single'] += removed
+                progress += 1
+        return progress
+
+    def _hidden_singles(self, values, candidates):
+        """Điền giá trị chỉ còn một vị trí khả dĩ trong một hàng, cột hoặc hộp."""
+        full_mask = self.state.full_mask
+        progress = 0
+        for unit in self.units:
+            once = twice = placed = 0
+            for c in unit:
+                mask = candidates[c]
+                twice |= once & mask
+                once |= mask
+                if values[c]:
+                    placed |= 1 << (values[c] - 1)
+            if (once | placed) != full_mask:
+                return -1
+            singles = once & ~twice & ~placed
+            while singles:
+                bit = singles & -singles
+                singles ^= bit
+                cell = next((c for c in unit if candidates[c] & bit), None)
+                if cell is None:
+                    return -1
+                removed = self._assign(values, candidates, cell, bit.bit_length())
+                if removed < 0:
+                    return -1
+                self.eliminations['hidden_single'] += removed
+                progress += 1
+        return progress
+
+    def _naked_pairs(self, values, candidates):
+        """Hai ô trong cùng đơn vị có chung đúng hai ứng viên: loại hai ứng viên đó khỏi các ô còn lại."""
+        progress = 0
+        for unit in self.units:
+            seen = {}
+            for c in unit:
+                mask = candidates[c]
+                rest = mask & (mask - 1)
+                # Đúng hai bit: bỏ bit thấp nhất còn lại một bit
+                if rest and not rest & (rest - 1):
+                    if mask in seen:
+                        pair = (seen[mask], c)
+                        for other in unit:
+                            if other not in pair and candidates[other] & mask:
+                                new_mask = candidates[other] & ~mask
+                                removed = bin(candidates[other] & mask).count('1')
+                                if not new_mask:
+                                    return -1
+                                candidates[other] = new_mask
+                                self.eliminations['naked_pair'] += removed
+                                progress += removed
+                    else:
+                        seen[mask] = c
+        return progress
+
+    def _all_positions(self, candidates):
+        """
+        Lấy bitmask vị trí của mọi đơn vị cho vòng lan truyền hiện tại.
+        Một lượt quét qua các ô cập nhật đồng thời hàng, cột và hộp chứa ô đó.
 
-        if result:
-            self.h_value = 0
-        else:
-            self.h_value = self.calculate_heuristic()
+        Args:
+            candidates: Danh sách phẳng bitmask ứng viên
 
-        self.f_value = self.g_value + self.h_value
+        Returns:
+            list: Theo thứ tự self.units (hàng, cột rồi hộp), mỗi phần tử là danh sách
+                positions[num - 1] - bitmask các vị trí trong đơn vị còn ứng viên num
+        """
+        if self._unit_positions is None:
+            n = self.grid_size
+            positions = [[0] * n for _ in range(3 * n)]
+            box_of, box_slot = self.box_of, self.box_slot
+            for c, mask in enumerate(candidates):
+                if not mask:
+                    continue
+                row, col = divmod(c, n)
+                row_positions = positions[row]
+                col_positions = positions[n + col]
+                box_positions = positions[2 * n + box_of[c]]
+                row_bit, col_bit, box_bit = 1 << col, 1 << row, 1 << box_slot[c]
+                while mask:
+                    bit = mask & -mask
+                    mask ^= bit
+                    d = bit.bit_length() - 1
+                    row_positions[d] |= row_bit
+                    col_positions[d] |= col_bit
+                    box_positions[d] |= box_bit
+            self._unit_positions = positions
+        return self._unit_positions
+
+    def _hidden_pairs(self, values, candidates):
+        """Hai giá trị chỉ xuất hiện ở cùng hai ô của một đơn vị: chỉ giữ hai giá trị đó ở hai ô."""
+        progress = 0
+        for unit, positions in zip(self.units, self._all_positions(candidates)):
+            pairs = {}
+            for d, slots in enumerate(positions):
+                rest = slots & (slots - 1)
+                if rest and not rest & (rest - 1):
+                    pairs[slots] = pairs.get(slots, 0) | (1 << d)
+            for slots, pair_mask in pairs.items():
+                rest = pair_mask & (pair_mask - 1)
+                if not rest or rest & (rest - 1):
+                    continue
+                while slots:
+                    slot_bit = slots & -slots
+                    slots ^= slot_bit
+                    c = unit[slot_bit.bit_length() - 1]
+                    extra = candidates[c] & ~pair_mask
+                    if extra:
+                        candidates[c] &= pair_mask
+                        removed = bin(extra).count('1')
+                        self.eliminations['hidden_pair'] += removed
+                        progress += removed
+        return progress
+
+    def _pointing(self, values, candidates):
+        """Giá trị trong một hộp chỉ nằm trên một hàng/cột: loại nó khỏi phần còn lại của hàng/cột đó."""
+        n = self.grid_size
+        b = self.box_size
+        progress = 0
+        box_positions = self._all_positions(candidates)[2 * n:]
+        for box, positions in enumerate(box_positions):
+            box_row, box_col = (box // b) * b, (box % b) * b
+            for d, slots in enumerate(positions):
+                if not slots & (slots - 1):
+                    continue
+                line = None
+                for r, row_mask in enumerate(self.box_row_masks):
+                    if not slots & ~row_mask:
+                        line = self.rows_units[box_row + r]
+                        break
+                else:
+                    for c, col_mask in enumerate(self.box_col_masks):
+                        if not slots & ~col_mask:
+                            line = self.cols_units[box_col + c]
+                            break
+                if line is None:
+                    continue
+                bit = 1 << d
+                for other in line:
+                    if self.box_of[other] != box and candidates[other] & bit:
+                        candidates[other] &= ~bit
+                        if not candidates[other]:
+                            return -1
+                        self.eliminations['pointing'] += 1
+                        progress += 1
+        return progress
+
+    def _box_line(self, values, candidates):
+        """Giá trị trong một hàng/cột chỉ nằm trong một hộp: loại nó khỏi phần còn lại của hộp đó."""
+        n = self.grid_size
+        progress = 0
+        line_positions = self._all_positions(candidates)[:2 * n]
+        for line, positions in zip(self.rows_units + self.cols_units, line_positions):
+            line_cells = None
+            for d, slots in enumerate(positions):
+                if not slots & (slots - 1):
+                    continue
+                for segment, segment_mask in enumerate(self.line_segment_masks):
+                    if not slots & ~segment_mask:
+                        break
+                else:
+                    continue
+                if line_cells is None:
+                    line_cells = set(line)
+                box = self.box_of[line[segment * self.box_size]]
+                bit = 1 << d
+                for other in self.boxes_units[box]:
+                    if other not in line_cells and candidates[other] & bit:
+                        candidates[other] &= ~bit
+                        if not candidates[other]:
+                            return -1
+                        self.eliminations['box_line'] += 1
+                        progress += 1
+        return progress
+
+class DancingLinksMatrix:
+    """
+    Ma trận exact cover của Sudoku dưới dạng Dancing Links (mảng L/R/U/D).
+    Ma trận chỉ phụ thuộc vào kích thước lưới nên được dựng một lần cho mỗi kích thước
+    và dùng lại cho mọi câu đố: các ô cho sẵn được chọn trước khi tìm kiếm và được hoàn
+    tác sau đó để trả ma trận về trạng thái ban đầu.
+    """
 
-        return result
+    _cache = {}
+    _cache_lock = threading.Lock()
 
-    def _astar(self):
+    def __init__(self, grid_size):
         """
-        Thuật toán A* sử dụng hàng đợi ưu tiên.
+        Dựng ma trận với 4 * N^2 ràng buộc (ô, hàng-giá trị, cột-giá trị, hộp-giá trị)
+        và N^3 lựa chọn (hàng, cột, giá trị).
+
+        Args:
+            grid_size: Kích thước lưới
+        """
+        n = grid_size
+        box_size = math.isqrt(n)
+        cells = n * n
+        num_columns = 4 * cells
+
+        self.grid_size = n
+        self.lock = threading.Lock()
+
+        # Nút 0 là gốc, các nút 1..num_columns là đầu cột
+        self.L = list(range(-1, num_columns))
+        self.L[0] = num_columns
+        self.R = list(range(1, num_columns + 2))
+        self.R[num_columns] = 0
+        self.U = list(range(num_columns + 1))
+        self.D = list(range(num_columns + 1))
+        self.C = list(range(num_columns + 1))
+        self.S = [0] * (num_columns + 1)
+        self.option_of = [-1] * (num_columns + 1)
+        self.option_node = []
+
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        for row in range(n):
+            for col in range(n):
+                box = (row // box_size) * box_size + col // box_size
+                for d in range(n):
+                    columns = (1 + row * n + col,
+                               1 + cells + row * n + d,
+                               1 + 2 * cells + col * n + d,
+                               1 + 3 * cells + box * n + d)
+                    option = len(self.option_node)
+                    first = len(C)
+                    self.option_node.append(first)
+                    for k, column in enumerate(columns):
+                        node = first + k
+                        L.append(first + (k - 1) % 4)
+                        R.append(first + (k + 1) % 4)
+                        U.append(U[column])
+                        D.append(column)
+                        D[U[column]] = node
+                        U[column] = node
+                        C.append(column)
+                        S[column] += 1
+                        self.option_of.append(option)
+
+    @classmethod
+    def for_size(cls, grid_size):
+        """
+        Lấy ma trận dùng chung cho kích thước lưới, dựng mới nếu chưa có.
+
+        Args:
+            grid_size: Kích thước lưới
 
         Returns:
-            bool: True nếu tìm thấy lời giải, False nếu không
+            DancingLinksMatrix: Ma trận của kích thước lưới
         """
-        empty_cell = self.find_empty()
-        if not empty_cell:
-            return True
+        with cls._cache_lock:
+            matrix = cls._cache.get(grid_size)
+            if matrix is None:
+                matrix = cls(grid_size)
+                cls._cache[grid_size] = matrix
+            return matrix
+
+    def cover(self, column):
+        """Gỡ cột và mọi lựa chọn chứa cột đó khỏi ma trận."""
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        R[L[column]] = R[column]
+        L[R[column]] = L[column]
+        i = D[column]
+        while i != column:
+            j = R[i]
+            while j != i:
+                D[U[j]] = D[j]
+                U[D[j]] = U[j]
+                S[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+
+    def uncover(self, column):
+        """Khôi phục cột đã gỡ bởi cover (theo thứ tự ngược lại)."""
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        i = U[column]
+        while i != column:
+            j = L[i]
+            while j != i:
+                S[C[j]] += 1
+                D[U[j]] = j
+                U[D[j]] = j
+                j = L[j]
+            i = U[i]
+        R[L[column]] = column
+        L[R[column]] = column
+
+    def option_index(self, row, col, num):
+        """Chỉ số lựa chọn ứng với việc đặt 'num' tại ô (row, col)."""
+        return (row * self.grid_size + col) * self.grid_size + num - 1
+
+    def decode_option(self, option):
+        """
+        Chuyển chỉ số lựa chọn thành (row, col, num).
 
-        priority_queue = [(self.calculate_heuristic(), 0, copy.deepcopy(self.board))]
-        heapq.heapify(priority_queue)
+        Returns:
+            tuple: (row, col, num)
+        """
+        cell, d = divmod(option, self.grid_size)
+        row, col = divmod(cell, self.grid_size)
+        return row, col, d + 1
 
-        visited = set()
 
-        while priority_queue:
-            self.max_states_in_memory = max(self.max_states_in_memory, len(priority_queue))
+@register_solver('DLX')
+class DLXSolver(SudokuSolver):
+    """
+    Giải Sudoku bằng Algorithm X trên Dancing Links (exact cover).
+    Dùng chung ma trận exact cover theo kích thước lưới, hỗ trợ cả đếm số lời giải
+    để kiểm tra tính duy nhất.
+    """
 
-            f_value, g_value, current_board = heapq.heappop(priority_queue)
-            self.states_explored += 1
+    def _find_solution(self):
+        """
+        Giải Sudoku bằng DLX.
 
-            board_str = str(current_board)
-            if board_str in visited:
-                continue
+        Returns:
+            bool: True nếu tìm thấy lời giải, False nếu không
+        """
+        count, options = self._run(1)
+        if not count:
+            return False
+        for option in options:
+            row, col, num = self.matrix.decode_option(option)
+            self.place_value(row, col, num)
+            self.g_value += 1
+        return True
 
-            visited.add(board_str)
+    def count_solutions(self, limit=2):
+        """
+        Đếm số lời giải của bảng, dừng khi đạt 'limit'.
 
-            self.board = copy.deepcopy(current_board)
-            self.g_value = g_value
+        Args:
+            limit: Số lời giải tối đa cần đếm (2 là đủ để kiểm tra tính duy nhất)
 
-            empty_cell = self.find_empty()
-            if not empty_cell:
-                return True
+        Returns:
+            int: Số lời giải tìm được (không vượt quá limit)
+        """
+        count, _ = self._run(limit)
+        return count
 
-            row, col = empty_cell
+    @property
+    def matrix(self):
+        """Ma trận exact cover dùng chung cho kích thước lưới hiện tại."""
+        return DancingLinksMatrix.for_size(self.grid_size)
 
-            possible_values = self.get_possible_values(row, col)
+    def _run(self, limit):
+        """
+        Chọn trước các ô cho sẵn, tìm kiếm rồi hoàn tác để trả ma trận về ban đầu.
 
-            for num in possible_values:
-                new_board = copy.deepcopy(current_board)
-                new_board[row][col] = num
+        Args:
+            limit: Số lời giải tối đa cần tìm
 
-                self.board = new_board
-                h_value = self.calculate_heuristic()
-                new_g_value = g_value + 1
-                f_value = h_value + new_g_value
+        Returns:
+            tuple: (số lời giải, danh sách lựa chọn của lời giải đầu tiên)
+        """
+        matrix = self.matrix
+        with matrix.lock:
+            covered = []
+            covered_set = set()
+            valid = True
+            for row in range(self.grid_size):
+                for col in range(self.grid_size):
+                    num = self.board[row][col]
+                    if num == 0:
+                        continue
+                    node = matrix.option_node[matrix.option_index(row, col, num)]
+                    columns = [matrix.C[node + k] for k in range(4)]
+                    if covered_set.intersection(columns):
+                        valid = False
+                        break
+                    for column in columns:
+                        matrix.cover(column)
+                        covered.append(column)
+                        covered_set.add(column)
+                if not valid:
+                    break
 
-                heapq.heappush(priority_queue, (f_value, new_g_value, new_board))
+            self._count = 0
+            self._limit = limit
+            self._stack = []
+            self._first_solution = []
+            self._cancelled = None
+            if valid:
+                self._search(matrix, 1)
 
-        return False
+            for column in reversed(covered):
+                matrix.uncover(column)
 
-class SudokuSolver(ABC):
-    def __init__(self, board: List[List[int]], grid_size: int):
-        self.board = [row[:] for row in board]
-        self.grid_size = grid_size
-        self.box_size = 3 if grid_size == 9 else 4
-        self.states_explored = 0
-        self.max_states_in_memory = 0
-        self.execution_time = 0
-        self.solution = None
-        self.h_value = 0
-        self.g_value = 0
-        self.f_value = 0
-        self.is_solved = False
+        if self._cancelled is not None:
+            raise self._cancelled
+        return self._count, self._first_solution
 
-    @abstractmethod
-    def solve(self) -> bool:
-        pass
+    def _search(self, matrix, depth):
+        """
+        Algorithm X đệ quy với lựa chọn cột có ít lựa chọn nhất.
 
-    def get_performance_metrics(self) -> Dict[str, Any]:
-        return {
-            "is_solved": self.is_solved,
-            "execution_time": self.execution_time,
-            "states_explored": self.states_explored,
-            "max_states_in_memory": self.max_states_in_memory,
-            "h_value": self.h_value,
-            "g_value": self.g_value,
-            "f_value": self.f_value
-        }
+        Returns:
+            bool: True nếu đã đủ số lời giải cần tìm
+        """
+        self.states_explored += 1
+        self.max_states_in_memory = max(self.max_states_in_memory, depth)
+        if self._monitored:
+            # Không để ngoại lệ cắt ngang việc hoàn tác: đánh dấu hủy rồi quay lui như khi đã xong
+            try:
+                self._tick(depth, depth)
+            except SearchCancelled as error:
+                self._cancelled = error
+                return True
 
-    def is_valid_move(self, row: int, col: int, num: int) -> bool:
-        if self.board[row][col] != 0:
+        L, R, D, C, S = matrix.L, matrix.R, matrix.D, matrix.C, matrix.S
+        if R[0] == 0:
+            self._count += 1
+            if self._count == 1:
+                self._first_solution = [matrix.option_of[node] for node in self._stack]
+            return self._count >= self._limit
+
+        column = R[0]
+        best = column
+        best_size = S[column]
+        while column != 0 and best_size > 1:
+            if S[column] < best_size:
+                best = column
+                best_size = S[column]
+            column = R[column]
+        if best_size == 0:
             return False
-        for i in range(self.grid_size):
-            if self.board[row][i] == num:
-                return False
-        for i in range(self.grid_size):
-            if self.board[i][col] == num:
-                return False
-        box_row, box_col = self.box_size * (row // self.box_size), self.box_size * (col // self.box_size)
-        for i in range(box_row, box_row + self.box_size):
-            for j in range(box_col, box_col + self.box_size):
-                if self.board[i][j] == num:
-                    return False
-        return True
 
-    def is_board_valid(self) -> bool:
-        for row in range(self.grid_size):
-            nums = [self.board[row][col] for col in range(self.grid_size) if self.board[row][col] != 0]
-            if len(nums) != len(set(nums)):
-                return False
-        for col in range(self.grid_size):
-            nums = [self.board[row][col] for row in range(self.grid_size) if self.board[row][col] != 0]
-            if len(nums) != len(set(nums)):
-                return False
-        for box_row in range(0, self.grid_size, self.box_size):
-            for box_col in range(0, self.grid_size, self.box_size):
-                nums = []
-                for row in range(box_row, box_row + self.box_size):
-                    for col in range(box_col, box_col + self.box_size):
-                        if self.board[row][col] != 0:
-                            nums.append(self.board[row][col])
-                if len(nums) != len(set(nums)):
-                    return False
-        return True
+        matrix.cover(best)
+        done = False
+        r = D[best]
+        while r != best:
+            self._stack.append(r)
+            j = R[r]
+            while j != r:
+                matrix.cover(C[j])
+                j = R[j]
+
+            done = self._search(matrix, depth + 1)
+
+            j = L[r]
+            while j != r:
+                matrix.uncover(C[j])
+                j = L[j]
+            self._stack.pop()
+
+            if done:
+                break
+            r = D[r]
+        matrix.uncover(best)
+        return done
+
 
-def get_solver(algorithm, board, grid_size=9):
+def get_solver(algorithm, board, grid_size=9, **options):
     """
     Trả về đối tượng giải thuật tương ứng với thuật toán được chọn.
 
     Args:
-        algorithm: Tên thuật toán ('dfs', 'bfs', 'backtracking', 'simulated_annealing', 'A*')
+        algorithm: Tên thuật toán đã đăng ký trong SOLVERS ('DFS', 'BFS', 'BackTracking',
+                   'SimulatedAnnealing', 'A*', 'IDA*', 'SMA*', 'Propagation', 'DLX')
         board: Bảng Sudoku 2D
-        grid_size: Kích thước lưới (9 hoặc 16)
+        grid_size: Kích thước lưới (9, 16 hoặc 25)
+        **options: Tham số của thuật toán (ví dụ backend cho mọi thuật toán, node_budget cho
+            'SMA*'); thuật toán không hỗ trợ tham số sẽ báo TypeError
 
     Returns:
         SudokuSolver: Đối tượng giải thuật
     """
-    if algorithm == 'DFS':
-        return DFSSolver(board, grid_size)
-    elif algorithm == 'BFS':
-        return BFSSolver(board, grid_size)
-    elif algorithm == 'BackTracking':
-        return BacktrackingSolver(board, grid_size)
-    elif algorithm == 'SimulatedAnnealing':
-        return SimulatedAnnealingSolver(board, grid_size)
-    elif algorithm == 'A*':
-        return AStarSolver(board, grid_size)
-    else:
-        raise ValueError(f"Thuật toán không hợp lệ: {algorithm}")
\ No newline at end of file
+    solver_class = SOLVERS.get(algorithm)
+    if solver_class is None:
+        raise ValueError(f"Thuật toán không hợp lệ: {algorithm}")
+    return solver_class(board, grid_size, **options)
@@ -1,5 +1,5 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, StringVar, Frame, Label, Button, Entry, Toplevel
+from tkinter import ttk, messagebox, StringVar, BooleanVar, Frame, Label, Button, Entry, Toplevel
 import os
 import ttkbootstrap as ttkb
 from ttkbootstrap.constants import *
@@ -7,6 +7,7 @@ import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from PIL import Image, ImageTk
 from pathlib import Path
+from solve import SOLVERS
 
 
 class SelectionScreen:
@@ -108,6 +109,13 @@ class GameScreen:
         self.cells = []
         self.cell_vars = []
         self.original_cells = set()
+        # Trạng thái đã vẽ của từng ô (text, bg, state) và các thay đổi chờ vẽ trong lần idle kế tiếp
+        self._rendered = []
+        self._pending = {}
+        self._flush_scheduled = False
+        # Số lệnh cập nhật widget (StringVar.set / config) của lần vẽ gần nhất và tổng cộng
+        self.frame_widget_updates = 0
+        self.total_widget_updates = 0
         self.timer_var = StringVar(value="Thời gian: 00:00")
         self.lives_var = StringVar(value="Mạng: 3")
         self.timer_running = False
@@ -226,6 +234,8 @@ class GameScreen:
 
         self.cells = []
         self.cell_vars = []
+        self._rendered = [[{} for _ in range(self.grid_size)] for _ in range(self.grid_size)]
+        self._pending = {}
 
         box_size = 3 if self.grid_size == 9 else 4
 
@@ -308,15 +318,25 @@ class GameScreen:
 
         self.algorithm_var = StringVar(value="BackTracking")
         algorithm_menu = ttk.Combobox(controls_frame, textvariable=self.algorithm_var,
-                                      values=["DFS", "BFS", "BackTracking", "SimulatedAnnealing", "A*"],
+                                      values=list(SOLVERS),
                                       state="readonly", width=15)
         algorithm_menu.pack(side="left", padx=5, pady=5)
 
+        # Đo chi tiết bộ nhớ/GC/thời gian theo nhóm hàm (làm thuật toán chạy chậm hơn)
+        self.instrument_var = BooleanVar(value=False)
+        ttkb.Checkbutton(controls_frame, text="Đo chi tiết", variable=self.instrument_var,
+                         bootstyle="round-toggle").pack(side="left", padx=5)
+
         solve_icon = self._get_icon('solve')
-        solve_btn = ttkb.Button(controls_frame, text=("Giải"),
-                                image=solve_icon, command=self._on_solve,
-                                bootstyle="success-outline", compound="left")
-        solve_btn.pack(side="left", padx=10)
+        self.solve_btn = ttkb.Button(controls_frame, text=("Giải"),
+                                     image=solve_icon, command=self._on_solve,
+                                     bootstyle="success-outline", compound="left")
+        self.solve_btn.pack(side="left", padx=10)
+
+        # Nút hủy thuật toán đang chạy nền, chỉ bật khi đang giải
+        self.cancel_btn = ttkb.Button(controls_frame, text="Hủy", command=self._on_cancel_solve,
+                                      bootstyle="danger-outline", state="disabled")
+        self.cancel_btn.pack(side="left", padx=10)
 
         clear_icon = self._get_icon('clear')
         clear_btn = ttkb.Button(controls_frame, text=("Xóa"),
@@ -514,32 +534,76 @@ class GameScreen:
         self.controller = controller
 
     def update_board(self, board, original_cells):
-        """Cập nhật giao diện với trạng thái bảng mới"""
+        """
+        Cập nhật giao diện với trạng thái bảng mới. Chỉ những ô có giá trị, màu hoặc trạng thái
+        khác lần vẽ trước mới được gửi tới Tk, gom trong một callback after_idle.
+
+        Args:
+            board: Bảng Sudoku 2D cần hiển thị
+            original_cells: Tập các ô đề bài (chỉ đọc)
+        """
         self.original_cells = original_cells
 
         for i in range(self.grid_size):
             for j in range(self.grid_size):
-                cell = self.cells[i][j]
                 value = board[i][j]
-
-                if value == 0:
-                    self.cell_vars[i][j].set("")
-                    cell.config(bg="white", state="normal")
+                if value != 0 and (i, j) in original_cells:
+                    self._queue_cell(i, j, text=self._format_value(value), bg=self.original_cell_color,
+                                     state="readonly")
                 else:
-                    if self.grid_size == 16 and value > 9:
-                        self.cell_vars[i][j].set(chr(ord('A') + value - 10))
-                    else:
-                        self.cell_vars[i][j].set(str(value))
+                    self._queue_cell(i, j, text=self._format_value(value), bg="white", state="normal")
 
-                    if (i, j) in original_cells:
-                        cell.config(bg=self.original_cell_color, state="readonly")
-                    else:
-                        cell.config(bg="white", state="normal")
+    def set_cell_value(self, row, col, value):
+        """Hiển thị giá trị 'value' tại ô (row, col) (0 là ô trống)"""
+        self._queue_cell(row, col, text=self._format_value(value))
 
     def highlight_cell(self, row, col, color):
         """Tô sáng một ô cụ thể với màu cho trước"""
         if row < self.grid_size and col < self.grid_size:
-            self.cells[row][col].config(bg=color)
+            self._queue_cell(row, col, bg=color)
+
+    def _format_value(self, value):
+        """Chuỗi hiển thị của một giá trị ô: rỗng cho 0, chữ cái từ 10 trở lên với lưới 16x16"""
+        if value == 0:
+            return ""
+        if self.grid_size == 16 and value > 9:
+            return chr(ord('A') + value - 10)
+        return str(value)
+
+    def _queue_cell(self, row, col, **changes):
+        """Ghi nhận thay đổi của một ô và hẹn vẽ tất cả thay đổi trong lần idle kế tiếp"""
+        self._pending.setdefault((row, col), {}).update(changes)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.master.after_idle(self._flush_cells)
+
+    def _flush_cells(self):
+        """Đẩy các ô thay đổi so với lần vẽ trước tới Tk và đếm số lệnh cập nhật widget"""
+        self._flush_scheduled = False
+        pending, self._pending = self._pending, {}
+        updates = 0
+
+        for (row, col), changes in pending.items():
+            rendered = self._rendered[row][col]
+            text = changes.pop('text', None)
+            if text is not None and rendered.get('text') != text:
+                self.cell_vars[row][col].set(text)
+                rendered['text'] = text
+                updates += 1
+
+            options = {key: value for key, value in changes.items() if rendered.get(key) != value}
+            if options:
+                self.cells[row][col].config(**options)
+                rendered.update(options)
+                updates += 1
+
+        self.frame_widget_updates = updates
+        self.total_widget_updates += updates
+
+    def _set_typed_text(self, row, col, text):
+        """Đặt ngay nội dung ô người dùng vừa gõ và đồng bộ trạng thái đã vẽ"""
+        self.cell_vars[row][col].set(text)
+        self._rendered[row][col]['text'] = text
 
     def update_lives_display(self, lives):
         """Cập nhật hiển thị mạng"""
@@ -599,6 +663,16 @@ class GameScreen:
         self.master.after(3000, lambda: self.status_var.set("Sẵn sàng. Bắt đầu điền số vào các ô trống."))
         self.master.after(3000, lambda: self.status_label.config(fg=self.fg_color))
 
+    def show_progress(self, message):
+        """Hiển thị tiến độ trên thanh trạng thái (không tự xóa sau vài giây như update_status)"""
+        self.status_var.set(message)
+        self.status_label.config(fg=self.fg_color)
+
+    def set_solving(self, active):
+        """Bật/tắt trạng thái đang giải: khóa nút Giải và mở nút Hủy trong lúc thuật toán chạy"""
+        self.solve_btn.config(state="disabled" if active else "normal")
+        self.cancel_btn.config(state="normal" if active else "disabled")
+
     def _on_cell_focus(self, position):
         """Xử lý khi ô được focus"""
         if not hasattr(self, 'controller'):
@@ -626,6 +700,8 @@ class GameScreen:
                 return
 
             value = self.cell_vars[row][col].get()
+            # Người dùng sửa StringVar trực tiếp nên trạng thái đã vẽ phải theo kịp
+            self._rendered[row][col]['text'] = value
 
             if not value and event.keysym in ('BackSpace', 'Delete'):
                 self.controller.clear_cell(row, col)
@@ -633,7 +709,7 @@ class GameScreen:
 
             if self.grid_size == 16 and value.upper() in "ABCDEFG":
                 num_val = ord(value.upper()) - ord('A') + 10
-                self.cell_vars[row][col].set(value.upper())
+                self._set_typed_text(row, col, value.upper())
                 self.controller.make_move(row, col, num_val)
                 return
 
@@ -644,7 +720,7 @@ class GameScreen:
             max_value = self.grid_size
             if int(value) > max_value:
                 value = value[-1]
-                self.cell_vars[row][col].set(value)
+                self._set_typed_text(row, col, value)
 
             self.controller.make_move(row, col, int(value))
 
@@ -667,6 +743,11 @@ class GameScreen:
 
         self.controller.solve_with_algorithm(algorithm)
 
+    def _on_cancel_solve(self):
+        """Xử lý khi người dùng nhấn nút hủy"""
+        if hasattr(self, 'controller'):
+            self.controller.cancel_solving()
+
     def _on_clear(self):
         """Xử lý khi người dùng nhấn nút xóa"""
         if hasattr(self, 'controller'):
@@ -715,13 +796,26 @@ class GameScreen:
         metrics_table.insert("", "end", values=("Giá trị heuristic h(n)", f"{metrics['h_value']}"))
         metrics_table.insert("", "end", values=("Số bước thực hiện g(n)", f"{metrics['g_value']}"))
         metrics_table.insert("", "end", values=("Tổng chi phí f(n) = g(n) + h(n)", f"{metrics['f_value']}"))
+        if 'peak_memory_bytes' in metrics:
+            metrics_table.configure(height=10)
+            metrics_table.insert("", "end", values=("Bộ nhớ đỉnh (KB)", f"{metrics['peak_memory_bytes'] / 1024:,.1f}"))
+            metrics_table.insert("", "end", values=("Số khối được cấp phát thêm", f"{metrics['allocated_blocks']:,}"))
+            metrics_table.insert("", "end", values=("Số lần GC", f"{metrics['gc_collections']}"))
+            metrics_table.insert("", "end", values=("Thời gian dừng do GC (giây)", f"{metrics['gc_pause_time']:.6f}"))
+        if metrics.get('cache_hit'):
+            metrics_table.configure(height=7)
+            metrics_table.insert("", "end", values=("Lấy từ bộ nhớ đệm (giây)", f"{metrics['lookup_time']:.6f}"))
 
         metrics_table.pack(fill="x", padx=10, pady=10)
 
         chart_frame = Frame(info_frame, bg=self.bg_color)
         chart_frame.pack(fill="both", expand=True, pady=10)
 
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10, 4))
+        section_times = metrics.get('section_times')
+        if section_times:
+            fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(15, 4))
+        else:
+            fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10, 4))
 
         ax1.bar(['Thời gian (s)'], [metrics['execution_time']], color='#3498DB')
         ax1.set_title('Thời gian thực thi')
@@ -733,6 +827,13 @@ class GameScreen:
         ax2.set_title('Không gian trạng thái')
         ax2.set_ylabel('Số lượng')
 
+        if section_times:
+            labels = {'candidates': 'Sinh ứng viên', 'heuristic': 'Heuristic', 'frontier': 'Biên', 'other': 'Khác'}
+            ax3.bar([labels.get(name, name) for name in section_times], list(section_times.values()),
+                    color=['#1ABC9C', '#F1C40F', '#E74C3C', '#95A5A6'])
+            ax3.set_title('Thời gian theo nhóm hàm (có profile)')
+            ax3.set_ylabel('Giây')
+
         canvas = FigureCanvasTkAgg(fig, master=chart_frame)
         canvas.draw()
         canvas.get_tk_widget().pack(fill="both", expand=True)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Các module trong app/ dùng import phẳng (from solve import ...), giống khi chạy app/main.py
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
@@ -0,0 +1,55 @@
+import json
+
+import pytest
+
+from batch import BatchStats, main, solve_parallel
+from puzzle_format import format_puzzle, parse_puzzle
+from test_solve import is_valid_solution, make_puzzle
+
+
+@pytest.mark.parametrize("grid_size", [9, 16, 25])
+def test_puzzle_format_round_trip(grid_size):
+    board, _ = make_puzzle(grid_size, grid_size * 2, 0)
+    text = format_puzzle(board)
+    assert len(text) == grid_size * grid_size
+    assert parse_puzzle(text) == (board, grid_size)
+    assert parse_puzzle(text.replace('.', '0'))[0] == board
+
+
+def test_parse_puzzle_rejects_bad_input():
+    with pytest.raises(ValueError):
+        parse_puzzle("123")
+    with pytest.raises(ValueError):
+        parse_puzzle("A" * 81)
+
+
+def test_batch_cli_streams_jsonl(tmp_path):
+    puzzles = [make_puzzle(9, 45, seed)[0] for seed in range(3)] + [make_puzzle(16, 100, 0)[0]]
+    source = tmp_path / "puzzles.txt"
+    source.write_text("# comment\n" + "\n".join(format_puzzle(board) + ",extra" for board in puzzles) + "\nbad\n")
+    target = tmp_path / "out.jsonl"
+
+    assert main([str(source), "-o", str(target), "-a", "DLX"]) == 1
+    records = [json.loads(line) for line in target.read_text().splitlines()]
+    assert [record["index"] for record in records] == [0, 1, 2, 3, 4]
+    assert "error" in records[-1]
+    for board, record in zip(puzzles, records):
+        assert record["solved"]
+        solution, _ = parse_puzzle(record["solution"])
+        assert is_valid_solution(solution, board)
+
+    assert main([str(source), "-o", str(target), "--limit", "2", "-a", "A*", "--option", "heuristic=candidates"]) == 0
+    assert len(target.read_text().splitlines()) == 2
+
+
+def test_solve_parallel_preserves_input_order():
+    puzzles = [(index, format_puzzle(make_puzzle(9, 40 + index % 20, index)[0])) for index in range(40)]
+    puzzles.insert(7, (99, "bad"))
+    stats = BatchStats()
+    records = list(solve_parallel(puzzles, "Propagation", workers=2, chunk_size=3, stats=stats))
+    assert [record["index"] for record in records] == [index for index, _ in puzzles]
+    assert all(record["solved"] for record in records if record["index"] != 99)
+    assert stats.puzzles == len(puzzles)
+    assert stats.chunks == 14
+    assert stats.throughput > 0
+    assert all(0 <= value <= 1.5 for value in stats.utilization.values())
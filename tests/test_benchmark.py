@@ -0,0 +1,50 @@
+import json
+
+from benchmark import build_corpus, compare, main, percentile, run_benchmark, run_once
+
+
+def test_corpus_is_reproducible():
+    first = build_corpus(seed=4, count=2, sizes=(9,), difficulties=("easy", "expert"))
+    second = build_corpus(seed=4, count=2, sizes=(9,), difficulties=("easy", "expert"))
+    assert first == second
+    assert [(size, difficulty) for size, difficulty, _ in first] == [(9, "easy")] * 2 + [(9, "expert")] * 2
+
+
+def test_run_once_stops_at_timeout():
+    corpus = build_corpus(seed=1, count=1, sizes=(16,), difficulties=("expert",))
+    run = run_once("DFS", corpus[0][2], 16, timeout=0.05)
+    assert run['timed_out'] and not run['solved']
+    assert run['time'] <= 0.05
+
+
+def test_results_summary_and_regression_diff():
+    corpus = build_corpus(seed=2, count=2, sizes=(9,), difficulties=("medium",))
+    results = run_benchmark(corpus, ("DLX", "Propagation"), timeout=5)
+    summary = results["DLX"]["9:medium"]
+    assert summary['runs'] == summary['solved'] == 2 and summary['timeouts'] == 0
+    assert summary['peak_memory'] > 0 and summary['median_states'] > 0
+
+    _, regressions = compare(results, results)
+    assert regressions == []
+    slower = json.loads(json.dumps(results))
+    slower["DLX"]["9:medium"]['median_time'] = results["DLX"]["9:medium"]['median_time'] + 1
+    _, regressions = compare(slower, results)
+    assert len(regressions) == 1 and "DLX" in regressions[0]
+
+
+def test_percentile_nearest_rank():
+    assert percentile([5, 1, 3, 2, 4], 0.95) == 5
+    assert percentile(list(range(1, 101)), 0.95) == 95
+
+
+def test_cli_writes_results_and_fails_on_regression(tmp_path):
+    output = tmp_path / "results.json"
+    args = ["--sizes", "9", "--count", "1", "--difficulties", "easy", "-a", "DLX", "--no-memory"]
+    assert main(args + ["-o", str(output)]) == 0
+    report = json.loads(output.read_text())
+    assert report['meta']['seed'] == 0 and "DLX" in report['results']
+
+    report['results']["DLX"]["9:easy"]['solved'] += 1
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(report))
+    assert main(args + ["-o", str(output), "--baseline", str(baseline)]) == 1
@@ -0,0 +1,50 @@
+import random
+
+import numpy as np
+import pytest
+
+from board import NumpyBoard, count_conflicts_batch, is_solved_batch, is_valid_batch
+from solve import get_solver
+from test_solve import make_puzzle, random_board
+
+
+def python_conflicts(board):
+    """Đếm xung đột bằng vòng lặp thuần Python để đối chiếu."""
+    n = len(board)
+    box = int(n ** 0.5)
+    units = [list(row) for row in board] + [list(col) for col in zip(*board)]
+    units += [[board[r][c] for r in range(br, br + box) for c in range(bc, bc + box)]
+              for br in range(0, n, box) for bc in range(0, n, box)]
+    return sum(unit.count(v) - 1 for unit in units for v in set(unit) if v and unit.count(v) > 1)
+
+
+def test_count_conflicts_matches_python_reference():
+    rng = random.Random(3)
+    boards = [random_board(rng, rng.randint(17, 60)) for _ in range(200)]
+    expected = [python_conflicts(board) for board in boards]
+    assert count_conflicts_batch(boards).tolist() == expected
+    assert [NumpyBoard(board).count_conflicts() for board in boards] == expected
+    assert is_valid_batch(boards).tolist() == [count == 0 for count in expected]
+
+
+@pytest.mark.parametrize("grid_size", [9, 16, 25])
+def test_solved_boards_are_detected(grid_size):
+    board, solution = make_puzzle(grid_size, grid_size, 0)
+    stack = np.array([solution, board, solution], dtype=np.uint8)
+    stack[2, 0, 0], stack[2, 0, 1] = stack[2, 0, 1], stack[2, 0, 0]
+    assert is_solved_batch(stack).tolist() == [True, False, False]
+    assert NumpyBoard(solution).is_solved()
+    assert NumpyBoard(board).is_valid() and not NumpyBoard(board).is_complete()
+
+
+def test_solver_conflicts_use_numpy_board():
+    board, _ = make_puzzle(9, 30, 1)
+    board[0][0] = board[0][1] = board[0][2] or 1
+    assert get_solver("DFS", board, 9).count_conflicts() == python_conflicts(board)
+
+
+def test_invalid_shapes_are_rejected():
+    with pytest.raises(ValueError):
+        NumpyBoard([[1, 2, 3]])
+    with pytest.raises(ValueError):
+        count_conflicts_batch(np.zeros((2, 8, 8), dtype=np.uint8))
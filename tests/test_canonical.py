@@ -0,0 +1,70 @@
+import random
+
+import pytest
+
+from canonical import SolutionCache, canonical_form
+from model import SudokuModel
+from test_solve import is_valid_solution, make_puzzle
+
+
+def shuffle_symmetry(board, rng):
+    """Biến đổi ngẫu nhiên giữ tính hợp lệ: hoán vị dải/hàng/cột, đổi nhãn chữ số, chuyển vị."""
+    n = len(board)
+    base = int(n ** 0.5)
+    rows = [g * base + r for g in rng.sample(range(base), base) for r in rng.sample(range(base), base)]
+    cols = [g * base + c for g in rng.sample(range(base), base) for c in rng.sample(range(base), base)]
+    nums = [0] + rng.sample(range(1, n + 1), n)
+    result = [[nums[board[r][c]] for c in cols] for r in rows]
+    if rng.random() < 0.5:
+        result = [list(column) for column in zip(*result)]
+    return result
+
+
+@pytest.mark.parametrize("grid_size,empties", [(9, 30), (9, 55), (16, 150)])
+def test_equivalent_puzzles_share_key_and_solutions_map_back(grid_size, empties):
+    rng = random.Random(grid_size)
+    for seed in range(5):
+        board, solution = make_puzzle(grid_size, empties, seed)
+        key, transform = canonical_form(board, grid_size)
+        assert transform.invert(transform.apply(board)) == board
+        canonical_solution = transform.apply(solution)
+        for _ in range(3):
+            variant = shuffle_symmetry(board, rng)
+            variant_key, variant_transform = canonical_form(variant, grid_size)
+            assert variant_key == key
+            assert is_valid_solution(variant_transform.invert(canonical_solution), variant)
+
+
+def test_different_puzzles_get_different_keys():
+    keys = {canonical_form(make_puzzle(9, 45, seed)[0])[0] for seed in range(10)}
+    assert len(keys) == 10
+
+
+def test_lru_cache_counts_hits_misses_and_evictions():
+    cache = SolutionCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("c") == 3 and len(cache) == 2
+    assert cache.stats() == {'hits': 2, 'misses': 1, 'evictions': 1, 'size': 2, 'maxsize': 2}
+    with pytest.raises(ValueError):
+        SolutionCache(maxsize=0)
+
+
+def test_model_reuses_solution_of_equivalent_puzzle():
+    cache = SolutionCache()
+    model = SudokuModel(grid_size=9, solution_cache=cache)
+    model.board, _ = make_puzzle(9, 50, 3)
+    solution, metrics = model.solve_with_algorithm("DLX")
+    assert solution is not None and metrics['cache_hit'] is False
+
+    model.board = shuffle_symmetry(model.board, random.Random(0))
+    solution, metrics = model.solve_with_algorithm("DLX")
+    assert metrics['cache_hit'] is True and metrics['is_solved']
+    assert is_valid_solution(solution, model.board)
+    assert cache.stats()['hits'] == 1
+
+    _, metrics = model.solve_with_algorithm("BackTracking")
+    assert metrics['cache_hit'] is False
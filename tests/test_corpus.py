@@ -0,0 +1,76 @@
+import json
+
+import numpy as np
+import pytest
+
+from batch import main as batch_main
+from corpus import CorpusReader, CorpusWriter, corpus_to_text, generate_corpus, main, text_to_corpus
+from puzzle_format import format_puzzle, parse_puzzle
+from test_solve import is_valid_solution, make_puzzle
+
+
+@pytest.mark.parametrize("grid_size,record_size", [(9, 52 + 41), (16, 160 + 128)])
+def test_round_trip_with_solutions(tmp_path, grid_size, record_size):
+    path = str(tmp_path / "corpus.sdkc")
+    puzzles = [make_puzzle(grid_size, grid_size * 4, seed) for seed in range(5)]
+    with CorpusWriter(path, grid_size, with_solutions=True) as writer:
+        for board, solution in puzzles:
+            writer.append(board, solution)
+    assert (tmp_path / "corpus.sdkc").stat().st_size == 16 + 5 * record_size
+
+    with CorpusReader(path) as reader:
+        assert len(reader) == 5 and reader.record_size == record_size
+        assert list(reader.records()) == puzzles
+        assert reader[-1] == puzzles[-1][0]
+        with pytest.raises(IndexError):
+            reader[5]
+
+        boards = reader.boards_array(1, 4)
+        assert boards.shape == (3, grid_size, grid_size)
+        assert boards.tolist() == [board for board, _ in puzzles[1:4]]
+        assert reader.boards_array(solutions=True).tolist() == [solution for _, solution in puzzles]
+        view = reader.packed_view()
+        assert view.shape == (5, record_size) and not view.flags.owndata and not view.flags.writeable
+    # Mảng còn sống sau khi đóng: vùng ánh xạ chỉ được giải phóng khi mảng bị hủy
+    assert view[1].tobytes() == (tmp_path / "corpus.sdkc").read_bytes()[16 + record_size:16 + 2 * record_size]
+
+
+def test_text_conversion_and_invalid_files(tmp_path):
+    puzzles = [make_puzzle(9, 45, seed) for seed in range(3)]
+    text = tmp_path / "puzzles.txt"
+    text.write_text("# comment\n" + "".join(f"{format_puzzle(b)},{format_puzzle(s)}\n" for b, s in puzzles))
+    binary = str(tmp_path / "puzzles.sdkc")
+
+    assert main(["pack", str(text), binary, "--solutions"]) == 0
+    output = tmp_path / "out.txt"
+    assert main(["unpack", binary, str(output)]) == 0
+    assert output.read_text() == "".join(f"{format_puzzle(b)},{format_puzzle(s)}\n" for b, s in puzzles)
+
+    with open(text) as source:
+        assert text_to_corpus(source, binary) == 3
+    with CorpusReader(binary) as reader:
+        assert not reader.with_solutions and reader.solution(0) is None
+        assert np.array_equal(reader.boards_array(), np.array([board for board, _ in puzzles]))
+
+    with pytest.raises(ValueError):
+        CorpusReader(str(text))
+    with pytest.raises(ValueError):
+        CorpusWriter(str(tmp_path / "big.sdkc"), 25)
+    with pytest.raises(ValueError):
+        text_to_corpus([format_puzzle(puzzles[0][0]), format_puzzle(make_puzzle(16, 50)[0])], binary)
+
+
+def test_batch_streams_binary_corpus(tmp_path):
+    path = str(tmp_path / "generated.sdkc")
+    assert generate_corpus(path, 9, "easy", 3) == 3
+    target = tmp_path / "out.jsonl"
+    assert batch_main([path, "-o", str(target), "-a", "DLX"]) == 0
+    records = [json.loads(line) for line in target.read_text().splitlines()]
+    with CorpusReader(path) as reader:
+        assert [record["puzzle"] for record in records] == [format_puzzle(board) for board in reader]
+        for (board, solution), record in zip(reader.records(), records):
+            assert parse_puzzle(record["solution"])[0] == solution
+            assert is_valid_solution(solution, board)
+
+    with open(tmp_path / "out.txt", "w") as target_text:
+        assert corpus_to_text(path, target_text) == 3
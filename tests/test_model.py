@@ -0,0 +1,87 @@
+import random
+import time
+
+import pytest
+
+from board import NumpyBoard
+from model import SudokuModel
+from rating import rate_puzzle
+from test_solve import make_puzzle
+
+
+def test_count_solutions_detects_multiple_solutions():
+    _, solution = make_puzzle(9, 0, 0)
+    model = SudokuModel(grid_size=9)
+    assert model.count_solutions(solution) == 1
+    empty = [[0] * 9 for _ in range(9)]
+    assert model.count_solutions(empty, limit=5) == 5
+
+
+@pytest.mark.parametrize("grid_size, difficulty", [(9, "expert"), (16, "medium"), (16, "expert")])
+def test_generated_puzzles_are_unique(grid_size, difficulty):
+    random.seed(grid_size)
+    model = SudokuModel(difficulty, grid_size=grid_size)
+
+    assert model.count_solutions() == 1
+    assert all(value in (0, model.solution[i][j])
+               for i, row in enumerate(model.board) for j, value in enumerate(row))
+    low, _ = (model.DIFFICULTY_LEVELS if grid_size == 9 else model.DIFFICULTY_LEVELS_16X16)["medium"]
+    assert sum(row.count(0) for row in model.board) >= low
+
+
+def test_remove_cells_keeps_only_unique_removals():
+    random.seed(1)
+    _, solution = make_puzzle(16, 0, 1)
+    model = SudokuModel.__new__(SudokuModel)
+    model.grid_size = 16
+    start = time.perf_counter()
+    board = model._remove_cells(solution, 256)
+    assert time.perf_counter() - start < 2
+    assert 0 < sum(row.count(0) for row in board) < 256
+    assert model.count_solutions(board) == 1
+
+
+@pytest.mark.parametrize("base", [3, 4, 5])
+def test_generate_solution_builds_valid_random_grids(base):
+    random.seed(base)
+    grids = [SudokuModel._generate_solution(base) for _ in range(20)]
+    assert all(len(grid) == base * base and NumpyBoard(grid).is_solved() for grid in grids)
+    assert len({str(grid) for grid in grids}) == len(grids)
+
+
+def test_generated_puzzle_rating_matches_target_band():
+    random.seed(7)
+    for difficulty, (low, high) in SudokuModel.DIFFICULTY_SCORES.items():
+        model = SudokuModel(difficulty, grid_size=9)
+        assert model.rating['solved']
+        assert low <= model.rating['score'] <= high
+        assert model.rating == rate_puzzle(model.board, 9)
+
+
+def test_incremental_tracking_matches_full_rescan():
+    model = SudokuModel(grid_size=9, difficulty="easy")
+    model.board, model.solution = make_puzzle(9, 40, 3)
+    rng = random.Random(0)
+    for _ in range(300):
+        row, col, num = rng.randrange(9), rng.randrange(9), rng.randint(0, 9)
+        model.set_cell(row, col, num)
+        empties = {(i, j) for i in range(9) for j in range(9) if model.board[i][j] == 0}
+        assert set(model._empty_cells) == empties and model.filled_count == 81 - len(empties)
+        assert model.is_solved() == NumpyBoard(model.board).is_solved()
+        for value in range(1, 10):
+            box = [model.board[i][j] for i in range(row // 3 * 3, row // 3 * 3 + 3)
+                   for j in range(col // 3 * 3, col // 3 * 3 + 3)]
+            expected = (model.board[row][col] == 0 and value not in model.board[row]
+                        and value not in [r[col] for r in model.board] and value not in box)
+            assert model.is_valid_move(row, col, value) == expected
+
+
+def test_hints_fill_board_until_solved():
+    model = SudokuModel(grid_size=9, difficulty="easy")
+    model.board, model.solution = make_puzzle(9, 30, 5)
+    while (hint := model.get_hint()) is not None:
+        assert not model.is_solved()
+        model.set_cell(*hint)
+    assert model.is_solved() and model.board == model.solution
+    model.clear_cell(4, 4)
+    assert not model.is_solved() and model.get_hint() == (4, 4, model.solution[4][4])
@@ -0,0 +1,84 @@
+import json
+import threading
+import time
+
+from model import SudokuModel
+from puzzle_format import format_puzzle
+from puzzle_pool import PuzzlePool
+from test_solve import make_puzzle
+
+
+def fake_generator(calls):
+    """Tạo câu đố 9x9 nhanh và ghi lại các cặp được yêu cầu."""
+    def generate(grid_size, difficulty):
+        calls.append((grid_size, difficulty))
+        board, solution = make_puzzle(grid_size, 30, len(calls))
+        return board, solution, {'score': len(calls)}
+    return generate
+
+
+def test_refill_and_pop_in_order():
+    calls = []
+    pool = PuzzlePool(depth=2, keys=[(9, "easy"), (9, "expert")], generator=fake_generator(calls))
+    pool.refill()
+    assert pool.size(9, "easy") == pool.size(9, "expert") == 2
+    assert len(calls) == 4
+
+    assert pool.pop(9, "easy") == (*make_puzzle(9, 30, 1), {'score': 1})
+    assert pool.size(9, "easy") == 1
+    assert pool.pop(16, "easy") is None
+
+
+def test_background_worker_tops_up_after_pop(tmp_path):
+    calls = []
+    filled = threading.Event()
+
+    def generate(grid_size, difficulty):
+        result = fake_generator(calls)(grid_size, difficulty)
+        if len(calls) >= 2:
+            filled.set()
+        return result
+
+    pool = PuzzlePool(str(tmp_path / "pool.json"), depth=1, keys=[(9, "medium")], generator=generate)
+    pool.start()
+    try:
+        while pool.size(9, "medium") < 1:
+            time.sleep(0.01)
+        assert pool.pop(9, "medium") is not None
+        assert filled.wait(5)
+    finally:
+        pool.stop(timeout=5)
+    assert pool.size(9, "medium") == 1
+    assert PuzzlePool(str(tmp_path / "pool.json"), keys=[]).size(9, "medium") == 1
+
+
+def test_pool_persists_between_runs(tmp_path):
+    path = str(tmp_path / "pool.json")
+    pool = PuzzlePool(path, depth=2, keys=[(9, "medium")], generator=fake_generator([]))
+    pool.refill()
+    pool.save()
+    expected = pool.pop(9, "medium")
+
+    reloaded = PuzzlePool(path, depth=2, keys=[], generator=fake_generator([]))
+    assert reloaded.size(9, "medium") == 2
+    assert reloaded.pop(9, "medium") == expected
+
+
+def test_corrupt_pool_file_is_ignored(tmp_path):
+    path = tmp_path / "pool.json"
+    path.write_text('{"9:medium": [["123", "456"]], "x": 1')
+    assert PuzzlePool(str(path), keys=[]).size(9, "medium") == 0
+    puzzle, answer = (format_puzzle(board) for board in make_puzzle(9, 30, 1))
+    entries = [[puzzle, answer], [puzzle, answer, {"score": 1}], [1, 2, 3], [puzzle[:-1], answer, {"score": 1}]]
+    path.write_text(json.dumps({"9:medium": entries}))
+    assert PuzzlePool(str(path), keys=[]).size(9, "medium") == 1
+
+
+def test_model_uses_pool_before_generating():
+    board, solution = make_puzzle(9, 30, 5)
+    pool = PuzzlePool(depth=0, keys=[])
+    pool.push(9, "medium", board, solution, {'score': 42})
+    model = SudokuModel("medium", grid_size=9, pool=pool)
+    assert model.board == board and model.solution == solution and model.rating == {'score': 42}
+    model.generate_puzzle("medium")
+    assert model.count_solutions() == 1
@@ -0,0 +1,88 @@
+import json
+import random
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from batch import main
+from canonical import canonical_form
+from model import SudokuModel
+from puzzle_format import format_puzzle, parse_puzzle
+from solution_store import SolutionStore
+from test_canonical import shuffle_symmetry
+from test_solve import is_valid_solution, make_puzzle
+
+
+def canonical_entry(seed, grid_size=9):
+    board, solution = make_puzzle(grid_size, 40, seed)
+    key, transform = canonical_form(board, grid_size)
+    return grid_size, key, transform.apply(solution), {'states_explored': seed}
+
+
+def write_entries(path, seeds):
+    store = SolutionStore(path)
+    for seed in seeds:
+        store.put("DLX", *canonical_entry(seed))
+    store.close()
+
+
+def test_put_get_bulk_and_prune(tmp_path):
+    store = SolutionStore(str(tmp_path / "solutions.sqlite3"))
+    entries = [canonical_entry(seed) for seed in range(5)] + [canonical_entry(0, 16)]
+    store.put_many("DLX", entries)
+    assert len(store) == 6
+
+    grid_size, key, solution, metrics = entries[2]
+    assert store.get("DLX", grid_size, key) == (solution, metrics)
+    assert store.get("BFS", grid_size, key) is None
+
+    found = store.get_many("DLX", [(size, key) for size, key, _, _ in entries] + [(9, b"\0" * 81)])
+    assert found == {(size, key): (solution, metrics) for size, key, solution, metrics in entries}
+
+    assert store.prune(2) == 4
+    assert len(store) == 2 and store.get("DLX", *entries[-1][:2]) is not None
+
+
+def test_store_is_shared_across_threads_and_processes(tmp_path):
+    path = str(tmp_path / "solutions.sqlite3")
+    SolutionStore(path).close()
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        list(executor.map(write_entries, [path, path], [range(10, 15), range(15, 20)]))
+    threads = [threading.Thread(target=write_entries, args=(path, range(i * 5, i * 5 + 5))) for i in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(SolutionStore(path)) == 20
+
+
+def test_model_reads_solution_saved_by_another_game(tmp_path):
+    path = str(tmp_path / "solutions.sqlite3")
+    first = SudokuModel(grid_size=9, solution_store=SolutionStore(path))
+    first.board, _ = make_puzzle(9, 50, 4)
+    _, metrics = first.solve_with_algorithm("Propagation")
+    assert metrics['cache_hit'] is False
+
+    second = SudokuModel(grid_size=9, solution_store=SolutionStore(path))
+    second.board = shuffle_symmetry(first.board, random.Random(1))
+    solution, metrics = second.solve_with_algorithm("Propagation")
+    assert metrics['cache_hit'] is True
+    assert is_valid_solution(solution, second.board)
+
+
+def test_batch_reuses_store_between_runs(tmp_path):
+    puzzles = [make_puzzle(9, 45, seed)[0] for seed in range(6)]
+    source = tmp_path / "puzzles.txt"
+    source.write_text("\n".join(format_puzzle(board) for board in puzzles) + "\nbad\n")
+    target = tmp_path / "out.jsonl"
+    store = str(tmp_path / "solutions.sqlite3")
+
+    main([str(source), "-o", str(target), "--limit", "3", "--store", store])
+    main([str(source), "-o", str(target), "--store", store, "--workers", "2", "--chunk-size", "2"])
+    records = [json.loads(line) for line in target.read_text().splitlines()]
+    assert [record.get("cached") for record in records] == [True] * 3 + [False] * 3 + [None]
+    for board, record in zip(puzzles, records):
+        assert is_valid_solution(parse_puzzle(record["solution"])[0], board)
+
+    main([str(source), "-o", str(target), "--store", store, "--store-max-entries", "4"])
+    assert all(json.loads(line).get("cached", True) for line in target.read_text().splitlines())
+    assert len(SolutionStore(store)) == 4
@@ -0,0 +1,337 @@
+import random
+import threading
+import time
+
+import pytest
+
+from solve import (BOARD_BACKENDS, SOLVERS, BitboardState, DLXSolver, PropagationSolver, SearchCancelled,
+                   SimulatedAnnealingSolver, SMAStarSolver, SudokuSolver, get_solver)
+
+
+def make_puzzle(grid_size=9, empties=45, seed=0):
+    """Câu đố từ một lời giải dạng mẫu đã xáo trộn, xóa ngẫu nhiên 'empties' ô."""
+    rng = random.Random(seed)
+    base = int(grid_size ** 0.5)
+    rows = [g * base + r for g in rng.sample(range(base), base) for r in rng.sample(range(base), base)]
+    cols = [g * base + c for g in rng.sample(range(base), base) for c in rng.sample(range(base), base)]
+    nums = rng.sample(range(1, grid_size + 1), grid_size)
+    solution = [[nums[(base * (r % base) + r // base + c) % grid_size] for c in cols] for r in rows]
+    board = [row[:] for row in solution]
+    for i, j in rng.sample([(i, j) for i in range(grid_size) for j in range(grid_size)], empties):
+        board[i][j] = 0
+    return board, solution
+
+
+def is_valid_solution(solution, board):
+    n = len(board)
+    box = int(n ** 0.5)
+    digits = list(range(1, n + 1))
+    for i in range(n):
+        if sorted(solution[i]) != digits or sorted(row[i] for row in solution) != digits:
+            return False
+    for box_row in range(0, n, box):
+        for box_col in range(0, n, box):
+            cells = [solution[r][c] for r in range(box_row, box_row + box) for c in range(box_col, box_col + box)]
+            if sorted(cells) != digits:
+                return False
+    return all(board[i][j] in (0, solution[i][j]) for i in range(n) for j in range(n))
+
+
+def random_board(rng, clues):
+    """Bảng 9x9 ngẫu nhiên: giữ 'clues' ô của một lời giải và làm sai lệch một vài ô."""
+    board, _ = make_puzzle(9, 81 - clues, rng.random())
+    for _ in range(rng.randint(0, 2)):
+        i, j = rng.randrange(9), rng.randrange(9)
+        if board[i][j]:
+            board[i][j] = rng.randint(1, 9)
+    return board
+
+
+@pytest.mark.parametrize("grid_size,empties", [(9, 30), (9, 64), (16, 150)])
+def test_propagation_solves_generated_puzzles(grid_size, empties):
+    for seed in range(3):
+        board, _ = make_puzzle(grid_size, empties, seed)
+        solver = get_solver("Propagation", board, grid_size)
+        assert solver.solve()
+        assert is_valid_solution(solver.solution, board)
+
+
+def test_propagation_agrees_with_dlx_on_random_boards():
+    rng = random.Random(7)
+    for _ in range(150):
+        board = random_board(rng, rng.randint(17, 40))
+        solvable = DLXSolver(board, 9).count_solutions(1) == 1
+        solver = PropagationSolver(board, 9)
+        assert solver.solve() == solvable
+        if solvable:
+            assert is_valid_solution(solver.solution, board)
+
+
+def test_propagation_reports_eliminations_per_rule():
+    board, _ = make_puzzle(9, 60, 1)
+    solver = get_solver("Propagation", board, 9)
+    solver.solve()
+    metrics = solver.get_performance_metrics()
+    assert set(metrics["eliminations"]) == set(PropagationSolver.RULES)
+    assert metrics["eliminations"]["naked_single"] > 0
+    assert metrics["branch_points"] >= 0
+
+
+def matrix_snapshot(matrix):
+    return (matrix.L[:], matrix.R[:], matrix.U[:], matrix.D[:], matrix.S[:])
+
+
+def test_dlx_solves_9x9_16x16_and_25x25():
+    for grid_size, empties in ((9, 60), (16, 170), (25, 300)):
+        board, _ = make_puzzle(grid_size, empties, 3)
+        solver = get_solver("DLX", board, grid_size)
+        assert solver.solve()
+        assert is_valid_solution(solver.solution, board)
+
+
+def test_dlx_count_solutions_unique_multiple_and_none():
+    solution = make_puzzle(9, 0, 4)[1]
+    unique = [row[:] for row in solution]
+    unique[0][0] = 0
+    assert DLXSolver(unique, 9).count_solutions(2) == 1
+
+    assert DLXSolver([[0] * 9 for _ in range(9)], 9).count_solutions(2) == 2
+    assert DLXSolver([[0] * 9 for _ in range(9)], 9).count_solutions(5) == 5
+
+    # Hai ô trong cùng hàng trùng giá trị: không có lời giải
+    conflicting = [[0] * 9 for _ in range(9)]
+    conflicting[0][0] = conflicting[0][5] = 3
+    assert DLXSolver(conflicting, 9).count_solutions(2) == 0
+
+    # Không trùng giá trị nhưng ô (0, 8) không còn ứng viên nào
+    dead_end = [[1, 2, 3, 4, 5, 6, 7, 8, 0]] + [[0] * 9 for _ in range(8)]
+    dead_end[1][8] = 9
+    assert DLXSolver(dead_end, 9).count_solutions(2) == 0
+    assert not get_solver("DLX", dead_end, 9).solve()
+
+
+def test_dlx_matrix_is_restored_after_each_run():
+    board, _ = make_puzzle(9, 55, 5)
+    DLXSolver(board, 9).count_solutions(1)
+    matrix = DLXSolver(board, 9).matrix
+    before = matrix_snapshot(matrix)
+
+    DLXSolver(board, 9).solve()
+    DLXSolver([[0] * 9 for _ in range(9)], 9).count_solutions(3)
+    conflicting = [[0] * 9 for _ in range(9)]
+    conflicting[2][2] = conflicting[2][7] = 4
+    DLXSolver(conflicting, 9).count_solutions(2)
+
+    assert matrix_snapshot(matrix) == before
+    assert DLXSolver(board, 9).matrix is matrix
+
+
+class _ParitySMAStarSolver(SMAStarSolver):
+    """SMA* với heuristic của con thay đổi theo giá trị, để f khác nhau giữa các nhánh."""
+
+    def _child_heuristic(self, state, index, num, parent_h):
+        return parent_h - 1 + num % 2
+
+
+def test_sma_star_evicts_with_backed_up_f_and_respects_budget():
+    board = [[1, 2, 0, 0], [3, 4, 1, 0], [2, 0, 0, 0], [4, 0, 0, 1]]
+    solver = _ParitySMAStarSolver(board, 4, node_budget=0)
+    assert solver.solve()
+    assert is_valid_solution(solver.solution, board)
+    metrics = solver.get_performance_metrics()
+    empty = sum(row.count(0) for row in board)
+    assert metrics["evicted_nodes"] > 0
+    assert metrics["max_states_in_memory"] <= empty + 2
+
+
+@pytest.mark.parametrize("algorithm", ["A*", "IDA*", "SMA*"])
+def test_best_first_solvers_solve_9x9(algorithm):
+    board, _ = make_puzzle(9, 40, 3)
+    solver = get_solver(algorithm, board, 9)
+    assert solver.solve()
+    assert is_valid_solution(solver.solution, board)
+
+
+@pytest.mark.parametrize("algorithm,options", [("IDA*", {"node_budget": 5}), ("DLX", {"heuristic": "x"})])
+def test_get_solver_rejects_unsupported_options(algorithm, options):
+    board, _ = make_puzzle(9, 20, 0)
+    with pytest.raises(TypeError):
+        get_solver(algorithm, board, 9, **options)
+
+
+@pytest.mark.parametrize("algorithm", ["A*", "IDA*", "SMA*"])
+def test_candidates_heuristic_solves_and_expands_fewer_states(algorithm):
+    board, _ = make_puzzle(9, 48, 5)
+    baseline = get_solver(algorithm, board, 9)
+    solver = get_solver(algorithm, board, 9, heuristic="candidates")
+    assert baseline.solve() and solver.solve()
+    assert is_valid_solution(solver.solution, board)
+    metrics = solver.get_performance_metrics()
+    assert metrics["heuristic"] == "candidates"
+    assert metrics["states_explored"] < baseline.get_performance_metrics()["states_explored"]
+
+
+@pytest.mark.parametrize("algorithm", ["A*", "IDA*", "SMA*"])
+def test_candidates_heuristic_prunes_unsolvable_board(algorithm):
+    board = [[0, 0, 1, 0], [4, 0, 0, 0], [0, 1, 0, 4], [0, 0, 0, 0]]
+    solver = get_solver(algorithm, board, 4, heuristic="candidates")
+    assert not solver.solve()
+    assert solver.get_performance_metrics()["pruned_states"] > 0
+
+
+def test_unknown_heuristic_is_rejected():
+    board, _ = make_puzzle(9, 20, 0)
+    with pytest.raises(ValueError):
+        get_solver("A*", board, 9, heuristic="manhattan")
+
+
+@pytest.mark.parametrize("grid_size,empties", [(9, 50), (16, 100)])
+def test_simulated_annealing_solves_with_seed(grid_size, empties):
+    board, _ = make_puzzle(grid_size, empties, 1)
+    solver = get_solver("SimulatedAnnealing", board, grid_size, seed=1)
+    assert solver.solve()
+    assert is_valid_solution(solver.solution, board)
+
+
+def test_simulated_annealing_delta_score_matches_full_recount():
+    board, _ = make_puzzle(9, 60, 2)
+    solver = SimulatedAnnealingSolver(board, 9, seed=3)
+    assert solver._randomly_fill_blocks()
+    for sigma in (5.0, 1.0, 0.2):
+        solver._anneal(2000, sigma)
+        tracked = solver._score
+        assert tracked == solver._calculate_number_of_errors()
+        n = 9
+        rows = [solver._cells[r * n:(r + 1) * n] for r in range(n)]
+        assert tracked == sum(n - len(set(line)) for line in rows + [list(col) for col in zip(*rows)])
+
+
+def test_parallel_simulated_annealing_aggregates_chain_metrics():
+    board, _ = make_puzzle(9, 50, 4)
+    solver = get_solver("SimulatedAnnealing", board, 9, seed=7, chains=3)
+    assert solver.solve()
+    assert is_valid_solution(solver.solution, board)
+    metrics = solver.get_performance_metrics()
+    assert len(metrics["chain_best_scores"]) == 3
+    assert 0 in metrics["chain_best_scores"]
+    assert metrics["states_explored"] == sum(metrics["chain_states_explored"])
+    assert metrics["winning_seed"] is not None
+
+
+@pytest.mark.parametrize("algorithm", ["DFS", "BFS", "BackTracking", "SimulatedAnnealing", "A*", "IDA*", "SMA*",
+                                       "Propagation", "DLX"])
+def test_progress_callback_and_cancellation(algorithm):
+    board, _ = make_puzzle(9, 50, 6)
+    reports = []
+    solver = get_solver(algorithm, board, 9)
+    solver.set_monitor(reports.append, interval=1)
+    solver.solve()
+    assert reports
+    assert set(reports[0]) == {"states_explored", "depth", "frontier_size"}
+
+    cancel = threading.Event()
+    cancel.set()
+    solver = get_solver(algorithm, board, 9)
+    solver.set_monitor(cancel_event=cancel, interval=1)
+    with pytest.raises(SearchCancelled):
+        solver.solve()
+
+
+def test_cancelled_dlx_leaves_shared_matrix_intact():
+    board, _ = make_puzzle(9, 55, 8)
+    before = matrix_snapshot(DLXSolver(board, 9).matrix)
+    cancel = threading.Event()
+    solver = DLXSolver(board, 9)
+    solver.set_monitor(lambda progress: cancel.set(), cancel, interval=5)
+    with pytest.raises(SearchCancelled):
+        solver.solve()
+    assert matrix_snapshot(solver.matrix) == before
+    assert DLXSolver(board, 9).solve()
+
+
+@pytest.mark.parametrize("algorithm", ["DFS", "BFS", "BackTracking", "SimulatedAnnealing", "A*", "IDA*", "SMA*",
+                                       "Propagation", "DLX"])
+def test_limits_abort_with_status(algorithm):
+    board, _ = make_puzzle(9, 55, 8)
+    solver = get_solver(algorithm, board, 9)
+    solver.set_limits(max_states=3)
+    assert solver.solve() is False
+    metrics = solver.get_performance_metrics()
+    assert metrics['status'] == 'aborted' and metrics['abort_reason'] == 'states'
+    assert solver.solution is None
+
+    solver.set_limits()
+    assert solver.solve() or algorithm == "SimulatedAnnealing"
+    assert solver.get_performance_metrics()['abort_reason'] is None
+
+
+def test_time_and_frontier_limits():
+    board, _ = make_puzzle(16, 200, 2)
+    solver = get_solver("BFS", board, 16)
+    solver.set_limits(max_frontier=500)
+    assert not solver.solve() and solver.abort_reason == 'frontier'
+    assert solver.max_states_in_memory <= 500 + 16
+
+    solver = get_solver("DFS", board, 16)
+    solver.set_limits(time_limit=0.05)
+    start = time.perf_counter()
+    assert not solver.solve() and solver.status == 'aborted' and solver.abort_reason == 'time'
+    assert time.perf_counter() - start < 1
+
+
+def test_dlx_matrix_survives_aborted_search():
+    board, _ = make_puzzle(9, 55, 9)
+    solver = get_solver("DLX", board, 9)
+    before = matrix_snapshot(solver.matrix)
+    solver.set_limits(max_states=2)
+    assert not solver.solve() and solver.abort_reason == 'states'
+    assert matrix_snapshot(solver.matrix) == before
+    assert get_solver("DLX", board, 9).solve()
+
+
+def test_instrumentation_reports_memory_gc_and_sections():
+    board, _ = make_puzzle(9, 50, 1)
+    solver = get_solver("BFS", board, 9)
+    solver.set_instrumentation()
+    assert solver.solve()
+    metrics = solver.get_performance_metrics()
+    assert metrics['peak_memory_bytes'] > 0 and metrics['gc_collections'] >= 0
+    assert set(metrics['section_times']) == {'candidates', 'heuristic', 'frontier', 'other'}
+    assert metrics['section_times']['candidates'] > 0 and metrics['section_times']['frontier'] > 0
+    assert sum(metrics['section_times'].values()) <= metrics['profiled_time'] * 1.01
+
+    # Bộ nhớ đỉnh phản ánh kích thước biên: BFS giữ nhiều trạng thái hơn DFS
+    dfs = get_solver("DFS", board, 9)
+    dfs.set_instrumentation()
+    dfs.solve()
+    assert dfs.get_performance_metrics()['peak_memory_bytes'] < metrics['peak_memory_bytes']
+
+    solver.set_instrumentation(False)
+    solver.solve()
+    assert 'peak_memory_bytes' not in solver.get_performance_metrics()
+
+
+class PluggedBitboard(BitboardState):
+    """Backend thử nghiệm được đăng ký ngoài solve.py."""
+
+
+def test_registry_lists_every_algorithm():
+    assert list(SOLVERS) == ["DFS", "BFS", "BackTracking", "SimulatedAnnealing", "A*", "IDA*", "SMA*",
+                             "Propagation", "DLX"]
+    assert all(issubclass(solver, SudokuSolver) and solver.algorithm_name == name for name, solver in SOLVERS.items())
+    with pytest.raises(ValueError):
+        get_solver("Greedy", make_puzzle(9, 10)[0])
+    with pytest.raises(ValueError):
+        get_solver("DFS", make_puzzle(9, 10)[0], backend="numpy")
+
+
+@pytest.mark.parametrize("algorithm", list(SOLVERS))
+def test_every_solver_runs_on_a_pluggable_backend(algorithm, monkeypatch):
+    monkeypatch.setitem(BOARD_BACKENDS, "plugged", PluggedBitboard)
+    board, solution = make_puzzle(9, 20, 3)
+    options = {"seed": 1} if algorithm == "SimulatedAnnealing" else {}
+    solver = get_solver(algorithm, board, backend="plugged", **options)
+    assert isinstance(solver.state, PluggedBitboard) and isinstance(solver.state.copy(), PluggedBitboard)
+    assert solver.solve()
+    assert solver.solution == solution and solver.status == 'solved'
+    assert solver.get_performance_metrics()['h_value'] == 0